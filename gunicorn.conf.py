@@ -0,0 +1,45 @@
+# gunicorn.conf.py
+# Production entry point: gunicorn managing uvicorn workers that serve the
+# ASGI application, so async views run on an event loop in every worker.
+import multiprocessing
+import os
+
+wsgi_app = "project_management.asgi:application"
+worker_class = "uvicorn.workers.UvicornWorker"
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+# Several workers need their shared state (cache, token revocations, event
+# broker) outside the process, i.e. REDIS_URL; without it default to one
+default_workers = multiprocessing.cpu_count() * 2 + 1 if os.environ.get("REDIS_URL") else 1
+workers = int(os.environ.get("WEB_CONCURRENCY", default_workers))
+
+# Recycle workers periodically to bound memory growth; jitter avoids
+# every worker restarting at the same moment
+max_requests = int(os.environ.get("MAX_REQUESTS", 10000))
+max_requests_jitter = int(os.environ.get("MAX_REQUESTS_JITTER", 1000))
+
+timeout = int(os.environ.get("TIMEOUT", 30))
+graceful_timeout = int(os.environ.get("GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.environ.get("KEEPALIVE", 5))
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.environ.get("LOG_LEVEL", "info")
+
+
+def on_starting(server):
+    """Refuse to start several workers that would each keep their own copy of shared state."""
+    if server.cfg.workers <= 1:
+        return
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project_management.settings")
+    import django
+
+    django.setup()
+    from projects.deployment import process_local_state
+
+    problems = process_local_state()
+    if problems:
+        raise RuntimeError(
+            f"{server.cfg.workers} workers can't share state kept per process: {'; '.join(problems)}. "
+            "Set REDIS_URL, or run a single worker (WEB_CONCURRENCY=1)."
+        )
@@ -0,0 +1,42 @@
+"""
+Database settings built from a DATABASE_URL.
+
+PostgreSQL keeps connections open between requests (or uses a psycopg 3
+connection pool); SQLite is switched to write-ahead logging so readers
+don't block the writer.
+"""
+import dj_database_url
+
+# SQLite runs these on every new connection. WAL lets readers work alongside the one
+# writer, and synchronous=NORMAL only syncs on checkpoints, which is still safe in WAL mode
+SQLITE_INIT_COMMAND = 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL'
+# Seconds a connection waits for a lock (SQLite's busy handler) before "database is locked"
+SQLITE_TIMEOUT = 20
+
+
+def database_config(url, conn_max_age=60, pool_size=0):
+    """
+    Settings for one database alias from `url`.
+
+    For PostgreSQL, `pool_size` > 0 uses Django's psycopg 3 connection pool
+    with at most that many connections per process; otherwise connections
+    live for `conn_max_age` seconds and are health-checked before reuse.
+    """
+    config = dj_database_url.parse(url, conn_max_age=conn_max_age, conn_health_checks=conn_max_age > 0)
+    options = config.setdefault('OPTIONS', {})
+
+    if config['ENGINE'] == 'django.db.backends.sqlite3':
+        options.setdefault('timeout', SQLITE_TIMEOUT)
+        options.setdefault('init_command', SQLITE_INIT_COMMAND)
+        # Take the write lock at BEGIN: a deferred transaction that later needs to
+        # write can fail with "database is locked" without waiting for the busy handler
+        options.setdefault('transaction_mode', 'IMMEDIATE')
+        # SQLite connections are cheap and not shareable between threads
+        config['CONN_MAX_AGE'] = 0
+        config['CONN_HEALTH_CHECKS'] = False
+    elif config['ENGINE'] == 'django.db.backends.postgresql' and pool_size:
+        # The pool replaces persistent connections, which Django rejects alongside it
+        options['pool'] = {'min_size': 1, 'max_size': pool_size}
+        config['CONN_MAX_AGE'] = 0
+        config['CONN_HEALTH_CHECKS'] = False
+    return config
@@ -7,8 +7,10 @@ For more information on this file, see
 https://docs.djangoproject.com/en/5.1/topics/settings/
 """
 import os
+from datetime import timedelta
 from pathlib import Path
-import dj_database_url
+
+from .database import database_config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -29,6 +31,21 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Access tokens for the project API; keep them short-lived since claims such
+# as is_staff are trusted until expiry without a database check
+SIMPLE_JWT = {
+    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=int(os.environ.get('JWT_ACCESS_MINUTES', 15))),
+}
+
+# Number of verified tokens whose claims are kept in memory per process
+PROJECTS_JWT_CACHE_SIZE = int(os.environ.get('PROJECTS_JWT_CACHE_SIZE', 10000))
+
+# Seconds a session user's role is cached; user saves invalidate it immediately
+PROJECTS_ROLE_CACHE_TIMEOUT = int(os.environ.get('PROJECTS_ROLE_CACHE_TIMEOUT', 300))
+
+# Paths IsAuthenticatedMiddleware lets through without a session
+AUTH_EXEMPT_PATHS = ['/admin/', '/api/docs', '/api/openapi.json', '/api/token/', '/metrics']
+
 # Application definition
 INSTALLED_APPS = [
     "django.contrib.admin",
@@ -51,6 +68,8 @@ INSTALLED_APPS = [
 CORS_ALLOW_ALL_ORIGINS = True
 
 MIDDLEWARE = [
+    'projects.middleware.InstrumentationMiddleware',
+    'projects.middleware.RepeatedQueryMiddleware',  # Only active with DEBUG on
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -59,6 +78,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',  # This line must be present
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'projects.middleware.ReadYourWritesMiddleware',
 ]
 
 ROOT_URLCONF = "project_management.urls"
@@ -82,28 +102,75 @@ TEMPLATES = [
 WSGI_APPLICATION = "project_management.wsgi.application"
 
 
+# Database from DATABASE_URL, e.g. postgres://postgres:password@db:5432/postgres; a local
+# SQLite file otherwise. DATABASE_CONN_MAX_AGE is how long PostgreSQL connections are
+# reused (0 closes them after each request) and DATABASE_POOL_SIZE > 0 switches to a
+# psycopg 3 connection pool instead
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-        'OPTIONS': {
-            'timeout': 20,  # Wait up to 20 seconds before raising an error
-        },
-    }
+    'default': database_config(
+        os.environ.get('DATABASE_URL', f"sqlite:///{BASE_DIR / 'db.sqlite3'}"),
+        conn_max_age=int(os.environ.get('DATABASE_CONN_MAX_AGE', 60)),
+        pool_size=int(os.environ.get('DATABASE_POOL_SIZE', 0)),
+    ),
 }
 
+# Read replicas for the project read endpoints: a comma-separated list of database URLs,
+# added as replica_1, replica_2, ... Tests read them through the primary (MIRROR)
+for index, url in enumerate(filter(None, os.environ.get('DATABASE_REPLICA_URLS', '').split(',')), start=1):
+    DATABASES[f'replica_{index}'] = {
+        **database_config(url, conn_max_age=int(os.environ.get('DATABASE_CONN_MAX_AGE', 60))),
+        'TEST': {'MIRROR': 'default'},
+    }
+PROJECTS_READ_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['projects.replicas.ReplicaRouter']
+# Seconds replicas may lag behind the primary: callers read their own writes from the
+# primary for this long, and cached results read from a replica expire after it
+PROJECTS_REPLICA_LAG = int(os.environ.get('PROJECTS_REPLICA_LAG', 5))
+
+# Bearer token the /metrics endpoint requires; unset leaves it open (restrict it at the proxy)
+PROJECTS_METRICS_TOKEN = os.environ.get('PROJECTS_METRICS_TOKEN', '')
+
+# With DEBUG on, log a warning when one request runs the same SQL shape more than this many times (0 disables)
+PROJECTS_REPEATED_QUERY_THRESHOLD = int(os.environ.get('PROJECTS_REPEATED_QUERY_THRESHOLD', 10))
+
+# Cache configuration: in-process locmem by default, Redis when REDIS_URL is set
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'project-management',
+        }
+    }
 
-# Database configuration
-# DATABASES = {
-#     'default': {
-#         'ENGINE': 'django.db.backends.postgresql',
-#         'NAME': os.environ.get('POSTGRES_DB', 'postgres'),
-#         'USER': os.environ.get('POSTGRES_USER', 'postgres'),
-#         'PASSWORD': os.environ.get('POSTGRES_PASSWORD', 'skilly1234'),
-#         'HOST': 'db',  # This should match the service name in docker-compose
-#         'PORT': '5432',
-#     }
-# }
+# Cache used for project API responses, and how long entries live (seconds)
+PROJECTS_CACHE_ALIAS = os.environ.get('PROJECTS_CACHE_ALIAS', 'default')
+PROJECTS_CACHE_TIMEOUT = int(os.environ.get('PROJECTS_CACHE_TIMEOUT', 300))
+
+# Project change feed (Server-Sent Events): broker class, per-client queue
+# bound, and seconds between keepalive comments on idle streams. The
+# in-process broker only reaches clients of the process that published an
+# event, so with REDIS_URL events go through Redis pub/sub instead
+PROJECTS_EVENT_BROKER = os.environ.get(
+    'PROJECTS_EVENT_BROKER',
+    'projects.events.RedisBroker' if os.environ.get('REDIS_URL') else 'projects.events.InProcessBroker',
+)
+PROJECTS_EVENTS_REDIS_URL = os.environ.get('PROJECTS_EVENTS_REDIS_URL', os.environ.get('REDIS_URL', ''))
+PROJECTS_EVENTS_QUEUE_SIZE = int(os.environ.get('PROJECTS_EVENTS_QUEUE_SIZE', 100))
+PROJECTS_EVENTS_HEARTBEAT = int(os.environ.get('PROJECTS_EVENTS_HEARTBEAT', 15))
+
+# Background jobs (manage.py run_jobs): default number of jobs a worker runs at once,
+# tries before a failing job is given up, and seconds after which a running job whose
+# worker went away is queued again
+PROJECTS_JOB_CONCURRENCY = int(os.environ.get('PROJECTS_JOB_CONCURRENCY', 4))
+PROJECTS_JOB_MAX_ATTEMPTS = int(os.environ.get('PROJECTS_JOB_MAX_ATTEMPTS', 3))
+PROJECTS_JOB_TIMEOUT = int(os.environ.get('PROJECTS_JOB_TIMEOUT', 3600))
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -130,5 +197,8 @@ USE_TZ = True
 # Static files (CSS, JavaScript, Images)
 STATIC_URL = "static/"
 
+# Files written by background jobs, e.g. exports
+MEDIA_ROOT = os.environ.get('MEDIA_ROOT', BASE_DIR / 'media')
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
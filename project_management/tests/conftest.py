@@ -0,0 +1,40 @@
+import pytest
+from django.contrib.auth import get_user_model
+from projects import auth, cache
+from projects.models import Project
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def clear_project_cache():
+    cache.get_cache().clear()
+    cache.stats.reset()
+    auth.verified_tokens.clear()
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    # Files written by background jobs
+    settings.MEDIA_ROOT = tmp_path / 'media'
+    return settings.MEDIA_ROOT
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(username='testuser', password='testpassword')
+
+
+@pytest.fixture
+def staff_user(db):
+    return User.objects.create_user(username='staffuser', password='testpassword', is_staff=True)
+
+
+@pytest.fixture
+def make_project(db, staff_user):
+    def make(**kwargs):
+        kwargs.setdefault('name', "Test Project")
+        kwargs.setdefault('description', "Test Description")
+        kwargs.setdefault('created_by', staff_user)
+        return Project.objects.create(**kwargs)
+    return make
@@ -0,0 +1,101 @@
+import pytest
+from django.contrib.auth import get_user_model
+
+from projects import cache, counters
+from projects.models import Project, ProjectCounter
+
+User = get_user_model()
+
+CHANGELIST = '/admin/projects/project/'
+
+
+@pytest.fixture
+def admin_client(client, db):
+    client.force_login(User.objects.create_superuser(username='admin', password='adminpassword'))
+    return client
+
+
+def count_statements(ctx):
+    return [q['sql'] for q in ctx.captured_queries if 'COUNT(' in q['sql'] and 'projects_project' in q['sql']]
+
+
+def test_changelist_queries_do_not_grow_with_rows(admin_client, user, staff_user, make_project, django_assert_max_num_queries):
+    for i in range(30):
+        make_project(name=f"Project {i}", assigned_to=user if i % 2 else staff_user)
+
+    with django_assert_max_num_queries(10) as ctx:
+        response = admin_client.get(CHANGELIST)
+    assert response.status_code == 200
+    assert response.context['cl'].result_count == 30
+    # Totals come from the project counters rather than COUNT(*)
+    assert count_statements(ctx) == []
+
+    with django_assert_max_num_queries(10) as ctx:
+        response = admin_client.get(CHANGELIST, {'status__exact': 'in_progress'})
+    assert response.context['cl'].result_count == 30
+    assert count_statements(ctx) == []
+
+
+def test_changelist_counts_other_filters_exactly(admin_client, make_project):
+    make_project(name="Alpha")
+    make_project(name="Beta", status='done')
+
+    response = admin_client.get(CHANGELIST, {'q': '', 'status__exact': 'done', 'priority__exact': 'mid'})
+    assert response.context['cl'].result_count == 1
+
+
+def test_date_hierarchy_lists_range(admin_client, make_project):
+    dates = ['2024-11-20T10:00:00Z', '2025-02-03T10:00:00Z', '2025-04-15T10:00:00Z']
+    for date_created in dates:
+        Project.objects.filter(id=make_project().id).update(date_created=date_created)
+
+    response = admin_client.get(CHANGELIST)
+    assert response.status_code == 200
+    assert b'date_created__year=2024' in response.content and b'date_created__year=2025' in response.content
+
+    response = admin_client.get(CHANGELIST, {'date_created__year': '2025'})
+    assert response.context['cl'].result_count == 2
+    # Months come from the range of dates, so March is listed although it is empty
+    months = [f'date_created__month={month}'.encode() for month in range(1, 6)]
+    assert [month in response.content for month in months] == [False, True, True, True, False]
+
+
+def test_date_hierarchy_start_reads_index_ends(admin_client, make_project, django_assert_max_num_queries):
+    for day in (3, 17):
+        Project.objects.filter(id=make_project().id).update(date_created=f'2025-02-{day:02}T10:00:00Z')
+
+    with django_assert_max_num_queries(10) as ctx:
+        response = admin_client.get(CHANGELIST)
+    # Not the stock MIN()/MAX() aggregate, which scans the table on SQLite
+    assert not [q['sql'] for q in ctx.captured_queries if 'MIN(' in q['sql'] or 'MAX(' in q['sql']]
+    # One month of projects: the hierarchy starts at its days
+    assert b'date_created__day=3' in response.content and b'date_created__day=17' in response.content
+
+
+def test_status_action_single_update(admin_client, make_project, django_assert_max_num_queries):
+    projects = [make_project(name=f"Project {i}") for i in range(5)]
+    make_project(name="Already done", status='done')
+    cache.get_cache().set(cache.DETAIL_KEY.format(projects[0].id), 'stale')
+
+    with django_assert_max_num_queries(20) as ctx:
+        response = admin_client.post(CHANGELIST, {
+            'action': 'mark_done', '_selected_action': [p.id for p in projects],
+        })
+    assert response.status_code == 302
+    updates = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE "projects_project"')]
+    assert len(updates) == 1
+
+    assert set(Project.objects.values_list('status', 'revision')) == {('done', 2), ('done', 1)}
+    assert cache.get_cache().get(cache.DETAIL_KEY.format(projects[0].id)) is None
+    # The counters match a full recount
+    tracked = set(ProjectCounter.objects.filter(count__gt=0).values_list('dimension', 'value', 'count'))
+    counters.rebuild()
+    assert set(ProjectCounter.objects.filter(count__gt=0).values_list('dimension', 'value', 'count')) == tracked
+    assert ('status', 'done', 6) in tracked
+
+
+def test_project_form_uses_autocomplete(admin_client, make_project):
+    project = make_project()
+    response = admin_client.get(f'{CHANGELIST}{project.id}/change/')
+    assert response.status_code == 200
+    assert b'admin-autocomplete' in response.content
@@ -0,0 +1,42 @@
+import json
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+
+from projects.models import Project, ProjectCounter
+
+
+def test_seed_projects(db):
+    call_command('seed_projects', users=5, projects=250, batch_size=100, stdout=open('/dev/null', 'w'))
+
+    assert User.objects.filter(username__startswith='seed-user-').count() == 5
+    assert Project.objects.count() == 250
+    assert sum(ProjectCounter.objects.filter(dimension='status').values_list('count', flat=True)) == 250
+    assert Project.objects.filter(assigned_to__username__startswith='seed-user-').exists()
+
+    # Runs add to what is there
+    call_command('seed_projects', users=2, projects=10, stdout=open('/dev/null', 'w'))
+    assert User.objects.filter(username__startswith='seed-user-').count() == 7
+    assert Project.objects.count() == 260
+
+
+def test_benchmark_api_results(db, tmp_path, capsys):
+    output = tmp_path / 'results.json'
+    call_command('benchmark_api', sizes=[60], users=3, repeat=2, output=str(output))
+
+    report = json.loads(output.read_text())
+    assert report['database'] == 'sqlite'
+    scenarios = {result['scenario'] for result in report['results']}
+    assert scenarios == {'get', 'list', 'list_filtered', 'list_cached', 'search', 'create', 'bulk_create', 'export'}
+    for result in report['results']:
+        assert result['size'] == 60 and result['p50_ms'] > 0
+    assert next(r for r in report['results'] if r['scenario'] == 'list_cached')['queries'] >= 1
+
+    # A baseline that was much faster is reported as a regression
+    rows = Project.objects.count()
+    baseline = dict(report, results=[dict(r, p50_ms=r['p50_ms'] / 100, rows=rows) for r in report['results']])
+    baseline_path = tmp_path / 'baseline.json'
+    baseline_path.write_text(json.dumps(baseline))
+    capsys.readouterr()
+    call_command('benchmark_api', sizes=[60], users=3, repeat=2, scenarios=['get'], compare=str(baseline_path))
+    assert 'REGRESSION' in capsys.readouterr().out
@@ -0,0 +1,122 @@
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from projects.bulk import bulk_update_projects
+from projects.models import Project, ProjectCounter
+
+URL = '/api/projects/bulk/'
+
+
+def send(client, method, payload):
+    return getattr(client, method)(URL, data=json.dumps(payload), content_type='application/json')
+
+
+def test_bulk_requires_admin(client, user):
+    client.force_login(user)
+    response = send(client, 'post', {'items': []})
+    assert response.status_code == 403
+
+
+def test_bulk_create_reports_per_item_errors(client, user, staff_user, django_assert_max_num_queries):
+    client.force_login(staff_user)
+    items = [
+        {'name': "A", 'description': "a", 'assigned_to': user.id},
+        {'name': "B", 'description': "b", 'assigned_to': user.id, 'status': 'bogus'},
+        {'name': "C", 'description': "c", 'assigned_to': 999999},
+        {'description': "no name", 'assigned_to': user.id},
+        {'name': "E", 'description': "e", 'assigned_to': staff_user.id, 'priority': 'high'},
+        {'name': "F" * 300, 'description': "too long", 'assigned_to': user.id},
+    ]
+    # Session + auth lookups, one user lookup, the insert and two counter writes, however many items
+    with django_assert_max_num_queries(10):
+        response = send(client, 'post', {'items': items})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [e['index'] for e in data['errors']] == [1, 2, 3, 5]
+    assert data['errors'][0]['error'].startswith("status: Input should be")
+    assert "User not found" in data['errors'][1]['error']
+    assert "name" in data['errors'][2]['error']
+    assert data['errors'][3]['error'] == "name: String should have at most 255 characters"
+
+    created = Project.objects.filter(id__in=data['ids']).order_by('name')
+    assert [p.name for p in created] == ["A", "E"]
+    assert all(p.created_by == staff_user for p in created)
+    assert created[1].priority == 'high'
+
+
+def test_bulk_create_rejects_oversized_batch(client, staff_user, settings):
+    client.force_login(staff_user)
+    items = [{'name': "x", 'description': "x", 'assigned_to': staff_user.id}] * 5001
+    response = send(client, 'post', {'items': items})
+    assert response.status_code == 400
+    assert not Project.objects.exists()
+
+
+def test_bulk_update_only_touches_sent_fields(client, user, staff_user, make_project):
+    first = make_project(assigned_to=user, status='in_progress', priority='low')
+    second = make_project(assigned_to=user, status='in_progress', priority='low')
+    client.force_login(staff_user)
+
+    response = send(client, 'patch', {'items': [
+        {'id': first.id, 'status': 'done'},
+        {'id': second.id, 'priority': 'high', 'assigned_to': staff_user.id},
+        {'id': 999999, 'status': 'done'},
+        {'id': first.id, 'priority': 'urgent'},
+    ]})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data['ids'] == [first.id, second.id]
+    assert [e['index'] for e in data['errors']] == [2, 3]
+
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert (first.status, first.priority) == ('done', 'low')
+    assert (second.status, second.priority, second.assigned_to) == ('in_progress', 'high', staff_user)
+
+
+def test_bulk_update_rejects_repeated_ids(client, user, staff_user, make_project):
+    project = make_project(assigned_to=user, status='done')
+    client.force_login(staff_user)
+
+    response = send(client, 'patch', {'items': [
+        {'id': project.id, 'status': 'in_progress'},
+        {'id': project.id, 'status': 'in_progress'},
+    ]})
+
+    assert response.status_code == 200
+    assert response.json() == {'ids': [project.id], 'errors': [{'index': 1, 'error': f"Duplicate id: {project.id}"}]}
+    project.refresh_from_db()
+    assert (project.status, project.revision) == ('in_progress', 2)
+    counts = dict(ProjectCounter.objects.filter(dimension='status').values_list('value', 'count'))
+    assert (counts['done'], counts['in_progress']) == (0, 1)
+
+
+def test_bulk_update_reads_rows_inside_its_transaction(user, make_project):
+    project = make_project(assigned_to=user)
+
+    with CaptureQueriesContext(connection) as ctx:
+        bulk_update_projects([{'id': project.id, 'status': 'done'}])
+    statements = [q['sql'] for q in ctx.captured_queries]
+    [read] = [i for i, sql in enumerate(statements) if sql.startswith('SELECT') and 'projects_project' in sql]
+    # The revision bump must build on a row no other write can change meanwhile
+    assert any(sql.startswith('SAVEPOINT') for sql in statements[:read])
+    assert Project.objects.get(id=project.id).revision == project.revision + 1
+
+
+def test_bulk_delete(client, user, staff_user, make_project):
+    keep = make_project(assigned_to=user)
+    doomed = [make_project(assigned_to=user) for _ in range(3)]
+    client.force_login(staff_user)
+
+    ids = [p.id for p in doomed] + [999999]
+    response = send(client, 'delete', {'ids': ids})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data['ids'] == ids[:3]
+    assert data['errors'] == [{'index': 3, 'error': "Project not found: 999999"}]
+    assert list(Project.objects.values_list('id', flat=True)) == [keep.id]
@@ -0,0 +1,133 @@
+import json
+
+from asgiref.sync import async_to_sync
+from django.db import transaction
+from projects import cache
+from projects.models import Project
+from projects.views import ProjectSchema
+
+
+def stats():
+    return cache.stats.snapshot()
+
+
+def test_get_project_is_served_from_cache(client, staff_user, make_project, django_assert_num_queries):
+    project = make_project(assigned_to=staff_user)
+    client.force_login(staff_user)
+
+    first = client.get(f'/api/projects/{project.id}/').json()
+    # Only the session lookup remains on a hit; the role is cached too
+    with django_assert_num_queries(1):
+        second = client.get(f'/api/projects/{project.id}/').json()
+
+    assert first == second
+    assert (stats()['hits'], stats()['misses']) == (1, 1)
+
+
+def test_cached_project_still_checks_visibility(client, user, staff_user, make_project):
+    project = make_project(assigned_to=staff_user)
+    client.force_login(staff_user)
+    client.get(f'/api/projects/{project.id}/')
+
+    # Forbidden projects must not leak out of the shared cache entry
+    client.force_login(user)
+    assert client.get(f'/api/projects/{project.id}/').status_code == 404
+
+
+def test_list_cache_is_scoped_per_user(client, user, staff_user, make_project):
+    mine = make_project(assigned_to=user)
+    make_project(assigned_to=staff_user)
+
+    client.force_login(staff_user)
+    assert len(client.get('/api/projects/').json()['items']) == 2
+
+    client.force_login(user)
+    items = client.get('/api/projects/').json()['items']
+    assert [item['id'] for item in items] == [mine.id]
+    assert stats()['hits'] == 0
+
+
+def test_model_save_invalidates_detail_and_lists(client, staff_user, make_project):
+    project = make_project(assigned_to=staff_user, name="Before")
+    client.force_login(staff_user)
+    client.get(f'/api/projects/{project.id}/')
+    client.get('/api/projects/')
+
+    # Same path as a save from the Django admin
+    project.name = "After"
+    project.save()
+
+    assert client.get(f'/api/projects/{project.id}/').json()['name'] == "After"
+    assert client.get('/api/projects/').json()['items'][0]['name'] == "After"
+    assert stats()['hits'] == 0
+
+
+def test_read_before_commit_is_not_served_after_it(
+    client, staff_user, make_project, django_capture_on_commit_callbacks,
+):
+    project = make_project(name="Old", assigned_to=staff_user)
+    client.force_login(staff_user)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with transaction.atomic():
+            old = ProjectSchema.from_model(Project.objects.get(id=project.id))
+            project.name = "New"
+            project.save()
+            # Another request misses the cache before the commit and stores
+            # the row it can still read
+            async_to_sync(cache.set_project)(project.id, old)
+
+    assert client.get(f'/api/projects/{project.id}/').json()['name'] == "New"
+
+
+def test_delete_invalidates_lists(client, staff_user, make_project):
+    project = make_project(assigned_to=staff_user)
+    client.force_login(staff_user)
+    assert len(client.get('/api/projects/').json()['items']) == 1
+
+    client.delete(f'/api/projects/{project.id}/')
+
+    assert client.get('/api/projects/').json()['items'] == []
+
+
+def test_bulk_update_invalidates_cache(client, staff_user, make_project):
+    project = make_project(assigned_to=staff_user, status='in_progress')
+    client.force_login(staff_user)
+    client.get(f'/api/projects/{project.id}/')
+
+    client.patch(
+        '/api/projects/bulk/',
+        data=json.dumps({'items': [{'id': project.id, 'status': 'done'}]}),
+        content_type='application/json',
+    )
+
+    assert client.get(f'/api/projects/{project.id}/').json()['status'] == 'done'
+
+
+def test_deleting_the_assignee_refreshes_cached_projects(client, user, staff_user, make_project):
+    project = make_project(assigned_to=user)
+    client.force_login(staff_user)
+    before = client.get(f'/api/projects/{project.id}/')
+    assert before.json()['assigned_to'] == user.id
+
+    user.delete()
+
+    after = client.get(f'/api/projects/{project.id}/')
+    assert after.json()['assigned_to'] is None
+    # A new revision, so the old ETag no longer matches
+    assert after['ETag'] != before['ETag']
+    cache.get_cache().clear()
+    assert client.get(f'/api/projects/{project.id}/', HTTP_IF_NONE_MATCH=before['ETag']).status_code == 200
+
+
+def test_cache_stats_endpoint(client, user, staff_user, make_project):
+    project = make_project(assigned_to=staff_user)
+    client.force_login(staff_user)
+    client.get(f'/api/projects/{project.id}/')
+    client.get(f'/api/projects/{project.id}/')
+
+    data = client.get('/api/cache/stats/').json()
+    assert (data['hits'], data['misses'], data['hit_ratio']) == (1, 1, 0.5)
+
+    client.force_login(user)
+    assert client.get('/api/cache/stats/').status_code == 403
@@ -0,0 +1,98 @@
+import json
+import threading
+
+import pytest
+from django.db import OperationalError, connection
+
+from projects.etags import project_etag
+from projects.models import Project, RevisionConflict
+
+
+def patch(client, project_id, payload, **headers):
+    return client.patch(
+        f'/api/projects/{project_id}/', data=json.dumps(payload), content_type='application/json', headers=headers,
+    )
+
+
+def test_if_match_current_revision(client, user, staff_user, make_project):
+    project = make_project(assigned_to=user)
+    client.force_login(staff_user)
+
+    response = patch(client, project.id, {'status': 'done'}, if_match=project_etag(project.id, 1))
+    assert response.status_code == 200
+    assert response['ETag'] == project_etag(project.id, 2)
+
+    response = patch(client, project.id, {'priority': 'high'}, if_match='*')
+    assert response.status_code == 200
+    assert response['ETag'] == project_etag(project.id, 3)
+
+
+def test_if_match_stale_revision(client, user, staff_user, make_project):
+    project = make_project(assigned_to=user)
+    client.force_login(staff_user)
+    stale = project_etag(project.id, project.revision)
+    assert patch(client, project.id, {'status': 'done'}).status_code == 200
+
+    assert patch(client, project.id, {'status': 'abandoned'}, if_match=stale).status_code == 412
+    assert patch(client, project.id, {}, if_match=f'W/{project_etag(project.id, 2)}').status_code == 412
+    response = client.put(
+        f'/api/projects/{project.id}/',
+        data=json.dumps({
+            'name': "Renamed", 'description': "New", 'status': 'done', 'priority': 'mid', 'assigned_to': user.id,
+        }),
+        content_type='application/json',
+        headers={'if_match': stale},
+    )
+    assert response.status_code == 412
+
+    project.refresh_from_db()
+    assert (project.name, project.status, project.revision) == ("Test Project", 'done', 2)
+
+
+def test_stale_copy_cannot_overwrite(make_project):
+    project = make_project()
+    first = Project.objects.get(id=project.id)
+    second = Project.objects.get(id=project.id)
+
+    first.status = 'done'
+    first.save()
+    second.name = "Lost update"
+    with pytest.raises(RevisionConflict):
+        second.save()
+    assert second.revision == 1
+
+    project.refresh_from_db()
+    assert (project.name, project.status, project.revision) == ("Test Project", 'done', 2)
+    # The winner keeps its lock and can save again
+    first.priority = 'high'
+    first.save(update_fields=['priority'])
+    assert Project.objects.get(id=project.id).revision == 3
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_increments_are_not_lost(staff_user):
+    project = Project.objects.create(name="Counter", description="0", created_by=staff_user)
+    threads, increments = 4, 10
+
+    def work():
+        for _ in range(increments):
+            while True:
+                try:
+                    copy = Project.objects.get(id=project.id)
+                    copy.description = str(int(copy.description) + 1)
+                    copy.save(update_fields=['description'])
+                    break
+                # The in-memory test database reports lock contention instead of waiting
+                except (RevisionConflict, OperationalError):
+                    continue
+        connection.close()
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    project.refresh_from_db()
+    assert project.description == str(threads * increments)
+    assert project.revision == 1 + threads * increments
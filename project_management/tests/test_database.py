@@ -0,0 +1,34 @@
+import pytest
+from django.db import connection
+
+from project_management.database import SQLITE_INIT_COMMAND, database_config
+
+
+def test_sqlite_profile():
+    config = database_config('sqlite:////tmp/projects.sqlite3', conn_max_age=60)
+    assert config['NAME'] == '/tmp/projects.sqlite3'
+    assert config['OPTIONS'] == {'timeout': 20, 'init_command': SQLITE_INIT_COMMAND, 'transaction_mode': 'IMMEDIATE'}
+    assert config['CONN_MAX_AGE'] == 0
+
+
+def test_postgres_persistent_connections():
+    config = database_config('postgres://app:secret@db:5432/projects', conn_max_age=60)
+    assert (config['ENGINE'], config['HOST'], config['NAME']) == ('django.db.backends.postgresql', 'db', 'projects')
+    assert config['CONN_MAX_AGE'] == 60 and config['CONN_HEALTH_CHECKS']
+    assert 'pool' not in config['OPTIONS']
+
+
+def test_postgres_pool():
+    config = database_config('postgres://app:secret@db:5432/projects', conn_max_age=60, pool_size=10)
+    assert config['OPTIONS']['pool'] == {'min_size': 1, 'max_size': 10}
+    assert config['CONN_MAX_AGE'] == 0 and not config['CONN_HEALTH_CHECKS']
+
+
+@pytest.mark.django_db
+def test_connection_init_command():
+    if connection.vendor != 'sqlite':
+        pytest.skip("SQLite only")
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA synchronous')
+        # 1 is NORMAL; the default is FULL (2)
+        assert cursor.fetchone()[0] == 1
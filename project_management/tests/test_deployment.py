@@ -0,0 +1,39 @@
+import runpy
+from types import SimpleNamespace
+
+import pytest
+from django.conf import settings as django_settings
+
+from projects.deployment import process_local_state
+
+REDIS_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://redis'}}
+
+
+@pytest.fixture
+def on_starting():
+    config = runpy.run_path(str(django_settings.BASE_DIR / 'gunicorn.conf.py'))
+    return lambda workers: config['on_starting'](SimpleNamespace(cfg=SimpleNamespace(workers=workers)))
+
+
+def test_process_local_state_by_default(settings):
+    settings.PROJECTS_EVENT_BROKER = 'projects.events.InProcessBroker'
+    cache_problem, broker_problem = process_local_state()
+    assert 'LocMemCache' in cache_problem
+    assert 'InProcessBroker' in broker_problem
+
+
+def test_redis_shares_state(settings):
+    settings.CACHES = REDIS_CACHE
+    settings.PROJECTS_EVENT_BROKER = 'projects.events.RedisBroker'
+    assert process_local_state() == []
+
+
+def test_several_workers_need_shared_state(settings, on_starting):
+    settings.PROJECTS_EVENT_BROKER = 'projects.events.InProcessBroker'
+    on_starting(1)
+    with pytest.raises(RuntimeError, match="4 workers can't share state"):
+        on_starting(4)
+
+    settings.CACHES = REDIS_CACHE
+    settings.PROJECTS_EVENT_BROKER = 'projects.events.RedisBroker'
+    on_starting(4)
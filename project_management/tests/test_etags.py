@@ -0,0 +1,84 @@
+import json
+
+from projects import cache
+
+
+def test_get_project_returns_etag_and_304(client, staff_user, make_project):
+    project = make_project(assigned_to=staff_user)
+    client.force_login(staff_user)
+
+    response = client.get(f'/api/projects/{project.id}/')
+    etag = response['ETag']
+    assert etag == f'"{project.id}-1"'
+    assert 'revision' not in response.json()
+
+    response = client.get(f'/api/projects/{project.id}/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert response['ETag'] == etag
+    assert response.content == b''
+
+
+def test_etag_changes_after_update(client, staff_user, make_project):
+    project = make_project(assigned_to=staff_user)
+    client.force_login(staff_user)
+    etag = client.get(f'/api/projects/{project.id}/')['ETag']
+
+    project.status = 'done'
+    project.save()
+
+    response = client.get(f'/api/projects/{project.id}/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response['ETag'] == f'"{project.id}-2"'
+
+
+def test_revalidation_on_cache_miss_skips_full_row(client, staff_user, make_project, django_assert_num_queries):
+    project = make_project(assigned_to=staff_user)
+    client.force_login(staff_user)
+    etag = client.get(f'/api/projects/{project.id}/')['ETag']
+    cache.get_cache().clear()
+
+    with django_assert_num_queries(3) as ctx:
+        response = client.get(f'/api/projects/{project.id}/', HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
+    assert 'description' not in ctx.captured_queries[-1]['sql']
+
+
+def test_revalidation_still_checks_visibility(client, user, staff_user, make_project):
+    project = make_project(assigned_to=staff_user)
+    client.force_login(user)
+
+    response = client.get(f'/api/projects/{project.id}/', HTTP_IF_NONE_MATCH=f'"{project.id}-1"')
+    assert response.status_code == 404
+
+
+def test_list_etag_and_304(client, staff_user, make_project):
+    projects = [make_project(assigned_to=staff_user) for _ in range(3)]
+    client.force_login(staff_user)
+
+    etag = client.get('/api/projects/')['ETag']
+    assert client.get('/api/projects/', HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    # Miss the cache so the 304 comes from the index-only revalidation query
+    cache.get_cache().clear()
+    assert client.get('/api/projects/', HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    client.patch(
+        '/api/projects/bulk/',
+        data=json.dumps({'items': [{'id': projects[0].id, 'status': 'done'}]}),
+        content_type='application/json',
+    )
+    response = client.get('/api/projects/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response['ETag'] != etag
+
+
+def test_list_etag_changes_when_page_changes(client, staff_user, make_project):
+    make_project(assigned_to=staff_user)
+    client.force_login(staff_user)
+    etag = client.get('/api/projects/')['ETag']
+
+    make_project(assigned_to=staff_user)
+    cache.get_cache().clear()
+
+    assert client.get('/api/projects/', HTTP_IF_NONE_MATCH=etag).status_code == 200
@@ -0,0 +1,216 @@
+import asyncio
+import json
+import queue
+import threading
+import time
+
+import pytest
+from django.contrib.auth.models import User
+from projects import bulk, events
+from projects.events import InProcessBroker, RedisBroker, event_stream
+from projects.models import Project
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def broker(monkeypatch):
+    broker = InProcessBroker()
+    monkeypatch.setattr(events, '_broker', broker)
+    return broker
+
+
+def subscribe(loop, broker, user, maxsize=None):
+    async def make():
+        return broker.subscribe(user, maxsize)
+    return loop.run_until_complete(make())
+
+
+def drain(loop, subscription):
+    """Run pending deliveries on `loop` and return everything queued."""
+    async def collect():
+        await asyncio.sleep(0)
+        items = []
+        while not subscription.queue.empty():
+            items.append(subscription.queue.get_nowait())
+        return items
+    return loop.run_until_complete(collect())
+
+
+def test_signals_publish_on_commit(loop, broker, user, staff_user, make_project, django_capture_on_commit_callbacks):
+    admin_feed = subscribe(loop, broker, staff_user)
+    user_feed = subscribe(loop, broker, user)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        mine = make_project(assigned_to=user)
+        other = make_project(assigned_to=staff_user)
+    with django_capture_on_commit_callbacks(execute=True):
+        mine.status = 'done'
+        mine.save()
+    other_id = other.id
+    with django_capture_on_commit_callbacks(execute=True):
+        other.delete()
+
+    admin_events = [(e['type'], e['id']) for e in drain(loop, admin_feed)]
+    assert admin_events == [('created', mine.id), ('created', other_id), ('updated', mine.id), ('deleted', other_id)]
+
+    user_events = drain(loop, user_feed)
+    assert [(e['type'], e['id']) for e in user_events] == [('created', mine.id), ('updated', mine.id)]
+    assert user_events[1]['status'] == 'done'
+    assert user_events[1]['revision'] == 2
+
+
+def test_previous_assignee_hears_the_project_was_removed(
+    loop, broker, user, staff_user, make_project, django_capture_on_commit_callbacks,
+):
+    other = User.objects.create_user(username='other', password='testpassword')
+    project = make_project(assigned_to=user)
+    user_feed = subscribe(loop, broker, user)
+    other_feed = subscribe(loop, broker, other)
+
+    project = Project.objects.get(id=project.id)
+    project.assigned_to = other
+    with django_capture_on_commit_callbacks(execute=True):
+        project.save()
+    # Bulk reassignment reads the old assignees from the rows it changes
+    with django_capture_on_commit_callbacks(execute=True):
+        bulk.reassign(Project.objects.filter(id=project.id), user.id)
+
+    assert [(e['type'], e['assigned_to'], e.get('previous_assigned_to')) for e in drain(loop, user_feed)] == [
+        ('removed', other.id, user.id), ('updated', user.id, other.id),
+    ]
+    assert [(e['type'], e['assigned_to']) for e in drain(loop, other_feed)] == [
+        ('updated', other.id), ('removed', user.id),
+    ]
+
+
+def test_deleting_the_assignee_publishes_updates(
+    loop, broker, user, staff_user, make_project, django_capture_on_commit_callbacks,
+):
+    project = make_project(assigned_to=user)
+    user_id = user.id
+    admin_feed = subscribe(loop, broker, staff_user)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user.delete()
+
+    [event] = drain(loop, admin_feed)
+    assert (event['type'], event['id'], event['assigned_to']) == ('updated', project.id, None)
+    assert event['previous_assigned_to'] == user_id
+
+
+def test_nothing_is_published_before_commit(loop, broker, staff_user, make_project, django_capture_on_commit_callbacks):
+    feed = subscribe(loop, broker, staff_user)
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        make_project(assigned_to=staff_user)
+
+    assert drain(loop, feed) == []
+    for callback in callbacks:
+        callback()
+    assert [e['type'] for e in drain(loop, feed)] == ['created']
+
+
+def test_publish_from_other_threads(loop, broker, staff_user):
+    feed = subscribe(loop, broker, staff_user)
+    threads = [
+        threading.Thread(target=broker.publish, args=({'type': 'updated', 'id': i, 'assigned_to': None},))
+        for i in range(20)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(e['id'] for e in drain(loop, feed)) == list(range(20))
+
+
+def test_slow_subscriber_overflows_instead_of_growing(loop, broker, staff_user):
+    feed = subscribe(loop, broker, staff_user, maxsize=3)
+    for i in range(10):
+        broker.publish({'type': 'updated', 'id': i, 'assigned_to': None})
+
+    assert drain(loop, feed) == [events.OVERFLOW]
+
+
+class FakeRedis:
+    """The slice of redis.Redis that RedisBroker uses, shared like a server between instances."""
+
+    def __init__(self):
+        self.listeners = []
+
+    def publish(self, channel, message):
+        for listener in self.listeners:
+            listener.put({'type': 'message', 'channel': channel, 'data': message})
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return FakePubSub(self)
+
+
+class FakePubSub:
+    def __init__(self, server):
+        self.server = server
+        self.messages = queue.Queue()
+
+    def subscribe(self, channel):
+        self.server.listeners.append(self.messages)
+
+    def listen(self):
+        while True:
+            yield self.messages.get()
+
+
+def test_redis_broker_delivers_events_published_by_other_processes(loop, user, staff_user):
+    server = FakeRedis()
+    web, worker = RedisBroker(client=server), RedisBroker(client=server)
+    admin_feed = subscribe(loop, web, staff_user)
+    user_feed = subscribe(loop, web, user)
+    # Subscribing started the web broker's listener; the worker only publishes
+    deadline = time.monotonic() + 5
+    while not server.listeners and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert worker._listener is None
+
+    worker.publish({'type': 'updated', 'id': 1, 'assigned_to': user.id})
+    worker.publish({'type': 'updated', 'id': 2, 'assigned_to': None})
+
+    received = []
+    while len(received) < 2 and time.monotonic() < deadline:
+        received += drain(loop, admin_feed)
+    assert [e['id'] for e in received] == [1, 2]
+    assert [e['id'] for e in drain(loop, user_feed)] == [1]
+
+
+def test_event_stream_formats_and_unsubscribes(loop, broker, user):
+    feed = subscribe(loop, broker, user)
+
+    async def read():
+        stream = event_stream(feed, heartbeat=0.01)
+        chunks = [await stream.__anext__()]
+        chunks.append(await stream.__anext__())  # idle: keepalive comment
+        broker.publish({'type': 'created', 'id': 7, 'assigned_to': user.id})
+        chunks.append(await stream.__anext__())
+        await stream.aclose()
+        return chunks
+
+    retry, keepalive, message = loop.run_until_complete(read())
+    assert retry.startswith("retry:")
+    assert keepalive == ": keepalive\n\n"
+    name, data = message.strip().split('\n')
+    assert name == "event: created"
+    assert json.loads(data.removeprefix("data: "))['id'] == 7
+    assert broker.subscriber_count() == 0
+
+
+def test_events_endpoint_requires_authentication(client, db):
+    assert client.get('/api/projects/events/').status_code == 401
+
+
+def test_events_endpoint_needs_asgi(client, user):
+    # Under WSGI the endless stream would be collected into a list and never sent
+    client.force_login(user)
+    assert client.get('/api/projects/events/').status_code == 501
@@ -0,0 +1,102 @@
+import csv
+import io
+import json
+
+from asgiref.sync import async_to_sync
+from projects import export
+from projects.models import Project
+
+URL = '/api/projects/export/'
+
+
+def read(response):
+    assert response.status_code == 200
+    assert response.streaming
+    if not response.is_async:
+        return b''.join(response.streaming_content).decode()
+
+    async def collect():
+        return b''.join([chunk async for chunk in response.streaming_content])
+    return async_to_sync(collect)().decode()
+
+
+def get(async_client, *args):
+    # Streaming endpoints only answer ASGI requests
+    return async_to_sync(async_client.get)(*args)
+
+
+def test_export_requires_admin(client, user):
+    client.force_login(user)
+    assert client.get(URL).status_code == 403
+
+
+def test_csv_export(async_client, user, staff_user, make_project):
+    first = make_project(name="Comma, \"quoted\"", description="two\nlines", assigned_to=user)
+    make_project(name="Done", status='done', assigned_to=staff_user)
+    async_client.force_login(staff_user)
+
+    response = get(async_client, URL)
+    assert response['Content-Type'].startswith('text/csv')
+    assert 'projects.csv' in response['Content-Disposition']
+    rows = list(csv.DictReader(io.StringIO(read(response))))
+
+    assert [row['name'] for row in rows] == ["Comma, \"quoted\"", "Done"]
+    assert rows[0] == {
+        'id': str(first.id), 'name': first.name, 'description': "two\nlines", 'status': 'in_progress',
+        'priority': 'mid', 'assigned_to': str(user.id), 'date_created': first.date_created.isoformat(),
+        'created_by': 'staffuser',
+    }
+
+
+def test_ndjson_export_with_filters(async_client, user, staff_user, make_project):
+    make_project(name="Open", assigned_to=user)
+    done = make_project(name="Done", status='done', assigned_to=user)
+    async_client.force_login(staff_user)
+
+    response = get(async_client, URL, {'format': 'ndjson', 'status': 'done'})
+    assert response['Content-Type'] == 'application/x-ndjson'
+    rows = [json.loads(line) for line in read(response).splitlines()]
+    assert rows == [{
+        'id': done.id, 'name': "Done", 'description': done.description, 'status': 'done', 'priority': 'mid',
+        'assigned_to': user.id, 'date_created': done.date_created.isoformat(), 'created_by': 'staffuser',
+    }]
+
+
+def test_export_rejects_unknown_format(async_client, staff_user):
+    async_client.force_login(staff_user)
+    assert get(async_client, URL, {'format': 'xml'}).status_code == 400
+
+
+def test_export_streams_under_wsgi(client, user, staff_user, make_project):
+    make_project(name="Open", assigned_to=user)
+    client.force_login(staff_user)
+
+    # A plain generator, which WSGI servers send chunk by chunk
+    response = client.get(URL, {'format': 'ndjson'})
+    assert not response.is_async
+    assert [json.loads(line)['name'] for line in read(response).splitlines()] == ["Open"]
+    response = client.get(URL)
+    assert list(csv.DictReader(io.StringIO(read(response))))[0]['name'] == "Open"
+
+
+def test_export_streams_in_chunks(staff_user, make_project, django_assert_max_num_queries):
+    Project.objects.bulk_create([Project(name=f"P{i}", description="d") for i in range(25)])
+
+    async def collect():
+        return [chunk async for chunk in export.export_ndjson(Project.objects.all(), chunk_size=10)]
+
+    # Rows are fetched chunk by chunk, never as one list of models
+    with django_assert_max_num_queries(3):
+        chunks = async_to_sync(collect)()
+    assert [chunk.count(b'\n') for chunk in chunks] == [10, 10, 5]
+
+
+def test_sync_export_matches_async(make_project):
+    Project.objects.bulk_create([Project(name=f"P{i}", description="d") for i in range(25)])
+
+    async def collect(exporter):
+        return [chunk async for chunk in exporter(Project.objects.all(), chunk_size=10)]
+
+    for format, exporter in export.EXPORTERS.items():
+        chunks = list(export.SYNC_EXPORTERS[format](Project.objects.all(), chunk_size=10))
+        assert chunks == async_to_sync(collect)(exporter)
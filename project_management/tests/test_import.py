@@ -0,0 +1,84 @@
+import json
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from projects import importer
+from projects.models import Project
+
+CSV = '''name,description,status,priority,assigned_to
+Website,"Landing page, v2",done,high,testuser
+Backend,API work,,,{user_id}
+Broken,Bad status,finished,low,testuser
+Nobody,Unknown user,in_progress,mid,ghost
+Unassigned,No assignee,in_progress,low,
+,Missing name,done,low,testuser
+'''
+
+
+def test_command_imports_valid_rows_and_writes_rejects(tmp_path, user, staff_user):
+    source = tmp_path / 'projects.csv'
+    source.write_text(CSV.format(user_id=user.id))
+    rejects = tmp_path / 'rejects.ndjson'
+
+    call_command('import_projects', str(source), batch_size=2, created_by='staffuser', rejects=str(rejects))
+
+    projects = {p.name: p for p in Project.objects.all()}
+    assert sorted(projects) == ["Backend", "Unassigned", "Website"]
+    assert projects["Website"].description == "Landing page, v2"
+    assert (projects["Website"].status, projects["Website"].priority) == ('done', 'high')
+    assert (projects["Backend"].status, projects["Backend"].priority) == ('in_progress', 'mid')
+    assert projects["Website"].assigned_to_id == projects["Backend"].assigned_to_id == user.id
+    assert projects["Unassigned"].assigned_to_id is None
+    assert {p.created_by_id for p in projects.values()} == {staff_user.id}
+
+    rejected = [json.loads(line) for line in rejects.read_text().splitlines()]
+    assert [(r['line'], r['error']) for r in rejected] == [
+        (4, "Invalid status: finished"),
+        (5, "User not found: ghost"),
+        (7, "name: Field required"),
+    ]
+    assert rejected[0]['row']['name'] == "Broken"
+
+
+def test_writes_are_batched(user, django_assert_max_num_queries):
+    rows = ((n, {'name': f"P{n}", 'description': "d", 'assigned_to': user.id}) for n in range(1, 101))
+
+    with django_assert_max_num_queries(20) as ctx:
+        result = importer.import_projects(rows, batch_size=50)
+    # One user load, then per batch of 50: the insert and two counter writes
+    statements = [q['sql'].split()[0] for q in ctx.captured_queries if 'SAVEPOINT' not in q['sql']]
+    assert statements == ['SELECT'] + ['INSERT', 'INSERT', 'UPDATE'] * 2
+    assert (result.created, result.rejected) == (100, 0)
+    assert Project.objects.count() == 100
+
+
+def test_upload_endpoint(client, user, staff_user):
+    lines = [
+        json.dumps({'name': "One", 'description': "d", 'assigned_to': user.username}),
+        "not json",
+        json.dumps({'name': "Two", 'description': "d", 'priority': 'urgent'}),
+        json.dumps({'name': "Three", 'description': "d", 'created_by': user.id}),
+    ]
+    upload = SimpleUploadedFile('projects.ndjson', '\n'.join(lines).encode())
+    client.force_login(staff_user)
+
+    response = client.post('/api/projects/import/', {'file': upload})
+    assert response.status_code == 200
+    data = response.json()
+    assert (data['created'], data['rejected']) == (2, 2)
+    assert [(e['index'], e['error']) for e in data['errors']] == [
+        (2, "Invalid JSON object"),
+        (3, "Invalid priority: urgent"),
+    ]
+    creators = dict(Project.objects.values_list('name', 'created_by_id'))
+    assert creators == {"One": staff_user.id, "Three": user.id}
+
+
+def test_upload_requires_admin_and_known_format(client, user, staff_user):
+    client.force_login(user)
+    upload = SimpleUploadedFile('projects.csv', b'name,description\n')
+    assert client.post('/api/projects/import/', {'file': upload}).status_code == 403
+
+    client.force_login(staff_user)
+    upload = SimpleUploadedFile('projects.xlsx', b'')
+    assert client.post('/api/projects/import/', {'file': upload}).status_code == 400
@@ -0,0 +1,203 @@
+import csv
+import io
+import threading
+import time
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from pydantic import BaseModel
+from projects import jobs
+from projects.models import Job, Project, ProjectCounter
+
+URL = '/api/jobs/'
+
+
+def enqueue(client, kind, payload):
+    return client.post(URL, {'kind': kind, 'payload': payload}, content_type='application/json')
+
+
+def work():
+    """Claim and run every queued job in this thread, as a worker would."""
+    for job_id in jobs.claim('test-worker', 100):
+        jobs.run(job_id)
+
+
+class SleepPayload(BaseModel):
+    seconds: float = 0.0
+
+
+@pytest.fixture
+def job_kind(monkeypatch):
+    """Register a throwaway job kind running `handler(job, payload)`."""
+    def register(kind, handler, schema=SleepPayload):
+        monkeypatch.setitem(jobs.JOB_TYPES, kind, jobs.JobType(kind, schema, handler))
+    return register
+
+
+def test_jobs_require_admin(client, user):
+    client.force_login(user)
+    assert enqueue(client, 'reassign_projects', {'from_user': user.id, 'to_user': None}).status_code == 403
+    assert client.get(f'{URL}1/').status_code == 403
+
+
+def test_enqueue_validates_kind_and_payload(client, staff_user):
+    client.force_login(staff_user)
+
+    response = enqueue(client, 'nope', {})
+    assert response.status_code == 400
+    assert response.json()['detail'].startswith("Unknown job kind: nope")
+
+    response = enqueue(client, 'reassign_projects', {'to_user': 1})
+    assert response.status_code == 400
+    assert response.json()['detail'] == "from_user: Field required"
+    assert not Job.objects.exists()
+
+
+def test_reassign_job(client, user, staff_user, make_project):
+    moved = [make_project(assigned_to=user) for _ in range(3)]
+    done = make_project(assigned_to=user, status='done')
+    client.force_login(staff_user)
+
+    response = enqueue(client, 'reassign_projects', {'from_user': user.id, 'to_user': staff_user.id, 'status': 'in_progress'})
+    assert response.status_code == 202
+    job = response.json()
+    assert (job['kind'], job['status'], job['result']) == ('reassign_projects', 'queued', None)
+    # Nothing happens until a worker picks it up
+    assert Project.objects.filter(assigned_to=user).count() == 4
+
+    work()
+
+    job = client.get(f"{URL}{job['id']}/").json()
+    assert (job['status'], job['result'], job['attempts'], job['error']) == ('done', {'updated': 3}, 1, '')
+    assert job['started_at'] and job['finished_at']
+    assert set(Project.objects.filter(assigned_to=staff_user).values_list('id', flat=True)) == {p.id for p in moved}
+    assert Project.objects.get(id=done.id).assigned_to_id == user.id
+    assert all(p.revision == 2 for p in Project.objects.filter(assigned_to=staff_user))
+    counts = dict(ProjectCounter.objects.filter(dimension='assigned_to').values_list('value', 'count'))
+    assert (counts[str(user.id)], counts[str(staff_user.id)]) == (1, 3)
+
+
+def test_export_job_file(client, user, staff_user, make_project):
+    projects = [make_project(assigned_to=user, priority='high') for _ in range(3)]
+    make_project(assigned_to=user, priority='low')
+    client.force_login(staff_user)
+
+    job_id = enqueue(client, 'export_projects', {'format': 'csv', 'priority': 'high'}).json()['id']
+    assert client.get(f'{URL}{job_id}/file/').status_code == 404
+    work()
+
+    job = client.get(f'{URL}{job_id}/').json()
+    assert job['result'] == {'rows': 3, 'file': f'exports/projects-{job_id}.csv'}
+    response = client.get(f'{URL}{job_id}/file/')
+    assert response.status_code == 200
+    assert f'projects-{job_id}.csv' in response['Content-Disposition']
+    rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+    assert [int(row['id']) for row in rows] == [p.id for p in projects]
+
+
+def test_failed_job_is_retried(settings, staff_user, job_kind):
+    settings.PROJECTS_JOB_MAX_ATTEMPTS = 2
+
+    def fail(job, payload):
+        raise RuntimeError("disk full")
+    job_kind('flaky', fail)
+    job = jobs.enqueue('flaky', {})
+
+    work()
+    job.refresh_from_db()
+    assert (job.status, job.attempts, job.error) == ('queued', 1, "RuntimeError: disk full")
+    work()
+    job.refresh_from_db()
+    assert (job.status, job.attempts) == ('failed', 2)
+    assert job.finished_at is not None
+
+
+def test_job_failed_is_not_retried(user, staff_user):
+    job = jobs.enqueue('reassign_projects', {'from_user': user.id, 'to_user': 999999})
+    work()
+    job.refresh_from_db()
+    assert (job.status, job.attempts, job.error) == ('failed', 1, "User not found: 999999")
+
+
+def test_deleted_job_is_skipped(db):
+    job = jobs.enqueue('export_projects', {})
+    [job_id] = jobs.claim('test-worker', 1)
+    job.delete()
+
+    assert jobs.run(job_id) is None
+
+
+def test_claim(job_kind, db):
+    job_kind('other', lambda job, payload: None)
+    first, second, third = (jobs.enqueue('export_projects', {}) for _ in range(3))
+    other = jobs.enqueue('other', {})
+
+    assert jobs.claim('a', 2) == [first.id, second.id]
+    # Claimed jobs aren't handed out again
+    assert jobs.claim('b', 5, kinds=['export_projects']) == [third.id]
+    assert jobs.claim('c', 5) == [other.id]
+    assert jobs.claim('d', 5) == []
+    assert Job.objects.get(id=second.id).worker == 'a'
+    assert set(Job.objects.values_list('status', 'attempts')) == {('running', 1)}
+
+
+def test_stale_jobs_are_requeued(settings, db):
+    settings.PROJECTS_JOB_MAX_ATTEMPTS = 2
+    stale, hopeless, fresh = (jobs.enqueue('export_projects', {}) for _ in range(3))
+    jobs.claim('gone', 3)
+    Job.objects.filter(id=hopeless.id).update(attempts=2)
+    Job.objects.exclude(id=fresh.id).update(started_at=timezone.now() - timedelta(hours=2))
+
+    assert jobs.requeue_stale(timeout=3600) == 1
+    statuses = dict(Job.objects.values_list('id', 'status'))
+    assert statuses == {stale.id: 'queued', hopeless.id: 'failed', fresh.id: 'running'}
+    # The requeued job's old worker can no longer record an outcome
+    jobs._finish(Job(id=stale.id, kind='export_projects', worker='gone'), 'done')
+    assert Job.objects.get(id=stale.id).status == 'queued'
+
+
+@pytest.mark.django_db(transaction=True)
+def test_worker_bounds_concurrency(job_kind):
+    lock = threading.Lock()
+    running = peak = 0
+
+    def sleep(job, payload):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(payload.seconds)
+        with lock:
+            running -= 1
+        return {'slept': payload.seconds}
+    job_kind('sleep', sleep)
+    # Staggered lengths keep jobs from finishing at the same moment: the
+    # in-memory test database reports lock contention instead of waiting
+    for index in range(6):
+        jobs.enqueue('sleep', {'seconds': 0.02 + 0.04 * index})
+
+    out = io.StringIO()
+    call_command('run_jobs', '--once', '--concurrency', '2', '--poll-interval', '0.01', stdout=out)
+
+    assert "Ran 6 jobs" in out.getvalue()
+    assert peak == 2
+    assert list(Job.objects.values_list('status', flat=True).distinct()) == ['done']
+
+
+@pytest.mark.django_db(transaction=True)
+def test_worker_survives_a_job_that_cannot_run(monkeypatch, job_kind):
+    job_kind('sleep', lambda job, payload: {'slept': 0})
+    broken, fine = jobs.enqueue('sleep', {}), jobs.enqueue('sleep', {})
+    run = jobs.run
+
+    def flaky_run(job_id):
+        if job_id == broken.id:
+            raise RuntimeError("database went away")
+        return run(job_id)
+    monkeypatch.setattr(jobs, 'run', flaky_run)
+
+    assert jobs.Worker(concurrency=1, poll_interval=0.01).run(once=True) == 2
+    assert Job.objects.get(id=fine.id).status == 'done'
+    assert Job.objects.get(id=broken.id).status == 'running'
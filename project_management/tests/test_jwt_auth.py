@@ -0,0 +1,87 @@
+import json
+from datetime import timedelta
+
+from projects.auth import issue_token
+from projects.deployment import process_local_state
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+def bearer(token):
+    return {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+
+
+def test_obtain_token(client, user):
+    response = client.post(
+        '/api/token/', data=json.dumps({'username': 'testuser', 'password': 'testpassword'}),
+        content_type='application/json',
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data['token_type'] == "Bearer"
+    claims = AccessToken(data['access']).payload
+    assert (claims['user_id'], claims['is_staff']) == (user.id, False)
+
+
+def test_obtain_token_rejects_bad_credentials(client, user):
+    response = client.post(
+        '/api/token/', data=json.dumps({'username': 'testuser', 'password': 'wrong'}),
+        content_type='application/json',
+    )
+    assert response.status_code == 401
+
+
+def test_token_reads_skip_session_and_user_queries(client, user, make_project, django_assert_num_queries):
+    project = make_project(assigned_to=user)
+    token = issue_token(user)
+
+    with django_assert_num_queries(1):
+        # Only the project itself is loaded
+        response = client.get(f'/api/projects/{project.id}/', **bearer(token))
+    assert response.status_code == 200
+
+    with django_assert_num_queries(0):
+        # Served from the response cache: no database access at all
+        response = client.get(f'/api/projects/{project.id}/', **bearer(token))
+    assert response.status_code == 200
+
+
+def test_token_claims_drive_visibility(client, user, staff_user, make_project):
+    other = make_project(assigned_to=staff_user)
+
+    assert client.get(f'/api/projects/{other.id}/', **bearer(issue_token(user))).status_code == 404
+    assert client.get(f'/api/projects/{other.id}/', **bearer(issue_token(staff_user))).status_code == 200
+
+
+def test_admin_routes_accept_staff_tokens(client, user, staff_user, make_project):
+    project = make_project(assigned_to=user)
+
+    assert client.delete(f'/api/projects/{project.id}/', **bearer(issue_token(user))).status_code == 403
+    assert client.delete(f'/api/projects/{project.id}/', **bearer(issue_token(staff_user))).status_code == 200
+
+
+def test_invalid_and_expired_tokens_are_rejected(client, user):
+    assert client.get('/api/projects/', **bearer("not-a-token")).status_code == 401
+
+    token = issue_token(user)
+    token.set_exp(lifetime=timedelta(seconds=-60))
+    assert client.get('/api/projects/', **bearer(token)).status_code == 401
+
+
+def test_revoked_token_is_rejected(client, user):
+    token = str(issue_token(user))
+    assert client.get('/api/projects/', **bearer(token)).status_code == 200
+
+    assert client.post('/api/token/revoke/', **bearer(token)).status_code == 200
+
+    # Rejected even though the verified claims are still cached in memory
+    assert client.get('/api/projects/', **bearer(token)).status_code == 401
+    assert client.get('/api/projects/', **bearer(issue_token(user))).status_code == 200
+
+
+def test_revocations_need_a_shared_cache(settings):
+    assert any('token revocations' in problem for problem in process_local_state())
+
+    settings.CACHES = {
+        'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://redis'},
+    }
+    assert not any('token revocations' in problem for problem in process_local_state())
@@ -0,0 +1,69 @@
+import pytest
+from django.utils import timezone
+from projects.models import Project
+
+URL = '/api/projects/'
+
+
+def collect_ids(client, **params):
+    """Walk every page of the list endpoint and return the project ids in order."""
+    ids = []
+    cursor = None
+    while True:
+        query = dict(params)
+        if cursor:
+            query['cursor'] = cursor
+        response = client.get(URL, query)
+        assert response.status_code == 200
+        data = response.json()
+        ids.extend(item['id'] for item in data['items'])
+        cursor = data['next_cursor']
+        if cursor is None:
+            return ids
+
+
+def test_list_requires_authentication(client, db):
+    response = client.get(URL)
+    assert response.status_code == 401
+
+
+def test_list_pages_cover_all_projects_newest_first(client, staff_user, make_project):
+    projects = [make_project(assigned_to=staff_user) for _ in range(7)]
+    client.force_login(staff_user)
+
+    ids = collect_ids(client, limit=3)
+    assert ids == [p.id for p in reversed(projects)]
+
+
+def test_list_breaks_timestamp_ties_by_id(client, staff_user, make_project):
+    projects = [make_project(assigned_to=staff_user) for _ in range(5)]
+    Project.objects.update(date_created=timezone.now())
+    client.force_login(staff_user)
+
+    ids = collect_ids(client, limit=2)
+    assert ids == sorted((p.id for p in projects), reverse=True)
+
+
+def test_list_only_shows_assigned_projects_to_non_admin(client, user, staff_user, make_project):
+    mine = make_project(assigned_to=user)
+    make_project(assigned_to=staff_user)
+    client.force_login(user)
+
+    assert collect_ids(client) == [mine.id]
+
+
+def test_list_filters(client, user, staff_user, make_project):
+    match = make_project(assigned_to=user, status='done', priority='high')
+    make_project(assigned_to=user, status='done', priority='low')
+    make_project(assigned_to=staff_user, status='done', priority='high')
+    make_project(assigned_to=user, status='in_progress', priority='high')
+    client.force_login(staff_user)
+
+    ids = collect_ids(client, status='done', priority='high', assigned_to=user.id)
+    assert ids == [match.id]
+
+
+def test_list_rejects_invalid_cursor(client, staff_user):
+    client.force_login(staff_user)
+    response = client.get(URL, {'cursor': 'not-a-cursor'})
+    assert response.status_code == 400
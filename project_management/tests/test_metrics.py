@@ -0,0 +1,76 @@
+import logging
+import re
+
+import pytest
+
+from projects import metrics
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    metrics.registry.reset()
+
+
+def server_timing(response):
+    return {
+        name: (float(duration), desc)
+        for name, duration, desc in re.findall(r'(\w+);dur=([\d.]+)(?:;desc="([^"]*)")?', response['Server-Timing'])
+    }
+
+
+def test_server_timing_header(client, user, make_project, django_assert_max_num_queries):
+    make_project(assigned_to=user)
+    client.force_login(user)
+
+    with django_assert_max_num_queries(10) as ctx:
+        response = client.get('/api/projects/')
+    assert response.status_code == 200
+    timing = server_timing(response)
+    assert set(timing) == {'db', 'render', 'total'}
+    assert timing['db'][1] == f"{len(ctx.captured_queries)} queries"
+    assert timing['total'][0] >= timing['db'][0] + timing['render'][0]
+
+
+def test_prometheus_metrics(client, user, make_project):
+    project = make_project(assigned_to=user)
+    client.force_login(user)
+    for _ in range(3):
+        client.get(f'/api/projects/{project.id}/')
+    client.get('/api/projects/999999/')
+
+    body = client.get('/metrics').content.decode()
+    route = 'method="GET",route="/api/projects/<int:project_id>/"'
+    assert f'projects_http_requests_total{{{route},status="200"}} 3' in body
+    assert f'projects_http_requests_total{{{route},status="404"}} 1' in body
+    assert f'projects_http_request_duration_seconds_bucket{{{route},le="+Inf"}} 4' in body
+    assert f'projects_http_request_duration_seconds_count{{{route}}} 4' in body
+    assert re.search(rf'projects_http_db_queries_total{{{re.escape(route)}}} [1-9]', body)
+    assert re.search(rf'projects_http_response_bytes_total{{{re.escape(route)}}} [1-9]', body)
+
+
+def test_metrics_token(client, settings):
+    settings.PROJECTS_METRICS_TOKEN = 'scrape-secret'
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer scrape-secret'}).status_code == 200
+
+
+def test_structured_log_line(client, user, make_project, caplog):
+    make_project(assigned_to=user)
+    client.force_login(user)
+
+    with caplog.at_level(logging.INFO, logger='projects.requests'):
+        client.get('/api/projects/')
+    [record] = [r for r in caplog.records if r.name == 'projects.requests']
+    assert (record.method, record.route, record.status) == ('GET', '/api/projects/', 200)
+    assert record.db_queries > 0 and record.response_bytes > 0
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = metrics.Registry(buckets=(0.1, 1.0))
+    for seconds in (0.05, 0.5, 5.0):
+        registry.observe('GET', '/api/projects/', 200, metrics.RequestMetrics(), seconds, 10)
+    body = registry.render()
+    assert 'projects_http_request_duration_seconds_bucket{method="GET",route="/api/projects/",le="0.1"} 1' in body
+    assert 'projects_http_request_duration_seconds_bucket{method="GET",route="/api/projects/",le="1.0"} 2' in body
+    assert 'projects_http_request_duration_seconds_bucket{method="GET",route="/api/projects/",le="+Inf"} 3' in body
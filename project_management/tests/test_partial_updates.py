@@ -0,0 +1,109 @@
+import json
+
+from projects.models import Project
+
+
+def patch(client, project_id, payload):
+    return client.patch(f'/api/projects/{project_id}/', data=json.dumps(payload), content_type='application/json')
+
+
+def update_statements(ctx):
+    return [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE "projects_project"')]
+
+
+def test_patch_writes_only_changed_columns(client, user, staff_user, make_project, django_assert_max_num_queries):
+    project = make_project(assigned_to=user, description="x" * 10000)
+    client.force_login(staff_user)
+
+    with django_assert_max_num_queries(10) as ctx:
+        response = patch(client, project.id, {'status': 'done'})
+
+    assert response.status_code == 200
+    assert response.json()['status'] == 'done'
+    [update] = update_statements(ctx)
+    assert '"status"' in update and '"revision"' in update
+    assert '"description"' not in update and '"name"' not in update
+
+    project.refresh_from_db()
+    assert (project.status, project.revision, project.assigned_to) == ('done', 2, user)
+
+
+def test_patch_reassigns(client, user, staff_user, make_project):
+    project = make_project(assigned_to=user)
+    client.force_login(staff_user)
+
+    assert patch(client, project.id, {'assigned_to': staff_user.id}).json()['assigned_to'] == staff_user.id
+    assert patch(client, project.id, {'assigned_to': 999999}).status_code == 404
+    project.refresh_from_db()
+    assert project.assigned_to == staff_user
+
+
+def test_patch_validates_fields(client, user, staff_user, make_project):
+    project = make_project(assigned_to=user)
+    client.force_login(staff_user)
+
+    assert patch(client, project.id, {'status': 'ongoing'}).status_code == 422
+    assert patch(client, project.id, {'name': None}).status_code == 422
+    assert patch(client, 999999, {'status': 'done'}).status_code == 404
+    client.force_login(user)
+    assert patch(client, project.id, {'status': 'done'}).status_code == 403
+
+
+def test_empty_patch_writes_nothing(client, user, staff_user, make_project, django_assert_max_num_queries):
+    project = make_project(assigned_to=user)
+    client.force_login(staff_user)
+
+    with django_assert_max_num_queries(10) as ctx:
+        assert patch(client, project.id, {}).status_code == 200
+    assert update_statements(ctx) == []
+
+
+def test_list_projection_skips_description(client, staff_user, make_project, django_assert_max_num_queries):
+    make_project(name="Big", description="x" * 10000, assigned_to=staff_user)
+    client.force_login(staff_user)
+
+    with django_assert_max_num_queries(10) as ctx:
+        response = client.get('/api/projects/', {'fields': 'name,status'})
+
+    assert response.status_code == 200
+    [item] = response.json()['items']
+    assert item == {'id': item['id'], 'name': "Big", 'status': 'in_progress'}
+    [select] = [q['sql'] for q in ctx.captured_queries if 'FROM "projects_project"' in q['sql']]
+    assert '"description"' not in select
+
+
+def test_projection_has_its_own_cache_entry_and_etag(client, staff_user, make_project):
+    make_project(assigned_to=staff_user)
+    client.force_login(staff_user)
+
+    full = client.get('/api/projects/')
+    projected = client.get('/api/projects/', {'fields': 'name'})
+    assert 'description' in full.json()['items'][0]
+    assert 'description' not in projected.json()['items'][0]
+    assert full['ETag'] != projected['ETag']
+    # The full representation's ETag doesn't validate the projection
+    assert client.get('/api/projects/', {'fields': 'name'}, HTTP_IF_NONE_MATCH=full['ETag']).status_code == 200
+    assert client.get('/api/projects/', {'fields': 'name'}, HTTP_IF_NONE_MATCH=projected['ETag']).status_code == 304
+
+
+def test_detail_and_search_projection(client, staff_user, make_project):
+    project = make_project(name="Rocket launch", assigned_to=staff_user)
+    client.force_login(staff_user)
+
+    assert client.get(f'/api/projects/{project.id}/', {'fields': 'priority'}).json() == {
+        'id': project.id, 'priority': 'mid',
+    }
+    # A cached full entry is projected on the way out
+    assert 'description' in client.get(f'/api/projects/{project.id}/').json()
+    assert client.get(f'/api/projects/{project.id}/', {'fields': 'name'}).json() == {
+        'id': project.id, 'name': "Rocket launch",
+    }
+    items = client.get('/api/projects/search/', {'q': 'rocket', 'fields': 'assigned_to'}).json()['items']
+    assert items == [{'id': project.id, 'assigned_to': staff_user.id}]
+
+
+def test_unknown_projection_field_is_rejected(client, staff_user):
+    client.force_login(staff_user)
+    response = client.get('/api/projects/', {'fields': 'name,password'})
+    assert response.status_code == 400
+    assert 'password' in response.json()['detail']
@@ -0,0 +1,88 @@
+from django.test import RequestFactory, override_settings
+from projects.middleware import IsAuthenticatedMiddleware
+
+
+def project_queries(ctx):
+    return [q['sql'] for q in ctx.captured_queries if 'projects_project' in q['sql']]
+
+
+def test_hidden_project_is_filtered_in_sql(client, user, staff_user, make_project, django_assert_max_num_queries):
+    project = make_project(assigned_to=staff_user)
+    client.force_login(user)
+
+    with django_assert_max_num_queries(10) as ctx:
+        response = client.get(f'/api/projects/{project.id}/')
+
+    assert response.status_code == 404
+    # The visibility rule is part of the single project query
+    [sql] = project_queries(ctx)
+    assert 'assigned_to_id' in sql
+
+
+def test_admin_route_rejects_before_touching_projects(client, user, make_project, django_assert_max_num_queries):
+    project = make_project(assigned_to=user)
+    client.force_login(user)
+
+    with django_assert_max_num_queries(10) as ctx:
+        response = client.delete(f'/api/projects/{project.id}/')
+
+    assert response.status_code == 403
+    assert project_queries(ctx) == []
+
+
+def test_session_role_is_cached(client, user, make_project, django_assert_num_queries):
+    project = make_project(assigned_to=user)
+    client.force_login(user)
+    client.get(f'/api/projects/{project.id}/')
+
+    # Warm role and response caches: only the session row is read
+    with django_assert_num_queries(1) as ctx:
+        assert client.get(f'/api/projects/{project.id}/').status_code == 200
+    assert 'django_session' in ctx.captured_queries[0]['sql']
+
+
+def test_role_change_takes_effect_immediately(client, user, staff_user, make_project):
+    project = make_project(assigned_to=staff_user)
+    client.force_login(user)
+    assert client.get(f'/api/projects/{project.id}/').status_code == 404
+
+    user.is_staff = True
+    user.save()
+
+    assert client.get(f'/api/projects/{project.id}/').status_code == 200
+
+
+def test_password_change_ends_cached_sessions(client, user):
+    client.force_login(user)
+    assert client.get('/api/projects/').status_code == 200
+
+    user.set_password('a-new-password')
+    user.save()
+
+    assert client.get('/api/projects/').status_code == 401
+
+
+def test_inactive_user_is_rejected(client, user):
+    client.force_login(user)
+    user.is_active = False
+    user.save()
+
+    assert client.get('/api/projects/').status_code == 401
+
+
+@override_settings(AUTH_EXEMPT_PATHS=['/admin/', '/api/docs'])
+def test_middleware_exempts_admin_docs_and_tokens():
+    from django.contrib.auth.models import AnonymousUser
+
+    middleware = IsAuthenticatedMiddleware(lambda request: 'passed')
+    factory = RequestFactory()
+
+    def call(path, **headers):
+        request = factory.get(path, **headers)
+        request.user = AnonymousUser()
+        return middleware(request)
+
+    assert call('/admin/login/') == 'passed'
+    assert call('/api/docs') == 'passed'
+    assert call('/api/projects/', HTTP_AUTHORIZATION='Bearer abc') == 'passed'
+    assert call('/api/projects/').status_code == 401
@@ -0,0 +1,85 @@
+import json
+
+from projects.models import Project
+
+
+def send(client, method, url, payload):
+    return getattr(client, method)(url, data=json.dumps(payload), content_type='application/json')
+
+
+def payload(user, **overrides):
+    data = {
+        'id': None,
+        'name': "New Project",
+        'description': "New Project Description",
+        'status': 'in_progress',
+        'priority': 'mid',
+        'assigned_to': user.id,
+        'date_created': None,
+        'created_by': "",
+    }
+    data.update(overrides)
+    return data
+
+
+def test_create_project(client, user, staff_user):
+    client.force_login(staff_user)
+    response = send(client, 'post', '/api/projects/', payload(user))
+
+    assert response.status_code == 200
+    project = Project.objects.get(id=response.json()['id'])
+    assert (project.name, project.assigned_to, project.created_by) == ("New Project", user, staff_user)
+
+
+def test_create_project_requires_admin(client, user):
+    client.force_login(user)
+    response = send(client, 'post', '/api/projects/', payload(user))
+
+    assert response.status_code == 403
+    assert not Project.objects.exists()
+
+
+def test_create_project_rejects_invalid_status(client, user, staff_user):
+    client.force_login(staff_user)
+    response = send(client, 'post', '/api/projects/', payload(user, status='ongoing'))
+    # Rejected by the schema, which only accepts the model's choices
+    assert response.status_code == 422
+    assert response.json()['detail'][0]['loc'] == ['body', 'payload', 'status']
+    assert not Project.objects.exists()
+
+
+def test_create_project_ignores_read_only_fields(client, user, staff_user):
+    client.force_login(staff_user)
+    response = send(client, 'post', '/api/projects/', payload(user, id=12345, date_created="2000-01-01"))
+
+    assert response.status_code == 200
+    assert response.json()['id'] != 12345
+    assert not response.json()['date_created'].startswith("2000")
+
+
+def test_update_project(client, user, staff_user, make_project):
+    project = make_project(assigned_to=user)
+    client.force_login(staff_user)
+
+    response = send(client, 'put', f'/api/projects/{project.id}/', payload(
+        staff_user, id=project.id, name="Updated Project", status='done',
+    ))
+
+    assert response.status_code == 200
+    project.refresh_from_db()
+    assert (project.name, project.status, project.assigned_to) == ("Updated Project", 'done', staff_user)
+
+
+def test_delete_project(client, staff_user, make_project):
+    project = make_project(assigned_to=staff_user)
+    client.force_login(staff_user)
+
+    response = client.delete(f'/api/projects/{project.id}/')
+
+    assert response.status_code == 200
+    assert not Project.objects.filter(id=project.id).exists()
+
+
+def test_delete_missing_project(client, staff_user):
+    client.force_login(staff_user)
+    assert client.delete('/api/projects/999999/').status_code == 404
@@ -0,0 +1,127 @@
+import json
+
+from django.db.models import Count
+from projects import counters
+from projects.models import Project, ProjectCounter
+
+URL = '/api/projects/stats/'
+
+
+def group_by(attname):
+    return {row[attname]: row['n'] for row in Project.objects.values(attname).annotate(n=Count('id')).order_by()}
+
+
+def assert_matches_table(data):
+    assert data['total'] == Project.objects.count()
+    assert {k: v for k, v in data['by_status'].items() if v} == group_by('status')
+    assert {k: v for k, v in data['by_priority'].items() if v} == group_by('priority')
+    assert {b['assigned_to']: b['count'] for b in data['by_assignee']} == group_by('assigned_to_id')
+
+
+def test_stats_require_admin(client, user):
+    client.force_login(user)
+    assert client.get(URL).status_code == 403
+
+
+def test_stats_follow_every_kind_of_write(client, user, staff_user, make_project):
+    client.force_login(staff_user)
+    first = make_project(assigned_to=user, status='done')
+    second = make_project(assigned_to=user, priority='high')
+    third = make_project(assigned_to=staff_user)
+    make_project(assigned_to=staff_user, priority='low')
+
+    # Single save, through the API
+    payload = {
+        'name': "Moved", 'description': "d", 'status': 'canceled', 'priority': 'low',
+        'assigned_to': staff_user.id, 'created_by': "x",
+    }
+    client.put(f'/api/projects/{second.id}/', data=json.dumps(payload), content_type='application/json')
+    # Bulk writes
+    client.post('/api/projects/bulk/', data=json.dumps({'items': [
+        {'name': "B1", 'description': "b", 'assigned_to': user.id, 'status': 'abandoned'},
+        {'name': "B2", 'description': "b", 'assigned_to': user.id},
+    ]}), content_type='application/json')
+    client.patch('/api/projects/bulk/', data=json.dumps({'items': [
+        {'id': first.id, 'status': 'in_progress', 'assigned_to': staff_user.id},
+    ]}), content_type='application/json')
+    client.delete('/api/projects/bulk/', data=json.dumps({'ids': [third.id]}), content_type='application/json')
+    client.delete(f'/api/projects/{first.id}/')
+    # Saving an unchanged project moves nothing
+    Project.objects.get(id=second.id).save()
+
+    data = client.get(URL).json()
+    assert data['total'] == 4
+    assert_matches_table(data)
+
+
+def test_save_after_refresh_moves_the_refreshed_buckets(client, user, staff_user, make_project):
+    project = make_project(assigned_to=user, status='done')
+    a = Project.objects.get(id=project.id)
+    b = Project.objects.get(id=project.id)
+    b.status = 'abandoned'
+    b.save()
+
+    a.refresh_from_db()
+    a.status = 'canceled'
+    a.save()
+
+    client.force_login(staff_user)
+    data = client.get(URL).json()
+    assert {k: v for k, v in data['by_status'].items() if v} == {'canceled': 1}
+    assert_matches_table(data)
+
+
+def test_saves_without_loaded_values_move_the_stored_buckets(client, user, staff_user, make_project):
+    deferred = make_project(assigned_to=user)
+    by_hand = make_project(assigned_to=user)
+    deleted = make_project(assigned_to=user)
+
+    project = Project.objects.only('id', 'name', 'revision').get(id=deferred.id)
+    project.status = 'done'
+    project.save()
+    Project(
+        id=by_hand.id, name=by_hand.name, description=by_hand.description, status='canceled',
+        priority=by_hand.priority, assigned_to=staff_user, created_by=by_hand.created_by,
+        date_created=by_hand.date_created, revision=by_hand.revision,
+    ).save()
+    Project.objects.only('id').get(id=deleted.id).delete()
+
+    client.force_login(staff_user)
+    data = client.get(URL).json()
+    assert {k: v for k, v in data['by_status'].items() if v} == {'done': 1, 'canceled': 1}
+    assert_matches_table(data)
+
+
+def test_deleted_assignee_becomes_unassigned(client, user, staff_user, make_project):
+    make_project(assigned_to=user)
+    make_project(assigned_to=user)
+    make_project(assigned_to=staff_user)
+    user.delete()
+
+    client.force_login(staff_user)
+    data = client.get(URL).json()
+    assert {'assigned_to': None, 'count': 2} in data['by_assignee']
+    assert_matches_table(data)
+
+
+def test_stats_read_counters_not_projects(client, staff_user, make_project, django_assert_num_queries):
+    for _ in range(5):
+        make_project(assigned_to=staff_user)
+    client.force_login(staff_user)
+    client.get(URL)
+
+    # Session lookup and a single read of the counter rows
+    with django_assert_num_queries(2) as ctx:
+        assert client.get(URL).json()['total'] == 5
+    assert not any('projects_project"' in q['sql'] for q in ctx.captured_queries)
+
+
+def test_rebuild_repairs_drift(client, user, staff_user, make_project):
+    make_project(assigned_to=user, status='done')
+    # A write that bypasses the ORM signals
+    Project.objects.update(status='canceled')
+    ProjectCounter.objects.filter(dimension='priority').delete()
+
+    counters.rebuild()
+    client.force_login(staff_user)
+    assert_matches_table(client.get(URL).json())
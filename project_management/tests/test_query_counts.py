@@ -0,0 +1,248 @@
+"""
+Query-count guard for the whole API.
+
+Every route registered on the Ninja `api` is discovered and called once with
+a single project in the database and once with ROWS projects; a route whose
+query count grows with the rows has an N+1 somewhere. Routes need an entry
+in REQUESTS (or a reason in EXEMPT), so new endpoints can't slip through.
+"""
+import json
+import logging
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.http import HttpResponse
+from django.test import AsyncClient, Client, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from ninja.utils import normalize_path
+
+from projects import cache, jobs
+from projects.middleware import RepeatedQueryMiddleware
+from projects.models import Project
+from projects.views import api
+
+User = get_user_model()
+
+ROWS = 100
+ASSIGNEES = 5
+
+
+def api_routes():
+    """(method, URL path) of every operation registered on the API."""
+    root = reverse(f'{api.urls_namespace}:api-root')
+    for prefix, router in api._routers:
+        for path, path_view in router.path_operations.items():
+            for operation in path_view.operations:
+                for method in operation.methods:
+                    yield method, normalize_path(f'{root}{prefix}/{path}')
+
+
+# Each entry takes the project ids in the database and returns the call to
+# measure; anything done before returning (e.g. getting a token) isn't counted.
+# Requests that take many items send one per project, so they scale too
+def create_project(ids, users):
+    payload = {
+        'name': "New", 'description': "Created", 'status': 'in_progress', 'priority': 'mid',
+        'assigned_to': users[0].id,
+    }
+    return lambda client: client.post('/api/projects/', payload, content_type='application/json')
+
+
+def update_project(ids, users):
+    payload = {
+        'name': "Replaced", 'description': "Put", 'status': 'done', 'priority': 'high',
+        'assigned_to': users[1].id,
+    }
+    return lambda client: client.put(f'/api/projects/{ids[-1]}/', payload, content_type='application/json')
+
+
+def patch_project(ids, users):
+    payload = {'status': 'done', 'assigned_to': users[1].id}
+    return lambda client: client.patch(f'/api/projects/{ids[-1]}/', payload, content_type='application/json')
+
+
+def delete_project(ids, users):
+    return lambda client: client.delete(f'/api/projects/{ids[-1]}/')
+
+
+def obtain_token(ids, users):
+    credentials = {'username': 'staffuser', 'password': 'testpassword'}
+    # Without the session, as token clients call it
+    return lambda client: Client().post('/api/token/', credentials, content_type='application/json')
+
+
+def revoke_token(ids, users):
+    access = obtain_token(ids, users)(None).json()['access']
+    return lambda client: Client().post('/api/token/revoke/', headers={'Authorization': f'Bearer {access}'})
+
+
+def import_projects(ids, users):
+    lines = ''.join(
+        json.dumps({'name': f"Imported {i}", 'description': "Row", 'assigned_to': users[i % len(users)].username})
+        + '\n' for i in range(len(ids))
+    )
+    upload = SimpleUploadedFile('projects.ndjson', lines.encode())
+    return lambda client: client.post('/api/projects/import/', {'file': upload})
+
+
+def bulk_create(ids, users):
+    items = [
+        {'name': f"Bulk {i}", 'description': "Row", 'assigned_to': users[i % len(users)].id}
+        for i in range(len(ids))
+    ]
+    return lambda client: client.post('/api/projects/bulk/', {'items': items}, content_type='application/json')
+
+
+def bulk_update(ids, users):
+    items = [{'id': project_id, 'status': 'done', 'assigned_to': users[0].id} for project_id in ids]
+    return lambda client: client.patch('/api/projects/bulk/', {'items': items}, content_type='application/json')
+
+
+def bulk_delete(ids, users):
+    return lambda client: client.delete('/api/projects/bulk/', {'ids': ids}, content_type='application/json')
+
+
+def enqueue_job(ids, users):
+    payload = {'kind': 'reassign_projects', 'payload': {'from_user': users[0].id, 'to_user': users[1].id}}
+    return lambda client: client.post('/api/jobs/', payload, content_type='application/json')
+
+
+def finished_job(kind, payload):
+    job = jobs.enqueue(kind, payload)
+    jobs.claim('test-worker', 1)
+    jobs.run(job.id)
+    return job.id
+
+
+def get_job(ids, users):
+    job_id = finished_job('reassign_projects', {'from_user': users[0].id, 'to_user': users[1].id})
+    return lambda client: client.get(f'/api/jobs/{job_id}/')
+
+
+def get_job_file(ids, users):
+    job_id = finished_job('export_projects', {'format': 'ndjson'})
+    return lambda client: client.get(f'/api/jobs/{job_id}/file/')
+
+
+def get(path):
+    return lambda ids, users: lambda client: client.get(path.format(id=ids[-1]))
+
+
+def get_over_asgi(path):
+    # For streaming routes, which only answer ASGI requests; same session as `client`
+    def build(ids, users):
+        def call(client):
+            asgi_client = AsyncClient()
+            asgi_client.cookies = client.cookies
+            return async_to_sync(asgi_client.get)(path)
+        return call
+    return build
+
+
+REQUESTS = {
+    ('POST', '/api/token/'): obtain_token,
+    ('POST', '/api/token/revoke/'): revoke_token,
+    ('POST', '/api/projects/'): create_project,
+    ('GET', '/api/projects/'): get(f'/api/projects/?limit={ROWS}'),
+    ('PUT', '/api/projects/{int:project_id}/'): update_project,
+    ('PATCH', '/api/projects/{int:project_id}/'): patch_project,
+    ('GET', '/api/projects/{int:project_id}/'): get('/api/projects/{id}/'),
+    ('DELETE', '/api/projects/{int:project_id}/'): delete_project,
+    ('GET', '/api/projects/export/'): get_over_asgi('/api/projects/export/?format=ndjson'),
+    ('POST', '/api/projects/import/'): import_projects,
+    ('GET', '/api/projects/search/'): get(f'/api/projects/search/?q=tracked&limit={ROWS}'),
+    ('GET', '/api/projects/stats/'): get('/api/projects/stats/'),
+    ('POST', '/api/projects/bulk/'): bulk_create,
+    ('PATCH', '/api/projects/bulk/'): bulk_update,
+    ('DELETE', '/api/projects/bulk/'): bulk_delete,
+    ('GET', '/api/cache/stats/'): get('/api/cache/stats/'),
+    ('POST', '/api/jobs/'): enqueue_job,
+    ('GET', '/api/jobs/{int:job_id}/'): get_job,
+    ('GET', '/api/jobs/{int:job_id}/file/'): get_job_file,
+}
+
+EXEMPT = {
+    ('GET', '/api/projects/events/'): "streams until the client disconnects and reads nothing per event",
+}
+
+
+def fill_projects(count, users):
+    """Top the table up to `count` projects spread over `users`; returns their ids."""
+    missing = count - Project.objects.count()
+    Project.objects.bulk_create([
+        Project(
+            name=f"Tracked project {i}", description="Query count fixture",
+            assigned_to=users[i % len(users)], created_by=users[-1],
+        )
+        for i in range(max(missing, 0))
+    ])
+    return list(Project.objects.order_by('id').values_list('id', flat=True))
+
+
+def count_queries(client, call):
+    # Every call starts cold, so cached roles or pages don't favour the second one
+    cache.get_cache().clear()
+    with CaptureQueriesContext(connection) as ctx:
+        response = call(client)
+        if response.streaming and response.is_async:
+            async def drain():
+                return [chunk async for chunk in response.streaming_content]
+            async_to_sync(drain)()
+        elif response.streaming:
+            list(response.streaming_content)
+    assert response.status_code < 300, response.content
+    return len(ctx.captured_queries)
+
+
+@pytest.mark.parametrize('route', sorted(set(api_routes())), ids=' '.join)
+def test_query_count_does_not_grow_with_rows(client, staff_user, route):
+    if route in EXEMPT:
+        pytest.skip(EXEMPT[route])
+    if route not in REQUESTS:
+        pytest.fail(f"No request for {' '.join(route)}: add one to REQUESTS, or a reason to EXEMPT")
+
+    users = User.objects.bulk_create(
+        [User(username=f'assignee{i}', password='!') for i in range(ASSIGNEES)]
+    ) + [staff_user]
+    client.force_login(staff_user)
+    build = REQUESTS[route]
+
+    single = count_queries(client, build(fill_projects(1, users), users))
+    many = count_queries(client, build(fill_projects(ROWS, users), users))
+
+    assert many <= single, f"{' '.join(route)} ran {single} queries for 1 project and {many} for {ROWS}"
+
+
+def repeated_queries_view(count):
+    def view(request):
+        for project_id in range(count):
+            Project.objects.filter(id=project_id).first()
+        return HttpResponse()
+    return view
+
+
+def test_repeated_query_warning(settings, caplog, db):
+    settings.DEBUG = True
+    settings.PROJECTS_REPEATED_QUERY_THRESHOLD = 3
+    request = RequestFactory().get('/api/projects/')
+
+    with caplog.at_level(logging.WARNING, logger='projects.queries'):
+        RepeatedQueryMiddleware(repeated_queries_view(3))(request)
+        assert not caplog.records
+        RepeatedQueryMiddleware(repeated_queries_view(4))(request)
+
+    [record] = caplog.records
+    assert record.count == 4
+    assert record.sql.startswith('SELECT') and '"projects_project"."id" = %s' in record.sql
+    assert "GET /api/projects/ ran the same query 4 times" in record.getMessage()
+
+
+def test_repeated_query_check_needs_debug(settings):
+    settings.DEBUG = False
+    with pytest.raises(MiddlewareNotUsed):
+        RepeatedQueryMiddleware(repeated_queries_view(0))
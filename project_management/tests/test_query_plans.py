@@ -0,0 +1,94 @@
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+TABLE = 'projects_project'
+
+# Plan lines that mean the whole project table is read row by row
+FULL_SCAN_PATTERNS = {
+    'sqlite': re.compile(rf'^SCAN {TABLE}$'),
+    'postgresql': re.compile(rf'Seq Scan on {TABLE}\b'),
+}
+
+
+def explain(sql):
+    """Return the plan lines of `sql` for the current database backend."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return [row[-1] for row in cursor.fetchall()]
+        # Tiny test tables make a sequential scan the cheapest plan on
+        # Postgres; forbid it so the planner has to prove an index is usable.
+        cursor.execute('SET LOCAL enable_seqscan = off')
+        cursor.execute(f'EXPLAIN {sql}')
+        return [row[0] for row in cursor.fetchall()]
+
+
+def project_queries(client, url, params=None):
+    """Call `url` and return the SQL of every query it ran against the project table."""
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url, params or {})
+    assert response.status_code == 200, response.content
+    queries = [q['sql'] for q in ctx.captured_queries if TABLE in q['sql']]
+    assert queries, f"{url} ran no project queries"
+    return queries
+
+
+def assert_no_full_scan(sql):
+    if connection.vendor not in FULL_SCAN_PATTERNS:
+        pytest.skip(f"No plan checks for {connection.vendor}")
+    pattern = FULL_SCAN_PATTERNS[connection.vendor]
+    plan = explain(sql)
+    scans = [line for line in plan if pattern.search(line.strip())]
+    assert not scans, "Full table scan:\n{}\n\n{}".format(sql, '\n'.join(plan))
+
+
+@pytest.fixture
+def projects(user, staff_user, make_project):
+    statuses = ['in_progress', 'done', 'abandoned', 'canceled']
+    priorities = ['low', 'mid', 'high']
+    return [
+        make_project(
+            assigned_to=user if i % 2 else staff_user,
+            status=statuses[i % len(statuses)],
+            priority=priorities[i % len(priorities)],
+        )
+        for i in range(12)
+    ]
+
+
+def test_get_project_plan(client, staff_user, projects):
+    client.force_login(staff_user)
+    for sql in project_queries(client, f'/api/projects/{projects[0].id}/'):
+        assert_no_full_scan(sql)
+
+
+@pytest.mark.parametrize('params', [
+    {},
+    {'status': 'done'},
+    {'status': 'done', 'priority': 'high'},
+    {'priority': 'high'},
+    {'assigned_to': 'USER'},
+    {'assigned_to': 'USER', 'status': 'done'},
+])
+def test_admin_list_plans(client, user, staff_user, projects, params):
+    client.force_login(staff_user)
+    params = {k: user.id if v == 'USER' else v for k, v in params.items()}
+    for sql in project_queries(client, '/api/projects/', params):
+        assert_no_full_scan(sql)
+
+
+@pytest.mark.parametrize('params', [{}, {'status': 'done'}])
+def test_user_list_plans(client, user, projects, params):
+    client.force_login(user)
+    for sql in project_queries(client, '/api/projects/', params):
+        assert_no_full_scan(sql)
+
+
+def test_list_next_page_plan(client, staff_user, projects):
+    client.force_login(staff_user)
+    cursor = client.get('/api/projects/', {'limit': 5}).json()['next_cursor']
+    for sql in project_queries(client, '/api/projects/', {'limit': 5, 'cursor': cursor}):
+        assert_no_full_scan(sql)
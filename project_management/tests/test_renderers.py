@@ -0,0 +1,46 @@
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from projects import renderers
+from projects.views import AssigneeCountSchema
+
+PAYLOAD = {
+    'when': datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+    'whole_second': datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc),
+    'amount': Decimal('1.50'),
+    'model': AssigneeCountSchema(assigned_to=None, count=2),
+    'items': [1, "two", None, True],
+}
+
+
+@pytest.fixture(params=['orjson', 'stdlib'])
+def backend(request, monkeypatch):
+    if request.param == 'stdlib':
+        monkeypatch.setattr(renderers, 'orjson', None)
+    elif renderers.orjson is None:
+        pytest.skip("orjson is not installed")
+    return request.param
+
+
+def test_both_backends_encode_the_same(backend):
+    assert json.loads(renderers.dumps(PAYLOAD)) == {
+        'when': '2024-05-01T12:30:15.123456+00:00',
+        'whole_second': '2024-05-01T12:30:00+00:00',
+        'amount': '1.50',
+        'model': {'assigned_to': None, 'count': 2},
+        'items': [1, "two", None, True],
+    }
+    assert renderers.loads(b'{"a": [1, 2]}') == {'a': [1, 2]}
+
+
+def test_api_renders_dates_and_parses_bodies(client, staff_user, make_project, backend):
+    project = make_project(assigned_to=staff_user)
+    client.force_login(staff_user)
+
+    data = client.get(f'/api/projects/{project.id}/').json()
+    assert data['date_created'] == project.date_created.isoformat()
+
+    response = client.post('/api/projects/', data=b'{"name": ', content_type='application/json')
+    assert response.status_code == 400
@@ -0,0 +1,114 @@
+import json
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connections
+
+from project_management.database import database_config
+from projects import replicas
+from projects.bulk import bulk_delete_projects
+from projects.models import Project, ProjectCounter
+
+
+REPLICA = 'replica'
+
+pytestmark = pytest.mark.django_db(databases=['default', REPLICA])
+
+
+@pytest.fixture(scope='module', autouse=True)
+def replica_database(tmp_path_factory, django_db_blocker):
+    """
+    A second SQLite file registered as a replica. Nothing replicates to it:
+    tests write to it directly to simulate a lagging replica.
+    """
+    # Module scope, so the alias exists before the test's database access is set up
+    path = tmp_path_factory.mktemp('replica') / 'replica.sqlite3'
+    connections.settings[REPLICA] = connections.configure_settings({
+        **connections.settings, REPLICA: database_config(f'sqlite:///{path}'),
+    })[REPLICA]
+    with django_db_blocker.unblock():
+        call_command('migrate', database=REPLICA, verbosity=0)
+    yield
+    connections[REPLICA].close()
+    del connections[REPLICA]
+    del connections.settings[REPLICA]
+
+
+@pytest.fixture
+def replica(settings):
+    settings.PROJECTS_READ_REPLICAS = [REPLICA]
+    return REPLICA
+
+
+def copy_to_replica(alias, *projects):
+    # bulk_create sends no signals, so the primary's counters and cache are left alone
+    Project.objects.using(alias).bulk_create([
+        Project(id=p.id, name=p.name, description=p.description, status=p.status, priority=p.priority, revision=p.revision)
+        for p in projects
+    ])
+
+
+def test_reads_use_replica(client, staff_user, make_project, replica):
+    project = make_project(name="Primary")
+    lagging = make_project(name="Not replicated yet")
+    copy_to_replica(replica, Project(id=project.id, name="Replica", description="Old", revision=1))
+    ProjectCounter.objects.using(replica).create(dimension='status', value='done', count=7)
+    client.force_login(staff_user)
+
+    assert client.get(f'/api/projects/{project.id}/').json()['name'] == "Replica"
+    assert client.get(f'/api/projects/{lagging.id}/').status_code == 404
+    assert [item['name'] for item in client.get('/api/projects/').json()['items']] == ["Replica"]
+    assert client.get('/api/projects/search/?q=replica').json()['items'][0]['id'] == project.id
+    assert client.get('/api/projects/stats/').json()['by_status']['done'] == 7
+
+
+def test_writer_reads_own_writes(client, user, staff_user, make_project, replica):
+    project = make_project(name="Primary")
+    copy_to_replica(replica, project)
+    client.force_login(staff_user)
+
+    response = client.patch(
+        f'/api/projects/{project.id}/', data=json.dumps({'name': "Renamed"}), content_type='application/json',
+    )
+    assert response.status_code == 200
+    assert client.get(f'/api/projects/{project.id}/').json()['name'] == "Renamed"
+    assert client.get('/api/projects/').json()['items'][0]['name'] == "Renamed"
+
+    # Other callers keep reading the replica until it catches up
+    User.objects.using(replica).bulk_create([User(id=user.id, username=user.username)])
+    Project.objects.using(replica).filter(id=project.id).update(assigned_to=user)
+    client.force_login(user)
+    assert client.get('/api/projects/').json()['items'][0]['name'] == "Primary"
+
+
+def test_writes_go_to_primary(make_project, replica):
+    project = make_project(name="Primary")
+    copy_to_replica(replica, project)
+
+    with replicas.reading_from(replica):
+        copy = Project.objects.get(id=project.id)
+        copy.name = "Saved"
+        copy.save()
+
+    assert Project.objects.get(id=project.id).name == "Saved"
+    assert Project.objects.using(replica).get(id=project.id).name == "Primary"
+
+
+def test_bulk_delete_goes_to_primary(make_project, replica):
+    project = make_project(name="Primary")
+    copy_to_replica(replica, project)
+
+    with replicas.reading_from(replica):
+        result = bulk_delete_projects([project.id])
+
+    assert result.ids == [project.id]
+    assert not Project.objects.filter(id=project.id).exists()
+    assert Project.objects.using(replica).filter(id=project.id).exists()
+
+
+def test_no_replicas_configured(client, staff_user, make_project, settings):
+    settings.PROJECTS_READ_REPLICAS = []
+    project = make_project()
+    client.force_login(staff_user)
+    assert client.get(f'/api/projects/{project.id}/').status_code == 200
@@ -0,0 +1,86 @@
+import pytest
+from django.db import connection
+from projects import search
+from projects.models import Project
+
+URL = '/api/projects/search/'
+
+
+def names(response):
+    assert response.status_code == 200
+    return [item['name'] for item in response.json()['items']]
+
+
+def test_results_are_ranked(client, staff_user, make_project):
+    make_project(name="Quarterly report", description="Numbers for the database team", assigned_to=staff_user)
+    make_project(name="Database migration", description="Move the database to new servers", assigned_to=staff_user)
+    make_project(name="Website", description="Landing page", assigned_to=staff_user)
+    client.force_login(staff_user)
+
+    # Name matches outrank description matches
+    assert names(client.get(URL, {'q': 'database'})) == ["Database migration", "Quarterly report"]
+    # Every term must match; stemming finds "servers" from "server"
+    assert names(client.get(URL, {'q': 'database server'})) == ["Database migration"]
+    assert names(client.get(URL, {'q': 'nothing'})) == []
+
+
+def test_index_follows_writes(client, staff_user, make_project):
+    project = make_project(name="Alpha", assigned_to=staff_user)
+    client.force_login(staff_user)
+    assert names(client.get(URL, {'q': 'alpha'})) == ["Alpha"]
+
+    project.name = "Beta"
+    project.save()
+    assert names(client.get(URL, {'q': 'alpha'})) == []
+    assert names(client.get(URL, {'q': 'beta'})) == ["Beta"]
+
+    Project.objects.bulk_create([Project(name="Beta two", description="bulk")])
+    assert names(client.get(URL, {'q': 'beta'})) == ["Beta", "Beta two"]
+
+    Project.objects.filter(name__startswith="Beta").delete()
+    assert names(client.get(URL, {'q': 'beta'})) == []
+
+
+def test_search_only_returns_visible_projects(client, user, staff_user, make_project):
+    make_project(name="Shared roadmap", assigned_to=user)
+    make_project(name="Secret roadmap", assigned_to=staff_user)
+    client.force_login(user)
+    assert names(client.get(URL, {'q': 'roadmap'})) == ["Shared roadmap"]
+
+
+def test_search_pages_through_results(client, staff_user, make_project):
+    for i in range(5):
+        make_project(name=f"Launch {i}", assigned_to=staff_user)
+    client.force_login(staff_user)
+
+    seen, cursor = [], None
+    while True:
+        params = {'q': 'launch', 'limit': 2}
+        if cursor:
+            params['cursor'] = cursor
+        data = client.get(URL, params).json()
+        seen += [item['name'] for item in data['items']]
+        cursor = data['next_cursor']
+        if cursor is None:
+            break
+    assert sorted(seen) == [f"Launch {i}" for i in range(5)]
+    assert client.get(URL, {'q': 'launch', 'cursor': 'bogus'}).status_code == 400
+
+
+@pytest.mark.parametrize('query', ['"unbalanced', 'NEAR(a b', 'name:x OR', '***', ''])
+def test_search_syntax_is_not_interpreted(client, staff_user, make_project, query):
+    make_project(name="Plain", assigned_to=staff_user)
+    client.force_login(staff_user)
+    assert client.get(URL, {'q': query}).status_code == 200
+
+
+def test_install_repairs_dropped_triggers(make_project):
+    make_project(name="Orphan")
+    with connection.cursor() as cursor:
+        for trigger in search.SQLITE_TRIGGERS:
+            cursor.execute(f"DROP TRIGGER {trigger}")
+    make_project(name="Missed by the index")
+
+    search.install(connection)
+    found = search.search(Project.objects.all(), 'missed')
+    assert [p.name for p in found] == ["Missed by the index"]
@@ -0,0 +1,53 @@
+import pytest
+from projects.models import Project
+from projects.views import ProjectSchema
+
+
+@pytest.mark.parametrize('count', [1, 25])
+def test_from_queryset_uses_one_query(user, make_project, django_assert_num_queries, count):
+    for _ in range(count):
+        make_project(assigned_to=user)
+
+    with django_assert_num_queries(1):
+        items = ProjectSchema.from_queryset(Project.objects.all())
+
+    assert len(items) == count
+    assert all(item.assigned_to == user.id for item in items)
+
+
+def test_from_queryset_projection_leaves_deferred_columns_alone(user, make_project, django_assert_num_queries):
+    make_project(assigned_to=user)
+
+    with django_assert_num_queries(1):
+        [item] = ProjectSchema.from_queryset(Project.objects.only('id', 'name', 'revision'), ('id', 'name'))
+
+    assert item.model_dump(exclude_unset=True) == {'id': item.id, 'name': "Test Project"}
+
+
+def test_from_model_handles_deleted_assignee(user, make_project):
+    project = make_project(assigned_to=None)
+    assert ProjectSchema.from_model(project).assigned_to is None
+
+
+@pytest.mark.parametrize('count', [1, 25])
+def test_list_query_count_is_constant(client, staff_user, make_project, django_assert_num_queries, count):
+    for _ in range(count):
+        make_project(assigned_to=staff_user)
+    client.force_login(staff_user)
+
+    # Session, user, and the single page query
+    with django_assert_num_queries(3):
+        response = client.get('/api/projects/')
+
+    assert len(response.json()['items']) == count
+
+
+def test_get_project_query_count(client, user, staff_user, make_project, django_assert_num_queries):
+    project = make_project(assigned_to=user)
+    client.force_login(staff_user)
+
+    # Session, user, and the project
+    with django_assert_num_queries(3):
+        response = client.get(f'/api/projects/{project.id}/')
+
+    assert response.json()['assigned_to'] == user.id
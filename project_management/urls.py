@@ -1,9 +1,10 @@
 from django.contrib import admin
 from django.urls import path
-from projects.views import api  # Import the API instance directly
+from projects.views import api, prometheus_metrics  # Import the API instance directly
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', api.urls), 
+    path('metrics', prometheus_metrics),
     
 ]
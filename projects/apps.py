@@ -1,6 +1,24 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate
 
 
 class ProjectsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "projects"
+
+    def ready(self):
+        from . import metrics, signals  # noqa: F401
+
+        post_migrate.connect(install_search_index, sender=self)
+        connection_created.connect(metrics.install_query_recorder)
+
+
+def install_search_index(sender, using, **kwargs):
+    # Later migrations may rebuild the project table on SQLite and drop the
+    # search triggers with it; put them back after every migrate
+    from django.db import connections
+
+    from . import search
+
+    search.install(connections[using])
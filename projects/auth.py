@@ -0,0 +1,181 @@
+# projects/auth.py
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.models import User
+from django.utils.crypto import constant_time_compare
+from ninja.errors import HttpError
+from ninja.security import APIKeyCookie, HttpBearer
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.tokens import AccessToken
+
+from . import cache
+
+REVOKED_KEY = 'projects:revoked:{}'
+ROLE_KEY = 'projects:role:{}'
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of already verified access tokens.
+
+    Repeat requests with the same token skip signature verification and
+    claim parsing; entries are dropped once the token expires.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, token):
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            if entry['exp'] <= time.time():
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return entry
+
+    def set(self, token, entry):
+        with self._lock:
+            self._entries[token] = entry
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+verified_tokens = VerifiedTokenCache(settings.PROJECTS_JWT_CACHE_SIZE)
+
+
+def issue_token(user):
+    """Signed access token carrying everything the API needs to identify `user`."""
+    token = AccessToken.for_user(user)
+    token['is_staff'] = user.is_staff
+    token['username'] = user.get_username()
+    return token
+
+
+def _verify(token):
+    entry = verified_tokens.get(token)
+    if entry is None:
+        try:
+            claims = AccessToken(token).payload
+        except TokenError:
+            return None
+        entry = {'claims': claims, 'exp': claims['exp']}
+        verified_tokens.set(token, entry)
+    return entry['claims']
+
+
+async def resolve_role(user_id):
+    """
+    Identity and role of an active user, cached so session requests don't
+    fetch the User row every time. The session auth hash is cached too, so a
+    password change still logs out existing sessions.
+    """
+    key = ROLE_KEY.format(user_id)
+    role = await cache.get_cache().aget(key)
+    if role is None:
+        user = await User.objects.filter(pk=user_id, is_active=True).afirst()
+        if user is None:
+            return None
+        role = {
+            'user_id': user.pk,
+            'username': user.get_username(),
+            'is_staff': user.is_staff,
+            'session_hash': user.get_session_auth_hash(),
+        }
+        await cache.get_cache().aset(key, role, settings.PROJECTS_ROLE_CACHE_TIMEOUT)
+    return role
+
+
+def forget_role(user_id):
+    cache.get_cache().delete(ROLE_KEY.format(user_id))
+
+
+def _check_role(principal, staff_only):
+    if staff_only and not principal.is_staff:
+        # Authenticated but not allowed: fail with 403 rather than 401
+        raise HttpError(403, "Forbidden")
+    return principal
+
+
+async def revoke_token(claims):
+    """
+    Reject the token with these claims until it would have expired anyway.
+
+    Only processes sharing the project cache see the revocation; see
+    projects.deployment.
+    """
+    remaining = int(claims['exp'] - time.time())
+    if remaining > 0:
+        await cache.get_cache().aset(REVOKED_KEY.format(claims['jti']), True, remaining)
+
+
+class JWTAuth(HttpBearer):
+    """
+    Stateless bearer authentication for the project API.
+
+    The caller is rebuilt from the token's claims as a TokenUser, so neither
+    the session table nor the user table is read. The only per-request
+    lookup is the revocation list, which lives in the project cache and so
+    needs a shared backend when several processes serve the API. With
+    `staff_only`, non-staff callers are rejected with 403.
+    """
+
+    def __init__(self, staff_only=False):
+        self.staff_only = staff_only
+        super().__init__()
+
+    async def authenticate(self, request, token):
+        claims = _verify(token)
+        if claims is None:
+            return None
+        if await cache.get_cache().aget(REVOKED_KEY.format(claims['jti'])):
+            return None
+        request.token_claims = claims
+        return _check_role(TokenUser(claims), self.staff_only)
+
+
+class SessionAuth(APIKeyCookie):
+    """
+    Django session authentication that resolves the caller's role from the
+    cache instead of loading the User row. The caller is a TokenUser just
+    like with JWTAuth, so views handle both the same way.
+    """
+
+    param_name = settings.SESSION_COOKIE_NAME
+
+    def __init__(self, staff_only=False, csrf=True):
+        self.staff_only = staff_only
+        super().__init__(csrf=csrf)
+
+    async def authenticate(self, request, key):
+        if not key:
+            return None
+        user_id = await request.session.aget(SESSION_KEY)
+        if user_id is None:
+            return None
+        role = await resolve_role(user_id)
+        if role is None:
+            return None
+        session_hash = await request.session.aget(HASH_SESSION_KEY)
+        if not session_hash or not constant_time_compare(session_hash, role['session_hash']):
+            return None
+        return _check_role(TokenUser(role), self.staff_only)
+
+
+# Route-level auth: any authenticated caller, or staff only
+authenticated = [JWTAuth(), SessionAuth()]
+admin_only = [JWTAuth(staff_only=True), SessionAuth(staff_only=True)]
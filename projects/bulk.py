@@ -0,0 +1,252 @@
+# projects/bulk.py
+from collections import Counter
+from typing import List, Literal, Optional
+
+from django.contrib.auth.models import User
+from django.db import connections, router, transaction
+from django.db.models import F
+from pydantic import BaseModel, Field, ValidationError
+
+from . import cache, counters, events
+from .models import Project
+
+# Upper bound on items per request; keeps the `IN (...)` lookups below the
+# database's bound parameter limit and a single transaction reasonably short.
+MAX_BULK_ITEMS = 5000
+BULK_BATCH_SIZE = 500
+
+# The model's choices as schema types, so pydantic-core checks them
+ProjectStatus = Literal[tuple(value for value, _ in Project.STATUS_CHOICES)]
+ProjectPriority = Literal[tuple(value for value, _ in Project.PRIORITY_CHOICES)]
+NAME_MAX_LENGTH = Project._meta.get_field('name').max_length
+
+
+class BulkCreateItem(BaseModel):
+    name: str = Field(..., max_length=NAME_MAX_LENGTH)
+    description: str
+    status: ProjectStatus = 'in_progress'
+    priority: ProjectPriority = 'mid'
+    assigned_to: int
+
+
+class BulkUpdateItem(BaseModel):
+    id: int
+    name: Optional[str] = Field(None, max_length=NAME_MAX_LENGTH)
+    description: Optional[str] = None
+    status: Optional[ProjectStatus] = None
+    priority: Optional[ProjectPriority] = None
+    assigned_to: Optional[int] = None
+
+
+class BulkItemsSchema(BaseModel):
+    # Items are validated one by one so a bad item doesn't reject the batch
+    items: List[dict]
+
+
+class BulkDeleteSchema(BaseModel):
+    ids: List[int]
+
+
+class BulkErrorSchema(BaseModel):
+    index: int
+    error: str
+
+
+class BulkResultSchema(BaseModel):
+    ids: List[int]
+    errors: List[BulkErrorSchema]
+
+
+def _validation_message(exc):
+    return '; '.join(
+        f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in exc.errors()
+    )
+
+
+def _parse_items(items, schema):
+    """Validate raw items against `schema`, returning (index, item) pairs and errors."""
+    parsed, errors = [], []
+    for index, raw in enumerate(items):
+        try:
+            parsed.append((index, schema.model_validate(raw)))
+        except ValidationError as exc:
+            errors.append(BulkErrorSchema(index=index, error=_validation_message(exc)))
+    return parsed, errors
+
+
+def _load_users(parsed):
+    """Resolve every referenced assignee with a single `IN` query."""
+    user_ids = {item.assigned_to for _, item in parsed if item.assigned_to is not None}
+    return User.objects.in_bulk(user_ids)
+
+
+def bulk_create_projects(items, created_by_id):
+    parsed, errors = _parse_items(items, BulkCreateItem)
+    users = _load_users(parsed)
+
+    projects = []
+    for index, item in parsed:
+        if item.assigned_to not in users:
+            errors.append(BulkErrorSchema(index=index, error=f"User not found: {item.assigned_to}"))
+            continue
+        projects.append(Project(
+            **item.model_dump(exclude={'assigned_to'}),
+            assigned_to=users[item.assigned_to],
+            created_by_id=created_by_id,
+        ))
+
+    with transaction.atomic():
+        created = Project.objects.bulk_create(projects, batch_size=BULK_BATCH_SIZE)
+        counters.track(created=created)
+    # bulk_create doesn't send post_save; new rows only affect cached lists
+    if created:
+        cache.invalidate_projects([])
+    for project in created:
+        events.publish(events.project_event('created', project))
+
+    return BulkResultSchema(ids=[p.id for p in created], errors=sorted(errors, key=lambda e: e.index))
+
+
+def bulk_update_projects(items):
+    parsed, errors = _parse_items(items, BulkUpdateItem)
+    users = _load_users(parsed)
+
+    with transaction.atomic():
+        # Locked until the batch commits, so each new revision builds on the row
+        # actually stored and no concurrent write is overwritten or counted twice
+        existing = Project.objects.select_for_update().in_bulk({item.id for _, item in parsed})
+
+        projects, fields, seen, previous_assignees = [], set(), set(), {}
+        for index, item in parsed:
+            changes = item.model_dump(exclude={'id'}, exclude_unset=True)
+            error = None
+            if item.id not in existing:
+                error = f"Project not found: {item.id}"
+            # Applying one project twice would bump its revision and move its counters twice
+            if error is None and item.id in seen:
+                error = f"Duplicate id: {item.id}"
+            if error is None and None in changes.values():
+                error = "Fields cannot be null"
+            if error is None and 'assigned_to' in changes and changes['assigned_to'] not in users:
+                error = f"User not found: {changes['assigned_to']}"
+            if error:
+                errors.append(BulkErrorSchema(index=index, error=error))
+                continue
+
+            seen.add(item.id)
+            project = existing[item.id]
+            previous_assignees[project.id] = project.assigned_to_id
+            for attr, value in changes.items():
+                if attr == 'assigned_to':
+                    value = users[value]
+                setattr(project, attr, value)
+            # bulk_update bypasses Project.save, so bump the revision here
+            project.revision += 1
+            projects.append(project)
+            fields.update(changes)
+
+        if projects and fields:
+            Project.objects.bulk_update(projects, sorted(fields | {'revision'}), batch_size=BULK_BATCH_SIZE)
+            counters.track(updated=projects)
+    # bulk_update doesn't send post_save, so the cache and counters are updated here
+    if projects:
+        cache.invalidate_projects([p.id for p in projects])
+    for project in projects:
+        events.publish(events.project_event('updated', project, previous_assignees[project.id]))
+
+    return BulkResultSchema(ids=[p.id for p in projects], errors=sorted(errors, key=lambda e: e.index))
+
+
+def bulk_delete_projects(ids):
+    """
+    Delete the listed projects with a single DELETE.
+
+    The counters, cache and event subscribers are told about the whole batch
+    at once instead of through a pre/post_delete signal (and its queries) per
+    row. The statement also skips Django's cascade collection: nothing
+    references a project today, but a foreign key to Project added later
+    would be neither cascaded nor set to NULL here.
+    """
+    using = router.db_for_write(Project)
+    with transaction.atomic(using=using):
+        # Just the columns counters and events need; loaded rows remember them
+        projects = list(
+            Project.objects.using(using).filter(id__in=ids).select_for_update()
+            .only('id', 'status', 'priority', 'assigned_to', 'revision')
+        )
+        existing = {project.id for project in projects}
+        if projects:
+            connection = connections[using]
+            table, pk = (connection.ops.quote_name(name) for name in (Project._meta.db_table, Project._meta.pk.column))
+            placeholders = ', '.join(['%s'] * len(existing))
+            with connection.cursor() as cursor:
+                cursor.execute(f"DELETE FROM {table} WHERE {pk} IN ({placeholders})", sorted(existing))
+            counters.track(deleted=projects)
+
+    if projects:
+        cache.invalidate_projects(sorted(existing))
+    for project in projects:
+        events.publish(events.project_event('deleted', project))
+
+    errors = [
+        BulkErrorSchema(index=index, error=f"Project not found: {project_id}")
+        for index, project_id in enumerate(ids) if project_id not in existing
+    ]
+    return BulkResultSchema(ids=[i for i in ids if i in existing], errors=errors)
+
+
+def _update_all(queryset, field, value):
+    """
+    Set `field` to `value` on every project in `queryset` with a single UPDATE.
+
+    The rows that actually change are read once, with their columns only,
+    to move the counters and tell the cache and event subscribers; no model
+    instances are loaded and no per-row signals are sent.
+    """
+    attname = Project._meta.get_field(field).attname
+    changing = queryset.exclude(**{attname: value})
+    with transaction.atomic():
+        # Locked, so the counters can't drift from what the UPDATE changes
+        rows = list(
+            changing.select_for_update().values_list('id', 'status', 'priority', 'assigned_to_id', 'revision')
+        )
+        if not rows:
+            return 0
+        # Same filter as the SELECT, so the statement doesn't grow with the selection
+        changing.update(**{attname: value, 'revision': F('revision') + 1})
+        projects, previous_assignees, deltas = [], {}, Counter()
+        for project_id, status, priority, assigned_to_id, revision in rows:
+            previous_assignees[project_id] = assigned_to_id
+            project = Project(
+                id=project_id, status=status, priority=priority, assigned_to_id=assigned_to_id, revision=revision + 1,
+            )
+            deltas.subtract(counters.current_buckets(project))
+            setattr(project, attname, value)
+            deltas.update(counters.current_buckets(project))
+            projects.append(project)
+        counters.apply(deltas)
+
+    project_ids = [project.id for project in projects]
+    cache.invalidate_projects(project_ids)
+    batch = [events.project_event('updated', project, previous_assignees[project.id]) for project in projects]
+    # Inside a caller's transaction (a user delete, the admin) other readers see
+    # the rows only once it commits: drop them again and announce them then
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: cache.invalidate_projects(project_ids))
+    transaction.on_commit(lambda: _publish_all(batch))
+    return len(projects)
+
+
+def _publish_all(batch):
+    for event in batch:
+        events.publish(event)
+
+
+def set_status(queryset, status):
+    """Move every project in `queryset` to `status`; returns how many changed."""
+    return _update_all(queryset, 'status', status)
+
+
+def reassign(queryset, user_id):
+    """Assign every project in `queryset` to `user_id` (None to unassign); returns how many changed."""
+    return _update_all(queryset, 'assigned_to', user_id)
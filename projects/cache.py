@@ -0,0 +1,103 @@
+# projects/cache.py
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from . import replicas
+
+# Bump the version when the cached schemas change shape
+DETAIL_KEY = 'projects:detail:v3:{}'
+LIST_KEY = 'projects:list:v3:{generation}:{scope}:{signature}'
+# Bumped on every write so all cached list pages go stale at once, without
+# having to track which pages contain which project
+GENERATION_KEY = 'projects:list:generation'
+
+
+class CacheStats:
+    """Process-wide hit/miss counters for monitoring the project cache."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+    def incr(self, name):
+        with self._lock:
+            self._counts[name] += 1
+
+    def snapshot(self):
+        with self._lock:
+            counts = dict(self._counts)
+        lookups = counts['hits'] + counts['misses']
+        counts['hit_ratio'] = counts['hits'] / lookups if lookups else 0.0
+        return counts
+
+    def reset(self):
+        with self._lock:
+            for name in self._counts:
+                self._counts[name] = 0
+
+
+stats = CacheStats()
+
+
+def get_cache():
+    return caches[settings.PROJECTS_CACHE_ALIAS]
+
+
+async def _lookup(key):
+    value = await get_cache().aget(key)
+    stats.incr('misses' if value is None else 'hits')
+    return value
+
+
+def visibility_scope(user):
+    """Part of the cache key that captures which projects `user` may see."""
+    return 'all' if user.is_staff else f'user:{user.id}'
+
+
+async def list_key(user, **params):
+    cache = get_cache()
+    generation = await cache.aget_or_set(GENERATION_KEY, time.time_ns, timeout=None)
+    raw = '&'.join(f'{name}={params[name]}' for name in sorted(params))
+    signature = hashlib.sha1(raw.encode()).hexdigest()
+    return LIST_KEY.format(generation=generation, scope=visibility_scope(user), signature=signature)
+
+
+def _timeout():
+    # Rows read from a replica can already be behind the primary, so what is
+    # cached from them only lives until replication has caught up
+    if replicas.current() is not None:
+        return min(settings.PROJECTS_REPLICA_LAG, settings.PROJECTS_CACHE_TIMEOUT)
+    return settings.PROJECTS_CACHE_TIMEOUT
+
+
+async def get_project(project_id):
+    return await _lookup(DETAIL_KEY.format(project_id))
+
+
+async def set_project(project_id, value):
+    await get_cache().aset(DETAIL_KEY.format(project_id), value, _timeout())
+
+
+async def get_list(key):
+    return await _lookup(key)
+
+
+async def set_list(key, value):
+    await get_cache().aset(key, value, _timeout())
+
+
+def invalidate_projects(project_ids):
+    """Drop cached copies of the given projects and every cached list page."""
+    cache = get_cache()
+    cache.delete_many([DETAIL_KEY.format(project_id) for project_id in project_ids])
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        # The generation was evicted; start a fresh one that can't collide
+        # with any generation still referenced by cached pages
+        cache.set(GENERATION_KEY, time.time_ns(), timeout=None)
+    stats.incr('invalidations')
@@ -0,0 +1,128 @@
+# projects/counters.py
+import operator
+from collections import Counter
+from functools import reduce
+from itertools import chain
+
+from django.db import transaction
+from django.db.models import Case, Count, F, Q, Value, When
+
+from .models import Project, ProjectCounter
+
+# Breakdown dimension -> Project attribute it counts
+DIMENSIONS = {
+    'status': 'status',
+    'priority': 'priority',
+    'assigned_to': 'assigned_to_id',
+}
+
+
+def _value(raw):
+    return '' if raw is None else str(raw)
+
+
+def current_buckets(project):
+    return [(dimension, _value(getattr(project, attname))) for dimension, attname in DIMENSIONS.items()]
+
+
+def stored_buckets(project):
+    """Buckets `project` is currently counted in, from the values it was loaded with."""
+    loaded = getattr(project, '_loaded_values', None) or {}
+    if not all(attname in loaded for attname in DIMENSIONS.values()):
+        # Only right before the write; the signal receivers call load_stored() for that
+        loaded = Project.objects.filter(pk=project.pk).values(*DIMENSIONS.values()).get()
+    return [(dimension, _value(loaded[attname])) for dimension, attname in DIMENSIONS.items()]
+
+
+def load_stored(project):
+    """
+    Read the stored values stored_buckets() needs but `project` wasn't
+    loaded with (built by hand, or with deferred fields). Must run before
+    the write: afterwards the database holds the new values.
+    """
+    loaded = getattr(project, '_loaded_values', None) or {}
+    missing = [attname for attname in DIMENSIONS.values() if attname not in loaded]
+    if project.pk is None or not missing:
+        return
+    stored = Project.objects.filter(pk=project.pk).values(*missing).first()
+    if stored is not None:
+        project._loaded_values = {**loaded, **stored}
+
+
+def _remember(project):
+    loaded = getattr(project, '_loaded_values', None)
+    if loaded is None:
+        loaded = project._loaded_values = {}
+    loaded.update({attname: getattr(project, attname) for attname in DIMENSIONS.values()})
+
+
+def apply(deltas):
+    """Add `deltas`, a {(dimension, value): change} mapping, to the counters."""
+    deltas = {bucket: delta for bucket, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    with transaction.atomic():
+        # Make sure every bucket has a row, then move them all in one UPDATE
+        ProjectCounter.objects.bulk_create(
+            [ProjectCounter(dimension=dimension, value=value) for dimension, value in deltas],
+            ignore_conflicts=True,
+        )
+        buckets = [Q(dimension=dimension, value=value) for dimension, value in deltas]
+        ProjectCounter.objects.filter(reduce(operator.or_, buckets)).update(count=F('count') + Case(
+            *[When(bucket, then=Value(delta)) for bucket, delta in zip(buckets, deltas.values())],
+            default=Value(0),
+        ))
+
+
+def track(created=(), updated=(), deleted=()):
+    """
+    Move the counters for a batch of project writes.
+
+    Deltas are summed before touching the database, so the cost depends on
+    the number of buckets involved, not the number of projects.
+    """
+    deltas = Counter()
+    for project in created:
+        deltas.update(current_buckets(project))
+    for project in updated:
+        deltas.update(current_buckets(project))
+        deltas.subtract(stored_buckets(project))
+    for project in deleted:
+        deltas.subtract(stored_buckets(project))
+    apply(deltas)
+    for project in chain(created, updated):
+        _remember(project)
+
+
+def rebuild():
+    """Recount every bucket from the project table, e.g. after writes that bypassed the ORM."""
+    with transaction.atomic():
+        counters = [
+            ProjectCounter(dimension=dimension, value=_value(row[attname]), count=row['count'])
+            for dimension, attname in DIMENSIONS.items()
+            for row in Project.objects.values(attname).annotate(count=Count('id')).order_by()
+        ]
+        ProjectCounter.objects.all().delete()
+        ProjectCounter.objects.bulk_create(counters)
+    return len(counters)
+
+
+async def snapshot():
+    """Project counts per status, priority and assignee, read from the counter rows."""
+    by_status = {status: 0 for status, _ in Project.STATUS_CHOICES}
+    by_priority = {priority: 0 for priority, _ in Project.PRIORITY_CHOICES}
+    by_assignee = []
+    async for counter in ProjectCounter.objects.filter(count__gt=0).order_by('dimension', 'value'):
+        if counter.dimension == 'status':
+            by_status[counter.value] = counter.count
+        elif counter.dimension == 'priority':
+            by_priority[counter.value] = counter.count
+        else:
+            by_assignee.append({'assigned_to': int(counter.value) if counter.value else None, 'count': counter.count})
+    by_assignee.sort(key=lambda bucket: -bucket['count'])
+    return {
+        'total': sum(by_status.values()),
+        'by_status': by_status,
+        'by_priority': by_priority,
+        'by_assignee': by_assignee,
+    }
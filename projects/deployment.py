@@ -0,0 +1,27 @@
+# projects/deployment.py
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+# Cache backends whose entries are only visible to the process that wrote them
+PROCESS_LOCAL_CACHES = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+def process_local_state():
+    """
+    Shared state that the current settings keep inside each process, as
+    human-readable descriptions; empty when several processes (server
+    workers, `run_jobs`) can safely serve the same database.
+    """
+    problems = []
+    backend = settings.CACHES[settings.PROJECTS_CACHE_ALIAS]['BACKEND']
+    if backend in PROCESS_LOCAL_CACHES:
+        problems.append(
+            f"the project cache ({backend}) is per process, and with it cached responses and their "
+            "invalidation, token revocations, read-your-writes markers and session roles"
+        )
+    if getattr(import_string(settings.PROJECTS_EVENT_BROKER), 'process_local', False):
+        problems.append(f"the event broker ({settings.PROJECTS_EVENT_BROKER}) is per process")
+    return problems
@@ -0,0 +1,48 @@
+# projects/etags.py
+import hashlib
+
+from django.http import HttpResponseNotModified
+from django.utils.http import parse_etags, quote_etag
+
+
+def _projection(fields):
+    # Each field projection is a different representation, so it gets its own ETag
+    return '' if fields is None else '-' + hashlib.sha1(','.join(fields).encode()).hexdigest()[:8]
+
+
+def project_etag(project_id, revision, fields=None):
+    """Strong ETag for one revision of a project."""
+    return quote_etag(f"{project_id}-{revision}{_projection(fields)}")
+
+
+def list_etag(projects, next_cursor, fields=None):
+    """Strong ETag for a list page; `projects` may be models or ProjectSchemas."""
+    digest = hashlib.sha1()
+    for project in projects:
+        digest.update(f"{project.id}-{project.revision},".encode())
+    digest.update((next_cursor or '').encode())
+    return quote_etag(digest.hexdigest() + _projection(fields))
+
+
+def not_modified(request, etag):
+    """Return a 304 response if the client's If-None-Match matches `etag`."""
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return None
+    client_etags = parse_etags(header)
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored
+    if '*' in client_etags or etag in (tag.removeprefix('W/') for tag in client_etags):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+    return None
+
+
+def precondition_failed(request, etag):
+    """True if the request carries an If-Match header that `etag` doesn't satisfy."""
+    header = request.headers.get('If-Match')
+    if not header:
+        return False
+    client_etags = parse_etags(header)
+    # If-Match uses the strong comparison, so weak tags never match
+    return not ('*' in client_etags or etag in client_etags)
@@ -0,0 +1,208 @@
+# projects/events.py
+import asyncio
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .renderers import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+# Put on a subscriber's queue when it fell too far behind; the stream then
+# tells the client to resync through the list endpoint and closes
+OVERFLOW = object()
+
+
+def project_event(event_type, project, previous_assigned_to=None):
+    """
+    Small change notification; clients fetch the full project if they need it.
+
+    `previous_assigned_to` is the assignee before an update; when it changed,
+    the event carries it so that user's clients can drop the project.
+    """
+    event = {
+        'type': event_type,
+        'id': project.pk,
+        'assigned_to': project.assigned_to_id,
+        'status': project.status,
+        'priority': project.priority,
+        'revision': project.revision,
+    }
+    if previous_assigned_to is not None and previous_assigned_to != project.assigned_to_id:
+        event['previous_assigned_to'] = previous_assigned_to
+    return event
+
+
+class Subscription:
+    """One connected client: a bounded queue owned by the event loop serving it."""
+
+    def __init__(self, broker, user, maxsize):
+        self.broker = broker
+        self.user_id = user.id
+        self.is_staff = user.is_staff
+        self.queue = asyncio.Queue(maxsize)
+        self.loop = asyncio.get_running_loop()
+
+    def offer(self, event):
+        # Runs on self.loop, never concurrently with the reader
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(OVERFLOW)
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    """
+    Fans events out to the subscribers connected to this process.
+
+    Subscribers are indexed by visibility (staff see everything, other users
+    only their assigned projects), so publishing costs O(interested clients)
+    rather than O(connected clients). Events published in other processes
+    (other server workers, `run_jobs`) never arrive; use RedisBroker there.
+    """
+
+    # Only reaches subscribers of the publishing process
+    process_local = True
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._staff = set()
+        self._by_user = {}
+
+    def subscribe(self, user, maxsize=None):
+        subscription = Subscription(self, user, maxsize or settings.PROJECTS_EVENTS_QUEUE_SIZE)
+        with self._lock:
+            if subscription.is_staff:
+                self._staff.add(subscription)
+            else:
+                self._by_user.setdefault(subscription.user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._staff.discard(subscription)
+            subscribers = self._by_user.get(subscription.user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._by_user[subscription.user_id]
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._staff) + sum(len(s) for s in self._by_user.values())
+
+    def publish(self, event):
+        self.deliver(event)
+
+    def deliver(self, event):
+        """Hand `event` to interested subscribers of this process; safe to call from any thread."""
+        with self._lock:
+            targets = list(self._staff) + list(self._by_user.get(event['assigned_to'], ()))
+            # The project was reassigned away from these users: they can no longer read it
+            losing = list(self._by_user.get(event.get('previous_assigned_to'), ()))
+        removed = {**event, 'type': 'removed'}
+        for subscription, message in [(s, event) for s in targets] + [(s, removed) for s in losing]:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, message)
+            except RuntimeError:
+                # The subscriber's event loop has shut down
+                self.unsubscribe(subscription)
+
+
+class RedisBroker(InProcessBroker):
+    """
+    Shares events between processes through Redis pub/sub.
+
+    Every process publishes to one channel. A process with subscribers runs
+    a listener thread that hands what arrives on the channel to them,
+    including the events the process published itself.
+    """
+
+    process_local = False
+    CHANNEL = 'projects:events'
+    # Seconds between reconnection attempts after the listener lost Redis
+    RECONNECT_DELAY = 1.0
+
+    def __init__(self, url=None, client=None):
+        super().__init__()
+        if client is None:
+            import redis  # Only needed when this broker is configured
+
+            client = redis.Redis.from_url(url or settings.PROJECTS_EVENTS_REDIS_URL)
+        self.client = client
+        self._listener = None
+
+    def subscribe(self, user, maxsize=None):
+        subscription = super().subscribe(user, maxsize)
+        # Started on first use, so processes that only publish (run_jobs) don't listen
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name='project-events', daemon=True)
+                self._listener.start()
+        return subscription
+
+    def publish(self, event):
+        self.client.publish(self.CHANNEL, dumps(event))
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.CHANNEL)
+                for message in pubsub.listen():
+                    if message['type'] == 'message':
+                        self.deliver(loads(message['data']))
+            except Exception:
+                # Events sent while disconnected are lost; clients resync when they reconnect
+                logger.exception("Lost the project event channel; reconnecting")
+                time.sleep(self.RECONNECT_DELAY)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.PROJECTS_EVENT_BROKER)()
+    return _broker
+
+
+def publish(event):
+    get_broker().publish(event)
+
+
+def format_event(event):
+    return f"event: {event['type']}\ndata: {dumps(event).decode()}\n\n"
+
+
+async def event_stream(subscription, heartbeat=None):
+    """Server-Sent Events body for `subscription`; unsubscribes when the client goes away."""
+    heartbeat = heartbeat or settings.PROJECTS_EVENTS_HEARTBEAT
+    try:
+        # Ask clients to wait a moment before reconnecting
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                # Comment line that keeps proxies from closing an idle stream
+                yield ": keepalive\n\n"
+                continue
+            if event is OVERFLOW:
+                yield "event: overflow\ndata: {}\n\n"
+                return
+            yield format_event(event)
+    finally:
+        subscription.close()
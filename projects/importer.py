@@ -0,0 +1,164 @@
+# projects/importer.py
+import csv
+import json
+import time
+from itertools import islice
+from typing import List, get_args
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from pydantic import BaseModel
+
+from . import cache, counters, events
+from .bulk import NAME_MAX_LENGTH, BulkErrorSchema, ProjectPriority, ProjectStatus
+from .models import Project
+
+IMPORT_BATCH_SIZE = 1000
+# Rejects listed in an upload's response; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+
+class ImportResultSchema(BaseModel):
+    created: int
+    rejected: int
+    seconds: float
+    rows_per_second: float
+    errors: List[BulkErrorSchema]  # `index` is the line number in the input
+
+
+class RejectedRow(Exception):
+    pass
+
+
+def parse_csv(lines):
+    """(line number, row) pairs from CSV text with a header row."""
+    reader = csv.DictReader(lines)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def parse_ndjson(lines):
+    """(line number, row) pairs from one JSON object per line; bad lines come through as strings."""
+    for line_num, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = line
+        yield line_num, row
+
+
+PARSERS = {
+    'csv': parse_csv,
+    'ndjson': parse_ndjson,
+}
+
+
+def detect_format(filename, format=None):
+    """Explicit `format`, else the file extension; None if neither names a known format."""
+    if format is None and filename:
+        format = filename.rsplit('.', 1)[-1].lower()
+        format = {'jsonl': 'ndjson'}.get(format, format)
+    return format if format in PARSERS else None
+
+
+class UserMap:
+    """Assignee/creator lookup by id or username, loaded once per import."""
+
+    def __init__(self):
+        self.by_username = dict(User.objects.values_list('username', 'id'))
+        self.ids = set(self.by_username.values())
+
+    def resolve(self, value):
+        if value is None or value == '':
+            return None
+        value = str(value).strip()
+        if value in self.by_username:
+            return self.by_username[value]
+        if value.isdigit() and int(value) in self.ids:
+            return int(value)
+        raise RejectedRow(f"User not found: {value}")
+
+
+def _text(row, field, default=None):
+    value = row.get(field)
+    if value is None or value == '':
+        return default
+    return str(value)
+
+
+def build_project(row, users, created_by_id=None):
+    """Validated, unsaved Project for one input row; raises RejectedRow."""
+    if not isinstance(row, dict):
+        raise RejectedRow("Invalid JSON object")
+    name = _text(row, 'name')
+    if name is None:
+        raise RejectedRow("name: Field required")
+    if len(name) > NAME_MAX_LENGTH:
+        raise RejectedRow(f"name: At most {NAME_MAX_LENGTH} characters")
+    description = _text(row, 'description')
+    if description is None:
+        raise RejectedRow("description: Field required")
+    status = _text(row, 'status', 'in_progress')
+    if status not in get_args(ProjectStatus):
+        raise RejectedRow(f"Invalid status: {status}")
+    priority = _text(row, 'priority', 'mid')
+    if priority not in get_args(ProjectPriority):
+        raise RejectedRow(f"Invalid priority: {priority}")
+    creator = users.resolve(row.get('created_by'))
+    return Project(
+        name=name,
+        description=description,
+        status=status,
+        priority=priority,
+        assigned_to_id=users.resolve(row.get('assigned_to')),
+        created_by_id=creator if creator is not None else created_by_id,
+    )
+
+
+def import_projects(rows, created_by_id=None, batch_size=IMPORT_BATCH_SIZE, on_reject=None):
+    """
+    Validate and insert (line number, row) pairs, e.g. from parse_csv.
+
+    `rows` is consumed lazily, one batch at a time, and each valid batch is
+    written with a single bulk_create in its own transaction, so memory use
+    depends on the batch size rather than the input size. Rejected rows are
+    passed to `on_reject(line_num, row, error)`.
+    """
+    users = UserMap()
+    started = time.perf_counter()
+    created = rejected = 0
+    errors = []
+    rows = iter(rows)
+
+    while batch := list(islice(rows, batch_size)):
+        projects = []
+        for line_num, row in batch:
+            try:
+                projects.append(build_project(row, users, created_by_id))
+            except RejectedRow as exc:
+                rejected += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append(BulkErrorSchema(index=line_num, error=str(exc)))
+                if on_reject is not None:
+                    on_reject(line_num, row, str(exc))
+
+        with transaction.atomic():
+            projects = Project.objects.bulk_create(projects)
+            counters.track(created=projects)
+        created += len(projects)
+        for project in projects:
+            events.publish(events.project_event('created', project))
+
+    if created:
+        # bulk_create doesn't send post_save; new rows only affect cached lists
+        cache.invalidate_projects([])
+    seconds = time.perf_counter() - started
+    return ImportResultSchema(
+        created=created,
+        rejected=rejected,
+        seconds=round(seconds, 3),
+        rows_per_second=round((created + rejected) / seconds, 1) if seconds else 0.0,
+        errors=errors,
+    )
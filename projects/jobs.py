@@ -0,0 +1,272 @@
+# projects/jobs.py
+"""
+Background jobs kept in the database.
+
+The API queues a Job row and answers at once; `manage.py run_jobs` claims
+queued rows and runs them in a thread or process pool, so long operations
+happen off the request path with bounded concurrency. Clients poll the job
+for its status and result.
+"""
+import logging
+import os
+import socket
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import timedelta
+from multiprocessing import get_context
+from typing import Literal, Optional
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, connections, router, transaction
+from django.db.models import F
+from django.utils import timezone
+from pydantic import BaseModel, ValidationError
+
+from . import bulk, export
+from .bulk import ProjectPriority, ProjectStatus
+from .models import Job, Project
+
+logger = logging.getLogger(__name__)
+
+
+class InvalidJob(Exception):
+    """Unknown job kind, or a payload its handler doesn't accept."""
+
+
+class JobFailed(Exception):
+    """A job that can't succeed; it is marked failed without being retried."""
+
+
+class JobType:
+    def __init__(self, kind, schema, handler):
+        self.kind = kind
+        self.schema = schema
+        self.handler = handler
+
+
+# Job kind -> JobType, filled in by @job_type below
+JOB_TYPES = {}
+
+
+def job_type(kind, schema):
+    """Register the decorated function as the handler for `kind` jobs with `schema` payloads."""
+    def register(handler):
+        JOB_TYPES[kind] = JobType(kind, schema, handler)
+        return handler
+    return register
+
+
+def validate(kind, payload):
+    """Parsed payload for a `kind` job; raises InvalidJob."""
+    if kind not in JOB_TYPES:
+        raise InvalidJob(f"Unknown job kind: {kind} (expected one of {', '.join(sorted(JOB_TYPES))})")
+    try:
+        return JOB_TYPES[kind].schema.model_validate(payload)
+    except ValidationError as exc:
+        raise InvalidJob('; '.join(
+            f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in exc.errors()
+        ))
+
+
+def enqueue(kind, payload, created_by_id=None):
+    payload = validate(kind, payload).model_dump(mode='json')
+    return Job.objects.create(kind=kind, payload=payload, created_by_id=created_by_id)
+
+
+async def aenqueue(kind, payload, created_by_id=None):
+    payload = validate(kind, payload).model_dump(mode='json')
+    return await Job.objects.acreate(kind=kind, payload=payload, created_by_id=created_by_id)
+
+
+def claim(worker, limit, kinds=None):
+    """
+    Mark up to `limit` of the oldest queued jobs as running for `worker`;
+    returns their ids.
+
+    On PostgreSQL concurrent workers skip rows another worker has locked
+    (SELECT ... FOR UPDATE SKIP LOCKED), so they never wait on each other.
+    SQLite has no row locks; its transactions take the database write lock
+    at BEGIN (see database.py), so claims simply run one at a time.
+    """
+    queued = Job.objects.filter(status='queued').order_by('id')
+    if kinds:
+        queued = queued.filter(kind__in=kinds)
+    using = router.db_for_write(Job)
+    with transaction.atomic(using=using):
+        if connections[using].features.has_select_for_update_skip_locked:
+            queued = queued.select_for_update(skip_locked=True)
+        ids = list(queued.values_list('id', flat=True)[:limit])
+        if ids:
+            Job.objects.filter(id__in=ids).update(
+                status='running', worker=worker, started_at=timezone.now(), attempts=F('attempts') + 1,
+            )
+    return ids
+
+
+def requeue_stale(timeout=None, max_attempts=None):
+    """
+    Put back jobs left running for longer than `timeout` seconds, e.g. by a
+    worker that was killed; jobs out of attempts are failed instead.
+    Returns how many were requeued.
+    """
+    timeout = settings.PROJECTS_JOB_TIMEOUT if timeout is None else timeout
+    max_attempts = settings.PROJECTS_JOB_MAX_ATTEMPTS if max_attempts is None else max_attempts
+    stale = Job.objects.filter(status='running', started_at__lt=timezone.now() - timedelta(seconds=timeout))
+    stale.filter(attempts__gte=max_attempts).update(
+        status='failed', error="Timed out", finished_at=timezone.now(),
+    )
+    return stale.filter(attempts__lt=max_attempts).update(status='queued', worker='')
+
+
+def run(job_id):
+    """
+    Run one claimed job and store its outcome; returns the job's new status,
+    or None if the job no longer exists.
+
+    Unexpected errors put the job back in the queue until it has had
+    PROJECTS_JOB_MAX_ATTEMPTS tries; JobFailed fails it straight away.
+    """
+    try:
+        job = Job.objects.get(id=job_id)
+    except Job.DoesNotExist:
+        # Deleted after it was claimed, e.g. through the admin
+        logger.warning("Job #%s was deleted before it ran", job_id)
+        return None
+    job_type = JOB_TYPES.get(job.kind)
+    try:
+        if job_type is None:
+            raise JobFailed(f"Unknown job kind: {job.kind}")
+        result = job_type.handler(job, job_type.schema.model_validate(job.payload))
+    except (JobFailed, ValidationError) as exc:
+        return _finish(job, 'failed', error=str(exc))
+    except Exception as exc:
+        logger.exception("Job %s failed (attempt %d)", job, job.attempts)
+        if job.attempts < settings.PROJECTS_JOB_MAX_ATTEMPTS:
+            return _finish(job, 'queued', error=f"{type(exc).__name__}: {exc}")
+        return _finish(job, 'failed', error=f"{type(exc).__name__}: {exc}")
+    return _finish(job, 'done', result=result)
+
+
+def _run_in_pool(job_id):
+    # Pool threads and processes outlive jobs; like requests, each job
+    # starts and ends by dropping connections that are broken or too old
+    close_old_connections()
+    try:
+        return run(job_id)
+    finally:
+        close_old_connections()
+
+
+def _finish(job, status, result=None, error=''):
+    finished_at = timezone.now() if status != 'queued' else None
+    # Only while this worker still owns the job; a stale one may have been requeued meanwhile
+    Job.objects.filter(id=job.id, status='running', worker=job.worker).update(
+        status=status, result=result, error=error, finished_at=finished_at,
+    )
+    logger.info("Job %s #%s %s", job.kind, job.id, status)
+    return status
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+class Worker:
+    """
+    Claims jobs and runs up to `concurrency` of them at a time, in threads,
+    or in processes for CPU-bound work. Jobs are only claimed when a slot is
+    free, so queued work waits in the table rather than in the pool.
+    """
+
+    def __init__(self, concurrency=None, processes=False, kinds=None, poll_interval=1.0, name=None):
+        self.concurrency = concurrency or settings.PROJECTS_JOB_CONCURRENCY
+        self.processes = processes
+        self.kinds = kinds
+        self.poll_interval = poll_interval
+        self.name = name or worker_name()
+        self.stopping = False
+
+    def stop(self):
+        """Stop claiming jobs; the ones running are finished first."""
+        self.stopping = True
+
+    def executor(self):
+        if self.processes:
+            # Fresh interpreters rather than forks, which would share this process's
+            # database connections; each sets Django up before taking jobs
+            return ProcessPoolExecutor(self.concurrency, mp_context=get_context('spawn'), initializer=django.setup)
+        return ThreadPoolExecutor(self.concurrency, thread_name_prefix='job')
+
+    def run(self, once=False):
+        """Work until stopped, or with `once` until the queue is empty; returns the number of jobs run."""
+        handled = 0
+        with self.executor() as executor:
+            running, job_ids = set(), {}
+            while not self.stopping:
+                requeue_stale()
+                free = self.concurrency - len(running)
+                claimed = claim(self.name, free, self.kinds) if free else []
+                for job_id in claimed:
+                    future = executor.submit(_run_in_pool, job_id)
+                    running.add(future)
+                    job_ids[future] = job_id
+                if not running:
+                    if once:
+                        break
+                    time.sleep(self.poll_interval)
+                    continue
+                done, running = wait(running, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job_id = job_ids.pop(future)
+                    try:
+                        future.result()
+                    except Exception:
+                        # E.g. the database failed while recording the outcome; the
+                        # job stays running until requeue_stale() puts it back
+                        logger.exception("Job #%s could not be run", job_id)
+                    handled += 1
+        # Leaving the pool waited for the jobs still running
+        return handled + len(running)
+
+
+class ReassignPayload(BaseModel):
+    from_user: int
+    to_user: Optional[int]  # None leaves the projects unassigned
+    status: Optional[ProjectStatus] = None
+
+
+@job_type('reassign_projects', ReassignPayload)
+def reassign_projects(job, payload):
+    """Hand every project of one user (optionally only those in one status) to another."""
+    if payload.to_user is not None and not User.objects.filter(id=payload.to_user).exists():
+        raise JobFailed(f"User not found: {payload.to_user}")
+    projects = Project.objects.filter(assigned_to_id=payload.from_user)
+    if payload.status is not None:
+        projects = projects.filter(status=payload.status)
+    return {'updated': bulk.reassign(projects, payload.to_user)}
+
+
+class ExportPayload(BaseModel):
+    format: Literal[tuple(export.EXPORTERS)] = 'csv'
+    status: Optional[ProjectStatus] = None
+    priority: Optional[ProjectPriority] = None
+    assigned_to: Optional[int] = None
+
+
+@job_type('export_projects', ExportPayload)
+def export_projects(job, payload):
+    """Write matching projects to a file in default storage, for download through the API."""
+    filters = {'status': payload.status, 'priority': payload.priority, 'assigned_to_id': payload.assigned_to}
+    projects = Project.objects.filter(**{k: v for k, v in filters.items() if v is not None})
+    name = f'exports/projects-{job.id}.{payload.format}'
+    with tempfile.TemporaryFile() as out:
+        rows = export.write_export(projects, payload.format, out)
+        out.seek(0)
+        default_storage.delete(name)  # Left behind by an earlier attempt
+        name = default_storage.save(name, File(out))
+    return {'rows': rows, 'file': name}
@@ -0,0 +1,220 @@
+import json
+import platform
+import random
+import re
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+
+import django
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Max, Min
+from django.test import AsyncClient, Client
+
+from projects import cache, seed
+from projects.models import Project
+
+QUERY_COUNT_RE = re.compile(r'desc="(\d+) queries"')
+BULK_ITEMS = 100
+SAMPLE_IDS = 500
+# Runs are compared only when their tables are within this fraction of each other
+ROW_TOLERANCE = 0.1
+
+
+class Scenarios:
+    """One method per benchmarked request; each returns the response to check."""
+
+    def __init__(self, client, rng, user_ids):
+        self.client = client
+        # Streaming endpoints only answer ASGI requests; same session as `client`
+        self.asgi_client = AsyncClient()
+        self.asgi_client.cookies = client.cookies
+        self.rng = rng
+        self.user_ids = user_ids
+        # Existing ids to fetch, picked up front so the lookup isn't timed
+        bounds = Project.objects.aggregate(first=Min('id'), last=Max('id'))
+        candidates = {rng.randint(bounds['first'], bounds['last']) for _ in range(SAMPLE_IDS)}
+        self.project_ids = list(Project.objects.filter(id__in=candidates).values_list('id', flat=True))
+
+    def _cold(self, project_id=None):
+        # Measure the database path, not a response cache hit
+        cache.invalidate_projects([project_id] if project_id else [])
+
+    def _post(self, path, payload):
+        return self.client.post(path, data=json.dumps(payload), content_type='application/json')
+
+    def get(self):
+        project_id = self.rng.choice(self.project_ids)
+        self._cold(project_id)
+        return self.client.get(f'/api/projects/{project_id}/')
+
+    def list(self):
+        self._cold()
+        return self.client.get('/api/projects/?limit=50')
+
+    def list_filtered(self):
+        self._cold()
+        return self.client.get(f'/api/projects/?status={self.rng.choice(Project.STATUS_CHOICES)[0]}&limit=50')
+
+    def list_cached(self):
+        return self.client.get('/api/projects/?limit=50')
+
+    def search(self):
+        return self.client.get(f'/api/projects/search/?q={self.rng.choice(seed.WORDS)}&limit=50')
+
+    def create(self):
+        return self._post('/api/projects/', {
+            'name': "Benchmark project", 'description': "Created by benchmark_api",
+            'status': 'in_progress', 'priority': 'mid', 'assigned_to': self.rng.choice(self.user_ids),
+        })
+
+    def bulk_create(self):
+        return self._post('/api/projects/bulk/', {'items': [
+            {'name': f"Benchmark bulk {n}", 'description': "Created by benchmark_api", 'assigned_to': self.rng.choice(self.user_ids)}
+            for n in range(BULK_ITEMS)
+        ]})
+
+    def export(self):
+        # One user's projects, so the export grows with the table like a real filtered download
+        path = f'/api/projects/export/?format=ndjson&assigned_to={self.rng.choice(self.user_ids)}'
+        return async_to_sync(_download)(self.asgi_client, path)
+
+
+async def _download(client, path):
+    response = await client.get(path)
+    if response.streaming:
+        async for _ in response.streaming_content:
+            pass
+    return response
+
+
+SCENARIOS = ['get', 'list', 'list_filtered', 'list_cached', 'search', 'create', 'bulk_create', 'export']
+# Scenarios whose requests take long enough on big tables that fewer runs suffice
+SLOW_SCENARIOS = {'export'}
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the project API in-process (get, list, search, create, bulk and export) at growing "
+        "table sizes and save the results as JSON for comparison between commits. Tops the tables up "
+        "with seeded data first, so run it against a scratch database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000], help="Projects in the table per round")
+        parser.add_argument('--users', type=int, default=100, help="Seeded users projects are assigned to")
+        parser.add_argument('--repeat', type=int, default=20, help="Timed requests per scenario")
+        parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=SCENARIOS, help="Scenarios to run")
+        parser.add_argument('--output', help="Write the results to this JSON file")
+        parser.add_argument('--compare', help="Results file from an earlier run to compare against")
+        parser.add_argument('--threshold', type=float, default=1.25, help="Median slowdown ratio reported as a regression")
+        parser.add_argument('--fail-on-regression', action='store_true', help="Exit with an error if anything regressed")
+        parser.add_argument('--seed', type=int, default=0, help="Random seed for data and requests")
+
+    def setup(self, options):
+        rng = random.Random(options['seed'])
+        missing_users = options['users'] - User.objects.filter(username__startswith='seed-user-').count()
+        if missing_users > 0:
+            seed.seed_users(missing_users)
+        user_ids = list(User.objects.filter(username__startswith='seed-user-').values_list('id', flat=True))
+        admin, _ = User.objects.get_or_create(username='benchmark-admin', defaults={'is_staff': True})
+        client = Client()
+        client.force_login(admin)
+        return rng, user_ids, client
+
+    def measure(self, scenario, repeat):
+        scenario()  # Warm-up
+        timings, queries = [], None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            response = scenario()
+            timings.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                raise CommandError(f"{scenario.__name__} failed with {response.status_code}: {response.content[:200]!r}")
+            match = QUERY_COUNT_RE.search(response.get('Server-Timing', ''))
+            queries = int(match.group(1)) if match else None
+        timings.sort()
+        return {
+            'runs': repeat,
+            'queries': queries,
+            'p50_ms': round(statistics.median(timings), 2),
+            'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 2),
+            'mean_ms': round(statistics.fmean(timings), 2),
+            'min_ms': round(timings[0], 2),
+        }
+
+    def handle(self, *args, **options):
+        rng, user_ids, client = self.setup(options)
+        results = []
+        for size in sorted(options['sizes']):
+            missing = size - Project.objects.count()
+            if missing > 0:
+                self.stderr.write(f"Seeding {missing} projects...")
+                seed.seed_projects(missing, user_ids, rng)
+            rows = Project.objects.count()
+            scenarios = Scenarios(client, rng, user_ids)
+            for name in options['scenarios']:
+                repeat = max(1, options['repeat'] // 5) if name in SLOW_SCENARIOS else options['repeat']
+                result = {'size': size, 'rows': rows, 'scenario': name, **self.measure(getattr(scenarios, name), repeat)}
+                results.append(result)
+                self.stdout.write(
+                    f"{size:>9} {name:<14} p50 {result['p50_ms']:>9} ms  p95 {result['p95_ms']:>9} ms  "
+                    f"queries {result['queries']}"
+                )
+
+        report = {
+            'commit': git_commit(),
+            'created': datetime.now(timezone.utc).isoformat(),
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'results': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+        if options['compare']:
+            with open(options['compare']) as baseline:
+                regressions = self.compare(json.load(baseline), report, options['threshold'])
+            if regressions and options['fail_on_regression']:
+                raise CommandError(f"{regressions} scenario(s) regressed by more than {options['threshold']}x")
+
+    def compare(self, baseline, report, threshold):
+        """Print median ratios against `baseline`; returns how many exceed `threshold`."""
+        before = {(r['size'], r['scenario']): r for r in baseline['results']}
+        self.stdout.write(f"Compared with {baseline.get('commit') or 'baseline'}:")
+        regressions = 0
+        for result in report['results']:
+            old = before.get((result['size'], result['scenario']))
+            if old is None:
+                continue
+            if abs(result['rows'] - old['rows']) > old['rows'] * ROW_TOLERANCE:
+                # A table that had already grown past the size isn't a like-for-like run
+                self.stdout.write(
+                    f"{result['size']:>9} {result['scenario']:<14} skipped: {old['rows']} -> {result['rows']} rows"
+                )
+                continue
+            ratio = result['p50_ms'] / old['p50_ms'] if old['p50_ms'] else 1.0
+            regressed = ratio > threshold or (result['queries'] or 0) > (old['queries'] or 0)
+            regressions += regressed
+            line = (
+                f"{result['size']:>9} {result['scenario']:<14} {old['p50_ms']:>9} -> {result['p50_ms']:>9} ms "
+                f"({ratio:.2f}x), queries {old['queries']} -> {result['queries']}"
+            )
+            self.stdout.write(self.style.ERROR(line + "  REGRESSION") if regressed else line)
+        return regressions
@@ -0,0 +1,64 @@
+import json
+import timeit
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand
+from ninja.renderers import JSONRenderer
+
+from projects import renderers
+from projects.models import Project
+from projects.views import ProjectListSchema, ProjectSchema
+
+
+class Command(BaseCommand):
+    help = "Compare JSON encoding throughput of Ninja's stdlib renderer and the orjson renderer."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000], help="Items per payload")
+        parser.add_argument('--json', action='store_true', help="Print the results as JSON")
+
+    def payload(self, size):
+        # Shaped like a list response after Ninja's model_dump, datetimes included
+        now = datetime.now(timezone.utc)
+        items = [
+            ProjectSchema.from_model(Project(
+                id=i, name=f"Project {i}", description="Description " * 10, status='done',
+                priority='high', assigned_to_id=3, revision=1, date_created=now,
+            ))
+            for i in range(size)
+        ]
+        return ProjectListSchema(items=items, next_cursor=None).model_dump()
+
+    def handle(self, *args, **options):
+        if renderers.orjson is None:
+            self.stderr.write("orjson is not installed; only the stdlib fallback can be measured")
+        encoders = {
+            'ninja stdlib': JSONRenderer(),
+            'orjson' if renderers.orjson is not None else 'stdlib fallback': renderers.ORJSONRenderer(),
+        }
+
+        results = []
+        for size in options['sizes']:
+            data = self.payload(size)
+            for name, renderer in encoders.items():
+                def render():
+                    return renderer.render(None, data, response_status=200)
+                number = max(1, 20000 // size)
+                seconds = min(timeit.repeat(render, number=number, repeat=5)) / number
+                body = render()
+                results.append({
+                    'items': size,
+                    'encoder': name,
+                    'ms': round(seconds * 1000, 3),
+                    'items_per_second': round(size / seconds),
+                    'mb_per_second': round(len(body) / seconds / 1e6, 1),
+                })
+
+        if options['json']:
+            self.stdout.write(json.dumps(results))
+            return
+        self.stdout.write(f"{'items':>7}  {'encoder':<16}{'ms':>9}{'items/s':>12}{'MB/s':>8}")
+        for row in results:
+            self.stdout.write(
+                f"{row['items']:>7}  {row['encoder']:<16}{row['ms']:>9}{row['items_per_second']:>12}{row['mb_per_second']:>8}"
+            )
@@ -0,0 +1,55 @@
+import json
+import timeit
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand
+
+from projects.models import Project
+from projects.views import ProjectInSchema, ProjectSchema
+
+BODY = json.dumps({
+    'name': "New Project",
+    'description': "Description " * 10,
+    'status': 'done',
+    'priority': 'high',
+    'assigned_to': 3,
+})
+
+
+class Command(BaseCommand):
+    help = "Measure per-request validation and serialization cost of the project schemas (no database needed)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--number', type=int, default=20000, help="Calls per timing run")
+        parser.add_argument('--json', action='store_true', help="Print the results as JSON")
+
+    def handle(self, *args, **options):
+        now = datetime.now(timezone.utc)
+        page = [
+            Project(
+                id=i, name=f"Project {i}", description="Description " * 10, status='done',
+                priority='high', assigned_to_id=3, revision=1, date_created=now,
+            )
+            for i in range(50)
+        ]
+
+        # What a request pays on top of the view: parse the body, or render the response
+        cases = {
+            'validate create body': lambda: ProjectInSchema.model_validate_json(BODY).model_dump(),
+            'serialize 1 project': lambda: json.dumps(ProjectSchema.from_model(page[0]).model_dump(mode='json')),
+            'serialize 50-project page': lambda: json.dumps(
+                [ProjectSchema.from_model(project).model_dump(mode='json') for project in page]
+            ),
+        }
+        number = options['number']
+        results = {}
+        for name, case in cases.items():
+            calls = number if '50' not in name else max(1, number // 20)
+            best = min(timeit.repeat(case, number=calls, repeat=5)) / calls
+            results[name] = round(best * 1e6, 2)
+
+        if options['json']:
+            self.stdout.write(json.dumps({'microseconds': results}))
+            return
+        for name, micros in results.items():
+            self.stdout.write(f"{name:<28}{micros:>10.2f} us")
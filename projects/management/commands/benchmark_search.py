@@ -0,0 +1,70 @@
+import json
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from projects import search, seed
+from projects.models import Project
+
+QUERIES = ['database', 'payment gateway', 'kubernetes migration', seed.RARE_WORD]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare full-text search with icontains filtering. Tops the project table up "
+        "to --rows synthetic projects first, so run it against a scratch database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000, help="Projects in the table while measuring")
+        parser.add_argument('--repeat', type=int, default=5, help="Timed runs per query")
+        parser.add_argument('--json', action='store_true', help="Print the results as JSON")
+
+    def seed(self, rows):
+        missing = rows - Project.objects.count()
+        if missing > 0:
+            seed.seed_projects(missing, rng=random.Random(rows))
+
+    def measure(self, run, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = run()
+            timings.append((time.perf_counter() - start) * 1000)
+        return result, round(statistics.median(timings), 2)
+
+    def handle(self, *args, **options):
+        self.seed(options['rows'])
+        repeat = options['repeat']
+
+        results = []
+        for query in QUERIES:
+            substring = Project.objects.all()
+            for term in search.search_terms(query):
+                substring = substring.filter(Q(name__icontains=term) | Q(description__icontains=term))
+            full_text = search.search(Project.objects.all(), query)
+
+            fts_count, fts_count_ms = self.measure(full_text.count, repeat)
+            like_count, like_count_ms = self.measure(substring.count, repeat)
+            _, fts_page_ms = self.measure(lambda: list(full_text[:50]), repeat)
+            _, like_page_ms = self.measure(lambda: list(substring.order_by('-date_created', '-id')[:50]), repeat)
+            results.append({
+                'query': query,
+                'full_text': {'matches': fts_count, 'count_ms': fts_count_ms, 'first_page_ms': fts_page_ms},
+                'icontains': {'matches': like_count, 'count_ms': like_count_ms, 'first_page_ms': like_page_ms},
+            })
+
+        if options['json']:
+            self.stdout.write(json.dumps({'rows': Project.objects.count(), 'results': results}, indent=2))
+            return
+        self.stdout.write(f"{Project.objects.count()} projects, median of {repeat} runs")
+        self.stdout.write(f"{'query':<24}{'engine':<12}{'matches':>10}{'count ms':>12}{'page ms':>12}")
+        for result in results:
+            for engine in ('full_text', 'icontains'):
+                row = result[engine]
+                self.stdout.write(
+                    f"{result['query']:<24}{engine:<12}{row['matches']:>10}{row['count_ms']:>12}{row['first_page_ms']:>12}"
+                )
@@ -0,0 +1,100 @@
+import json
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, connections, transaction
+
+from projects.models import Project, RevisionConflict
+
+# Stock SQLite behaviour, for comparison with the tuned profile in project_management.database
+SQLITE_BASELINE_OPTIONS = {'timeout': 20}
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure write throughput with parallel writers against the configured database. "
+        "Each writer creates projects and updates them, one transaction per write. "
+        "Writes real rows, so run it against a scratch database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, nargs='+', default=[1, 4, 16], help="Concurrent writer threads")
+        parser.add_argument('--writes', type=int, default=200, help="Writes per writer")
+        parser.add_argument(
+            '--baseline', action='store_true',
+            help="On SQLite, use the rollback journal, synchronous=FULL and deferred transactions instead",
+        )
+        parser.add_argument('--json', action='store_true', help="Print the results as JSON")
+
+    def use_baseline(self):
+        settings = connections.settings[connection.alias]
+        settings['OPTIONS'] = dict(SQLITE_BASELINE_OPTIONS)
+        connection.close()
+        with connection.cursor() as cursor:
+            # The journal mode is stored in the database file, unlike the other pragmas
+            cursor.execute('PRAGMA journal_mode=DELETE')
+        connection.close()
+
+    def writer(self, writes, latencies, errors):
+        project = None
+        try:
+            for i in range(writes):
+                start = time.perf_counter()
+                try:
+                    if project is None or i % 2 == 0:
+                        with transaction.atomic():
+                            project = Project.objects.create(name=f"Benchmark {i}", description="Parallel write")
+                    else:
+                        project.status = 'done'
+                        project.save(update_fields=['status'])
+                except (OperationalError, RevisionConflict):
+                    errors.append(1)
+                    continue
+                latencies.append((time.perf_counter() - start) * 1000)
+        finally:
+            connection.close()
+
+    def measure(self, writers, writes):
+        latencies, errors = [], []
+        threads = [threading.Thread(target=self.writer, args=(writes, latencies, errors)) for _ in range(writers)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        seconds = time.perf_counter() - start
+        latencies.sort()
+        return {
+            'writers': writers,
+            'writes': len(latencies),
+            'errors': len(errors),
+            'writes_per_second': round(len(latencies) / seconds, 1),
+            'p50_ms': round(statistics.median(latencies), 2) if latencies else None,
+            'p95_ms': round(latencies[int(len(latencies) * 0.95)], 2) if latencies else None,
+        }
+
+    def handle(self, *args, **options):
+        if options['baseline'] and connection.vendor == 'sqlite':
+            self.use_baseline()
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute('PRAGMA journal_mode')
+                profile = f"sqlite journal_mode={cursor.fetchone()[0]}"
+            else:
+                profile = f"{connection.vendor} CONN_MAX_AGE={connection.settings_dict['CONN_MAX_AGE']}"
+        connection.close()
+
+        results = [self.measure(writers, options['writes']) for writers in options['writers']]
+
+        if options['json']:
+            self.stdout.write(json.dumps({'database': profile, 'results': results}, indent=2))
+            return
+        self.stdout.write(f"{profile}, {options['writes']} writes per writer")
+        self.stdout.write(f"{'writers':>8}{'writes':>8}{'errors':>8}{'writes/s':>11}{'p50 ms':>9}{'p95 ms':>9}")
+        for row in results:
+            self.stdout.write(
+                f"{row['writers']:>8}{row['writes']:>8}{row['errors']:>8}{row['writes_per_second']:>11}"
+                f"{row['p50_ms']:>9}{row['p95_ms']:>9}"
+            )
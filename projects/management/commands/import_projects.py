@@ -0,0 +1,58 @@
+import json
+import sys
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from projects import importer
+
+
+class Command(BaseCommand):
+    help = "Import projects from a CSV or NDJSON file in batches, writing rejected rows to a reject file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import, or - for standard input")
+        parser.add_argument('--format', choices=sorted(importer.PARSERS), help="Input format (default: from the file extension)")
+        parser.add_argument('--batch-size', type=int, default=importer.IMPORT_BATCH_SIZE, help="Rows per bulk insert")
+        parser.add_argument('--created-by', help="Username recorded as creator for rows without a created_by column")
+        parser.add_argument('--rejects', help="Write rejected rows here as NDJSON, with their line number and error")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        format = importer.detect_format(None if path == '-' else path, options['format'])
+        if format is None:
+            raise CommandError("Cannot tell the input format; pass --format csv or --format ndjson")
+
+        created_by_id = None
+        if options['created_by']:
+            created_by_id = User.objects.filter(username=options['created_by']).values_list('id', flat=True).first()
+            if created_by_id is None:
+                raise CommandError(f"User not found: {options['created_by']}")
+
+        source = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8-sig')
+        rejects = open(options['rejects'], 'w', encoding='utf-8') if options['rejects'] else None
+
+        def on_reject(line_num, row, error):
+            if rejects is not None:
+                rejects.write(json.dumps({'line': line_num, 'error': error, 'row': row}) + '\n')
+
+        try:
+            result = importer.import_projects(
+                importer.PARSERS[format](source),
+                created_by_id=created_by_id,
+                batch_size=options['batch_size'],
+                on_reject=on_reject,
+            )
+        finally:
+            if source is not sys.stdin:
+                source.close()
+            if rejects is not None:
+                rejects.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result.created} projects, rejected {result.rejected} "
+            f"in {result.seconds:.2f}s ({result.rows_per_second:.0f} rows/s)"
+        ))
+        if result.rejected and rejects is None:
+            for error in result.errors[:10]:
+                self.stdout.write(f"  line {error.index}: {error.error}")
@@ -0,0 +1,62 @@
+import json
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Fire concurrent GET requests at a running server and report throughput and latency."
+
+    def add_arguments(self, parser):
+        parser.add_argument('url', help="Full URL to request, e.g. http://localhost:8000/api/projects/")
+        parser.add_argument('--requests', type=int, default=2000, help="Total number of requests")
+        parser.add_argument('--concurrency', type=int, default=50, help="Requests in flight at once")
+        parser.add_argument(
+            '--header', action='append', default=[],
+            help="Extra request header as 'Name: value' (repeatable), e.g. a session cookie",
+        )
+        parser.add_argument('--json', action='store_true', help="Print the results as JSON")
+
+    def handle(self, *args, **options):
+        headers = dict(h.split(':', 1) for h in options['header'])
+        headers = {name.strip(): value.strip() for name, value in headers.items()}
+
+        def fetch(_):
+            request = urllib.request.Request(options['url'], headers=headers)
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=30) as response:
+                    response.read()
+                    ok = response.status < 400
+            except (urllib.error.URLError, OSError):
+                ok = False
+            return time.perf_counter() - start, ok
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            samples = list(pool.map(fetch, range(options['requests'])))
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(latency for latency, _ in samples)
+        cuts = statistics.quantiles(latencies, n=100)
+        results = {
+            'url': options['url'],
+            'requests': len(samples),
+            'concurrency': options['concurrency'],
+            'errors': sum(1 for _, ok in samples if not ok),
+            'seconds': round(elapsed, 3),
+            'requests_per_second': round(len(samples) / elapsed, 1),
+            'p50_ms': round(cuts[49] * 1000, 2),
+            'p95_ms': round(cuts[94] * 1000, 2),
+            'p99_ms': round(cuts[98] * 1000, 2),
+        }
+
+        if options['json']:
+            self.stdout.write(json.dumps(results))
+        else:
+            for name, value in results.items():
+                self.stdout.write(f"{name:>20}: {value}")
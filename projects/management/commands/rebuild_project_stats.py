@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from projects import counters
+
+
+class Command(BaseCommand):
+    help = "Recount the project statistics counters from the project table."
+
+    def handle(self, *args, **options):
+        buckets = counters.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {buckets} project counters"))
@@ -0,0 +1,57 @@
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from projects import jobs
+from projects.deployment import process_local_state
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued background jobs. Start as many workers as you like, on any host; "
+        "each claims jobs only while it has a free slot."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int, default=settings.PROJECTS_JOB_CONCURRENCY, help="Jobs run at the same time",
+        )
+        parser.add_argument(
+            '--processes', action='store_true', help="Run jobs in a process pool instead of threads (CPU-bound work)",
+        )
+        parser.add_argument(
+            '--kind', action='append', dest='kinds', choices=sorted(jobs.JOB_TYPES), help="Only run jobs of this kind",
+        )
+        parser.add_argument('--poll-interval', type=float, default=1.0, help="Seconds between looks at an empty queue")
+        parser.add_argument('--once', action='store_true', help="Exit once the queue is empty")
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1:
+            raise CommandError("--concurrency must be at least 1")
+        worker = jobs.Worker(
+            concurrency=options['concurrency'],
+            processes=options['processes'],
+            kinds=options['kinds'],
+            poll_interval=options['poll_interval'],
+        )
+
+        def stop(signum, frame):
+            self.stdout.write("Stopping after the running jobs finish")
+            worker.stop()
+
+        for problem in process_local_state():
+            # Jobs still write to the database; the web server just won't hear about it
+            self.stderr.write(
+                f"Warning: {problem}, so jobs can't invalidate or notify the web server (set REDIS_URL)"
+            )
+
+        previous = {signum: signal.signal(signum, stop) for signum in (signal.SIGTERM, signal.SIGINT)}
+        pool = 'processes' if options['processes'] else 'threads'
+        self.stdout.write(f"Worker {worker.name}: {worker.concurrency} {pool}")
+        try:
+            handled = worker.run(once=options['once'])
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+        self.stdout.write(self.style.SUCCESS(f"Ran {handled} jobs"))
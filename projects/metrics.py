@@ -0,0 +1,201 @@
+# projects/metrics.py
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestMetrics:
+    """Where one request's time went; filled in while it runs."""
+
+    __slots__ = ('started', 'db_queries', 'db_seconds', 'render_seconds')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.render_seconds = 0.0
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def server_timing(self, total):
+        return (
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.db_queries} queries", '
+            f'render;dur={self.render_seconds * 1000:.1f}, '
+            f'total;dur={total * 1000:.1f}'
+        )
+
+
+# Metrics of the request being handled. Context variables follow the request
+# into sync_to_async worker threads, where the ORM runs its queries
+_current = ContextVar('projects_request_metrics', default=None)
+
+
+def current():
+    return _current.get()
+
+
+@contextmanager
+def measuring(metrics):
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper adding each query's count and time to the current request."""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_queries += 1
+        metrics.db_seconds += time.perf_counter() - start
+
+
+# Parameter lists like `IN (%s, %s, %s)` and any inline literals
+PARAMETER_LIST_RE = re.compile(r'\((?:\s*%s\s*,)+\s*%s\s*\)')
+LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+def sql_shape(sql):
+    """`sql` with values and parameter lists collapsed, so queries differing only in them compare equal."""
+    return LITERAL_RE.sub('?', PARAMETER_LIST_RE.sub('(...)', sql))
+
+
+# Query shapes of the request being handled, when something is collecting them
+_shapes = ContextVar('projects_query_shapes', default=None)
+
+
+@contextmanager
+def collecting_shapes():
+    """Count the queries run in this block by shape; yields a Counter of shape -> runs."""
+    shapes = Counter()
+    token = _shapes.set(shapes)
+    try:
+        yield shapes
+    finally:
+        _shapes.reset(token)
+
+
+def record_shape(execute, sql, params, many, context):
+    shapes = _shapes.get()
+    if shapes is not None:
+        shapes[sql_shape(sql)] += 1
+    return execute(sql, params, many, context)
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    # connection_created fires on every (re)connect of the same wrapper object
+    for wrapper in (record_query, record_shape):
+        if wrapper not in connection.execute_wrappers:
+            connection.execute_wrappers.append(wrapper)
+
+
+@contextmanager
+def timing_render():
+    """Time response encoding for the current request, if it is being measured."""
+    metrics = _current.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if metrics is not None:
+            metrics.render_seconds += time.perf_counter() - start
+
+
+class Registry:
+    """
+    Process-wide request metrics per route, in Prometheus text format.
+
+    Each worker process keeps its own numbers, so a scrape sees the worker
+    that answered it.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._clear()
+
+    def _clear(self):
+        self._requests = defaultdict(int)  # (method, route, status) -> count
+        # (method, route) -> observations per bucket, the last one for +Inf
+        self._latency = defaultdict(lambda: [0] * (len(self.buckets) + 1))
+        self._latency_sum = defaultdict(float)
+        self._db_queries = defaultdict(int)
+        self._db_seconds = defaultdict(float)
+        self._render_seconds = defaultdict(float)
+        self._response_bytes = defaultdict(int)
+
+    def reset(self):
+        with self._lock:
+            self._clear()
+
+    def observe(self, method, route, status, metrics, seconds, size):
+        key = (method, route)
+        bucket = next((i for i, bound in enumerate(self.buckets) if seconds <= bound), len(self.buckets))
+        with self._lock:
+            self._requests[(method, route, str(status))] += 1
+            self._latency[key][bucket] += 1
+            self._latency_sum[key] += seconds
+            self._db_queries[key] += metrics.db_queries
+            self._db_seconds[key] += metrics.db_seconds
+            self._render_seconds[key] += metrics.render_seconds
+            if size is not None:
+                self._response_bytes[key] += size
+
+    def render(self):
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in samples:
+                lines.append(f'{name}{{{_labels(labels)}}} {value}')
+
+        with self._lock:
+            family('projects_http_requests_total', 'counter', 'Requests handled, by route and status.', [
+                ({'method': m, 'route': r, 'status': s}, count) for (m, r, s), count in sorted(self._requests.items())
+            ])
+            lines.append('# HELP projects_http_request_duration_seconds Request wall time, by route.')
+            lines.append('# TYPE projects_http_request_duration_seconds histogram')
+            for (method, route), counts in sorted(self._latency.items()):
+                cumulative = 0
+                for bound, count in zip((*self.buckets, '+Inf'), counts):
+                    cumulative += count
+                    labels = _labels({'method': method, 'route': route, 'le': str(bound)})
+                    lines.append(f'projects_http_request_duration_seconds_bucket{{{labels}}} {cumulative}')
+                labels = _labels({'method': method, 'route': route})
+                lines.append(f'projects_http_request_duration_seconds_sum{{{labels}}} {self._latency_sum[(method, route)]}')
+                lines.append(f'projects_http_request_duration_seconds_count{{{labels}}} {cumulative}')
+            for name, help_text, values in (
+                ('projects_http_db_queries_total', 'Database queries run by requests, by route.', self._db_queries),
+                ('projects_http_db_seconds_total', 'Time spent in database queries, by route.', self._db_seconds),
+                ('projects_http_render_seconds_total', 'Time spent encoding responses, by route.', self._render_seconds),
+                ('projects_http_response_bytes_total', 'Response body bytes, by route.', self._response_bytes),
+            ):
+                family(name, 'counter', help_text, [
+                    ({'method': m, 'route': r}, value) for (m, r), value in sorted(values.items())
+                ])
+        return '\n'.join(lines) + '\n'
+
+
+def _labels(labels):
+    escaped = (
+        (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in labels.items()
+    )
+    return ','.join(f'{name}="{value}"' for name, value in escaped)
+
+
+registry = Registry()
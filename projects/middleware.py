@@ -1,12 +1,192 @@
 # projects/middleware.py
 
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
 from django.http import JsonResponse
 
+from . import metrics, replicas
+
+request_logger = logging.getLogger('projects.requests')
+query_logger = logging.getLogger('projects.queries')
+
+
 class IsAuthenticatedMiddleware:
+    """
+    Reject unauthenticated requests early.
+
+    Paths listed in AUTH_EXEMPT_PATHS (admin, API docs, token issuing) are
+    let through, and so are requests carrying an Authorization header, whose
+    token the API's auth classes verify without touching the session.
+    """
+
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self.exempt_paths = tuple(getattr(settings, 'AUTH_EXEMPT_PATHS', ()))
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _needs_session(self, request):
+        return not (request.path.startswith(self.exempt_paths) or 'Authorization' in request.headers)
+
+    def _unauthorized(self):
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
 
     def __call__(self, request):
-        if not request.user.is_authenticated:
-            return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if self._needs_session(request) and not request.user.is_authenticated:
+            return self._unauthorized()
         return self.get_response(request)
+
+    async def __acall__(self, request):
+        if self._needs_session(request):
+            user = await request.auser()
+            if not user.is_authenticated:
+                return self._unauthorized()
+        return await self.get_response(request)
+
+
+class ReadYourWritesMiddleware:
+    """
+    Remember API callers whose request changed data, so their reads skip
+    the replicas for PROJECTS_REPLICA_LAG seconds and they always see their
+    own writes. Does nothing when no replicas are configured.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    UNSAFE_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _writer_id(self, request, response):
+        if not replicas.replica_aliases() or request.method not in self.UNSAFE_METHODS or response.status_code >= 400:
+            return None
+        # `request.auth` is the caller as resolved by the API's auth classes
+        return getattr(getattr(request, 'auth', None), 'id', None)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        user_id = self._writer_id(request, response)
+        if user_id is not None:
+            replicas.record_write(user_id)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        user_id = self._writer_id(request, response)
+        if user_id is not None:
+            await replicas.arecord_write(user_id)
+        return response
+
+
+class InstrumentationMiddleware:
+    """
+    Measure every request: wall time, database queries and their time, and
+    response encoding time and size. The numbers go out as a Server-Timing
+    header, a `projects.requests` log line and the per-route Prometheus
+    metrics. Put it first so the time spent in other middleware counts too.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _finish(self, request, response, request_metrics):
+        seconds = request_metrics.elapsed()
+        match = request.resolver_match
+        # The URL pattern rather than the path, so label values stay bounded
+        route = '/' + match.route if match is not None else 'unmatched'
+        # Streamed bodies are still being produced; only their headers are timed
+        size = None if response.streaming else len(response.content)
+        response['Server-Timing'] = request_metrics.server_timing(seconds)
+        metrics.registry.observe(request.method, route, response.status_code, request_metrics, seconds, size)
+        if request_logger.isEnabledFor(logging.INFO):
+            request_logger.info(
+                "%s %s %d %.1fms db=%d/%.1fms render=%.1fms bytes=%s",
+                request.method, route, response.status_code, seconds * 1000, request_metrics.db_queries,
+                request_metrics.db_seconds * 1000, request_metrics.render_seconds * 1000, size,
+                extra={
+                    'method': request.method,
+                    'route': route,
+                    'status': response.status_code,
+                    'duration_ms': round(seconds * 1000, 3),
+                    'db_queries': request_metrics.db_queries,
+                    'db_ms': round(request_metrics.db_seconds * 1000, 3),
+                    'render_ms': round(request_metrics.render_seconds * 1000, 3),
+                    'response_bytes': size,
+                },
+            )
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with metrics.measuring(metrics.RequestMetrics()) as request_metrics:
+            response = self.get_response(request)
+        return self._finish(request, response, request_metrics)
+
+    async def __acall__(self, request):
+        with metrics.measuring(metrics.RequestMetrics()) as request_metrics:
+            response = await self.get_response(request)
+        return self._finish(request, response, request_metrics)
+
+
+class RepeatedQueryMiddleware:
+    """
+    Development aid: warn on the `projects.queries` logger when a request
+    runs the same SQL, give or take its parameters, more than
+    PROJECTS_REPEATED_QUERY_THRESHOLD times, the usual sign of a per-row
+    query (N+1). Only loaded with DEBUG on. Queries run while a streamed
+    body is produced come after the check and aren't seen.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.threshold = getattr(settings, 'PROJECTS_REPEATED_QUERY_THRESHOLD', 10)
+        if not settings.DEBUG or self.threshold <= 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _check(self, request, shapes):
+        for shape, count in shapes.most_common():
+            if count <= self.threshold:
+                break
+            query_logger.warning(
+                "%s %s ran the same query %d times: %s", request.method, request.path, count, shape,
+                extra={'method': request.method, 'path': request.path, 'count': count, 'sql': shape},
+            )
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with metrics.collecting_shapes() as shapes:
+            response = self.get_response(request)
+        self._check(request, shapes)
+        return response
+
+    async def __acall__(self, request):
+        with metrics.collecting_shapes() as shapes:
+            response = await self.get_response(request)
+        self._check(request, shapes)
+        return response
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.2 on 2026-10-18 09:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        (
+            "projects",
+            "0003_alter_project_assigned_to_alter_project_created_by_and_more",
+        ),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                fields=["date_created", "id"], name="project_created_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.2 on 2026-10-18 09:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("projects", "0004_project_created_id_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                fields=["assigned_to", "status", "date_created", "id"],
+                name="project_assignee_status_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                fields=["status", "priority", "date_created", "id"],
+                name="project_status_priority_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.2 on 2026-10-18 09:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("projects", "0005_project_assignee_status_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="project",
+            name="revision",
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.1.2 on 2026-10-18 09:42
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_existing_projects(apps, schema_editor):
+    Project = apps.get_model("projects", "Project")
+    ProjectCounter = apps.get_model("projects", "ProjectCounter")
+    counters = []
+    for dimension, attname in [("status", "status"), ("priority", "priority"), ("assigned_to", "assigned_to_id")]:
+        for row in Project.objects.values(attname).annotate(count=Count("id")).order_by():
+            value = "" if row[attname] is None else str(row[attname])
+            counters.append(ProjectCounter(dimension=dimension, value=value, count=row["count"]))
+    ProjectCounter.objects.bulk_create(counters)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0006_project_revision"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProjectCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("dimension", models.CharField(max_length=20)),
+                ("value", models.CharField(blank=True, max_length=50)),
+                ("count", models.IntegerField(default=0)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("dimension", "value"),
+                        name="project_counter_bucket_uniq",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(count_existing_projects, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations
+
+
+def install_search_index(apps, schema_editor):
+    from projects import search
+
+    search.install(schema_editor.connection)
+
+
+def remove_search_index(apps, schema_editor):
+    from projects import search
+
+    search.uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("projects", "0007_projectcounter"),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, remove_search_index),
+    ]
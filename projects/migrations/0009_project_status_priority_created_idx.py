@@ -0,0 +1,26 @@
+# Generated by Django 5.1.2 on 2026-10-18 10:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("projects", "0008_project_search_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                fields=["status", "date_created", "id"],
+                name="project_status_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                fields=["priority", "date_created", "id"],
+                name="project_priority_created_idx",
+            ),
+        ),
+    ]
@@ -1,7 +1,11 @@
 # projects/models.py
-from django.db import models
+from django.db import models, router, transaction
 from django.contrib.auth.models import User
 
+class RevisionConflict(Exception):
+    """The project was saved by someone else since this copy was loaded."""
+
+
 class Project(models.Model):
     STATUS_CHOICES = [
         ('in_progress', 'In Progress'),
@@ -23,6 +27,134 @@ class Project(models.Model):
     assigned_to = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='projects')
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='created_projects')
     date_created = models.DateTimeField(auto_now_add=True)
+    # Incremented on every write; the API derives ETags from it
+    revision = models.PositiveIntegerField(default=1, editable=False)
+
+    class Meta:
+        indexes = [
+            # Keyset pagination walks (date_created, id) in descending order
+            models.Index(fields=['date_created', 'id'], name='project_created_id_idx'),
+            # A user's projects, optionally narrowed by status, in list order
+            models.Index(fields=['assigned_to', 'status', 'date_created', 'id'], name='project_assignee_status_idx'),
+            # Admin dashboards filtering on status and priority, in list order
+            models.Index(fields=['status', 'priority', 'date_created', 'id'], name='project_status_priority_idx'),
+            # The admin changelist and staff lists filtering on just one of them
+            models.Index(fields=['status', 'date_created', 'id'], name='project_status_created_idx'),
+            models.Index(fields=['priority', 'date_created', 'id'], name='project_priority_created_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        project = super().from_db(db, field_names, values)
+        # Stored values, so signal handlers can tell which counters a save moves
+        project._loaded_values = dict(zip(field_names, values))
+        return project
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        # The reloaded columns are what's stored now, so the counters and the
+        # revision check must compare against them rather than the first load
+        if fields is None:
+            deferred = self.get_deferred_fields()
+            attnames = [field.attname for field in self._meta.concrete_fields if field.attname not in deferred]
+        else:
+            concrete = {field.name: field.attname for field in self._meta.concrete_fields}
+            concrete.update({attname: attname for attname in concrete.values()})
+            attnames = [concrete[name] for name in fields if name in concrete]
+        self._loaded_values = {
+            **getattr(self, '_loaded_values', {}),
+            **{attname: getattr(self, attname) for attname in attnames},
+        }
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            super().save(*args, **kwargs)
+            # Saved copies are guarded like loaded ones from now on
+            self._loaded_values = {**getattr(self, '_loaded_values', {}), 'revision': self.revision}
+            return
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'revision'}
+        self.revision += 1
+        try:
+            # Django marks the surrounding transaction as broken when save()
+            # raises; a savepoint keeps a conflict recoverable inside atomic()
+            with transaction.atomic(using=kwargs.get('using') or router.db_for_write(Project, instance=self)):
+                super().save(*args, **kwargs)
+        except RevisionConflict:
+            self.revision -= 1
+            raise
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        # Optimistic locking for projects loaded from the database: the UPDATE
+        # only matches while the row still has the revision that was loaded
+        if 'revision' not in getattr(self, '_loaded_values', {}):
+            return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+        expected = self.revision - 1
+        if not super()._do_update(base_qs.filter(revision=expected), using, pk_val, values, update_fields, forced_update):
+            raise RevisionConflict(f"Project {pk_val} is no longer at revision {expected}")
+        self._loaded_values['revision'] = self.revision
+        return True
 
     def __str__(self):
         return self.name
+
+
+class ProjectCounter(models.Model):
+    """
+    Number of projects in one bucket of a breakdown, e.g. status=done.
+
+    Kept up to date on every project write so the stats endpoint reads a
+    handful of counter rows instead of aggregating the project table.
+    """
+
+    dimension = models.CharField(max_length=20)
+    # Choice value or assignee id; empty for projects without an assignee
+    value = models.CharField(max_length=50, blank=True)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['dimension', 'value'], name='project_counter_bucket_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.dimension}={self.value or '-'}: {self.count}"
+
+
+class Job(models.Model):
+    """
+    Background work queued through the API and run by `manage.py run_jobs`.
+
+    The table is the queue: workers claim queued rows oldest first and
+    record the outcome on the row, which is what clients poll.
+    """
+
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=50)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    # Worker that claimed the job last, as host:pid
+    worker = models.CharField(max_length=100, blank=True)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='jobs')
+    date_created = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Workers look for the oldest queued jobs, and stale running ones
+            models.Index(fields=['status', 'id'], name='job_status_id_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
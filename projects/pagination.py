@@ -0,0 +1,97 @@
+# projects/pagination.py
+import base64
+import binascii
+from datetime import datetime
+
+from django.db.models import Q
+
+# Keyset ordering: newest first, id breaks ties between identical timestamps
+KEYSET_ORDERING = ('-date_created', '-id')
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+# Deepest row reachable through offset pagination
+MAX_OFFSET = 1000
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(project):
+    """Encode the (date_created, id) position of a project as an opaque cursor."""
+    raw = f"{project.date_created.isoformat()}|{project.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor into (date_created, id)."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        date_created, project_id = raw.split('|', 1)
+        return datetime.fromisoformat(date_created), int(project_id)
+    except (binascii.Error, UnicodeError, ValueError):
+        raise InvalidCursor(cursor)
+
+
+async def paginate_keyset(queryset, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    Return one page of `queryset` and the cursor of the next page.
+
+    Rows after the cursor are selected with a range condition on
+    (date_created, id) rather than OFFSET, so every page is a single
+    index range scan no matter how deep the client has paged.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    queryset = queryset.order_by(*KEYSET_ORDERING)
+
+    if cursor:
+        date_created, project_id = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(date_created__lt=date_created) |
+            Q(date_created=date_created, id__lt=project_id)
+        )
+
+    # Fetch one extra row to find out whether another page exists
+    page = [project async for project in queryset[:limit + 1]]
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        next_cursor = encode_cursor(page[-1])
+    return page, next_cursor
+
+
+def encode_offset(offset):
+    return base64.urlsafe_b64encode(f"offset|{offset}".encode()).decode()
+
+
+def decode_offset(cursor):
+    try:
+        kind, offset = base64.urlsafe_b64decode(cursor.encode()).decode().split('|', 1)
+        offset = int(offset)
+    except (binascii.Error, UnicodeError, ValueError):
+        raise InvalidCursor(cursor)
+    if kind != 'offset' or offset < 0:
+        raise InvalidCursor(cursor)
+    return offset
+
+
+async def paginate_offset(queryset, cursor=None, limit=DEFAULT_PAGE_SIZE, max_offset=MAX_OFFSET):
+    """
+    Return one page of an already ordered `queryset` and the cursor of the next page.
+
+    For orderings without a usable keyset, such as search relevance. Paging
+    stops at `max_offset` since each page re-reads everything before it.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    offset = decode_offset(cursor) if cursor else 0
+    if offset >= max_offset:
+        return [], None
+
+    page = [project async for project in queryset[offset:offset + limit + 1]]
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        if offset + limit < max_offset:
+            next_cursor = encode_offset(offset + limit)
+    return page, next_cursor
@@ -0,0 +1,55 @@
+# projects/renderers.py
+import datetime
+import json
+
+from ninja.parser import Parser
+from ninja.renderers import BaseRenderer
+from ninja.responses import NinjaJSONEncoder
+
+from . import metrics
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+class JSONEncoder(NinjaJSONEncoder):
+    """Stdlib fallback that writes datetimes exactly like orjson does."""
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.date, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+_fallback_encoder = JSONEncoder()
+
+
+def dumps(data):
+    """Encode `data` as JSON bytes, with orjson when it is installed."""
+    if orjson is not None:
+        # orjson handles datetimes, dataclasses and UUIDs natively; anything
+        # else (pydantic models, Decimals, ...) goes through Ninja's encoder
+        return orjson.dumps(data, default=_fallback_encoder.default)
+    return json.dumps(data, cls=JSONEncoder).encode()
+
+
+def loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class ORJSONRenderer(BaseRenderer):
+    media_type = 'application/json'
+
+    def render(self, request, data, *, response_status):
+        with metrics.timing_render():
+            return dumps(data)
+
+
+class ORJSONParser(Parser):
+    def parse_body(self, request):
+        # Ninja answers any parse error with 400 "Cannot parse request body"
+        return loads(request.body)
@@ -0,0 +1,80 @@
+# projects/replicas.py
+import functools
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+from . import cache
+
+WROTE_KEY = 'projects:wrote:{}'
+
+# Database alias that ORM reads in the current request should use; None means the primary
+_read_db = ContextVar('projects_read_db', default=None)
+
+
+def replica_aliases():
+    return getattr(settings, 'PROJECTS_READ_REPLICAS', [])
+
+
+def current():
+    """Replica alias reads are routed to right now, or None for the primary."""
+    return _read_db.get()
+
+
+@contextmanager
+def reading_from(alias):
+    token = _read_db.set(alias)
+    try:
+        yield
+    finally:
+        _read_db.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Send reads inside `reading_from()` to that replica. Everything else,
+    and every write, goes to the primary, including saves of instances
+    that were loaded from a replica.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _read_db.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        databases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+def record_write(user_id):
+    """Send `user_id`'s reads to the primary until replicas have caught up with their write."""
+    cache.get_cache().set(WROTE_KEY.format(user_id), True, settings.PROJECTS_REPLICA_LAG)
+
+
+async def arecord_write(user_id):
+    await cache.get_cache().aset(WROTE_KEY.format(user_id), True, settings.PROJECTS_REPLICA_LAG)
+
+
+async def choose(user):
+    """A replica for `user`'s reads, or None if there are none or the user wrote recently."""
+    aliases = replica_aliases()
+    if not aliases or await cache.get_cache().aget(WROTE_KEY.format(user.id)):
+        return None
+    return random.choice(aliases)
+
+
+def prefer_replica(view):
+    """Run an async read-only view's queries against a replica when one can be used."""
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        with reading_from(await choose(request.auth)):
+            return await view(request, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,112 @@
+# projects/search.py
+import re
+
+from django.db import connections
+from django.db.models import Q
+
+# SQLite: an external-content FTS5 table over the project table, kept in
+# sync by triggers so bulk writes and raw SQL are covered too
+FTS_TABLE = 'projects_project_fts'
+SQLITE_SCHEMA = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, description, content='projects_project', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON projects_project BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description) VALUES (new.id, new.name, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON projects_project BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description) VALUES ('delete', old.id, old.name, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update AFTER UPDATE OF name, description ON projects_project BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description) VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, description) VALUES (new.id, new.name, new.description);
+    END""",
+]
+SQLITE_TRIGGERS = {f'{FTS_TABLE}_insert', f'{FTS_TABLE}_delete', f'{FTS_TABLE}_update'}
+
+# PostgreSQL: a generated tsvector column with a GIN index; names weigh more than descriptions
+POSTGRES_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+POSTGRES_SCHEMA = [
+    f"ALTER TABLE projects_project ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    f"GENERATED ALWAYS AS ({POSTGRES_VECTOR}) STORED",
+    "CREATE INDEX IF NOT EXISTS project_search_vector_idx ON projects_project USING GIN (search_vector)",
+]
+
+TERM_RE = re.compile(r'\w+')
+
+
+def install(connection):
+    """
+    Create the search index for `connection`'s database if it is missing.
+
+    Safe to run repeatedly. On SQLite, Django rebuilds tables to alter them,
+    which drops their triggers; when that happened the triggers are put back
+    and the index is rebuilt from the table.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'projects_project'")
+            missing = SQLITE_TRIGGERS - {row[0] for row in cursor.fetchall()}
+            if missing:
+                for statement in SQLITE_SCHEMA:
+                    cursor.execute(statement)
+                cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        elif connection.vendor == 'postgresql':
+            for statement in POSTGRES_SCHEMA:
+                cursor.execute(statement)
+
+
+def uninstall(connection):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            for trigger in sorted(SQLITE_TRIGGERS):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+        elif connection.vendor == 'postgresql':
+            cursor.execute("ALTER TABLE projects_project DROP COLUMN IF EXISTS search_vector")
+
+
+def search_terms(query):
+    """Words of a user query; punctuation is dropped so it can't be read as search syntax."""
+    return TERM_RE.findall(query.lower())
+
+
+def search(queryset, query):
+    """
+    Narrow `queryset` to projects matching every word of `query`, best
+    matches first. Each result carries its score as `rank` (lower is better).
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+
+    vendor = connections[queryset.db].vendor
+    if vendor == 'sqlite':
+        # Quoted terms are matched literally, all of them required
+        match = ' '.join(f'"{term}"' for term in terms)
+        return queryset.extra(
+            tables=[FTS_TABLE],
+            where=[f"{FTS_TABLE}.rowid = projects_project.id", f"{FTS_TABLE} MATCH %s"],
+            params=[match],
+            # bm25 scores better matches lower; names weigh more than descriptions
+            select={'rank': f"bm25({FTS_TABLE}, 10.0, 1.0)"},
+            order_by=['rank', 'id'],
+        )
+
+    if vendor == 'postgresql':
+        tsquery = "plainto_tsquery('english', %s)"
+        return queryset.extra(
+            where=[f"search_vector @@ {tsquery}"],
+            params=[' '.join(terms)],
+            select={'rank': f"-ts_rank(search_vector, {tsquery})"},
+            select_params=[' '.join(terms)],
+            order_by=['rank', 'id'],
+        )
+
+    # No search index on this backend: substring matching, newest first
+    for term in terms:
+        queryset = queryset.filter(Q(name__icontains=term) | Q(description__icontains=term))
+    return queryset.extra(select={'rank': '0'}, order_by=['-date_created', '-id'])
@@ -0,0 +1,65 @@
+# projects/seed.py
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from . import cache, counters
+from .models import Project
+
+WORDS = (
+    "api backend billing cache client cloud dashboard data database deploy design docs "
+    "export frontend gateway import index integration invoice kubernetes login metrics "
+    "migration mobile monitoring network onboarding payment performance pipeline portal "
+    "queue redesign release report search security server service storage sync testing "
+    "upgrade website workflow"
+).split()
+# Also in about one project name in a thousand, for a selective search
+RARE_WORD = 'zeppelin'
+
+SEED_BATCH_SIZE = 10_000
+# Every seeded user can log in with this password
+SEED_PASSWORD = 'seed-password'
+
+
+def seed_users(count, batch_size=SEED_BATCH_SIZE):
+    """Create `count` users named seed-user-<n> after any already seeded; returns their ids."""
+    # Hashing is deliberately slow, so every user shares one hash
+    password = make_password(SEED_PASSWORD)
+    start = User.objects.filter(username__startswith='seed-user-').count()
+    users = User.objects.bulk_create(
+        [User(username=f'seed-user-{start + n}', password=password) for n in range(count)],
+        batch_size=batch_size,
+    )
+    return [user.id for user in users]
+
+
+def seed_projects(count, user_ids=(), rng=None, batch_size=SEED_BATCH_SIZE):
+    """
+    Insert `count` synthetic projects with bulk_create, one transaction per
+    batch, assigned at random to `user_ids` (some left unassigned). The
+    statistics counters and the response cache are brought up to date
+    afterwards, since bulk_create sends no signals.
+    """
+    rng = rng or random.Random()
+    statuses = [status for status, _ in Project.STATUS_CHOICES]
+    priorities = [priority for priority, _ in Project.PRIORITY_CHOICES]
+    assignees = [*user_ids, None]
+    for start in range(0, count, batch_size):
+        with transaction.atomic():
+            Project.objects.bulk_create([
+                Project(
+                    name=' '.join(rng.choices(WORDS, k=3)).capitalize()
+                    + (f' {RARE_WORD}' if rng.random() < 0.001 else ''),
+                    description=' '.join(rng.choices(WORDS, k=12)),
+                    status=rng.choice(statuses),
+                    priority=rng.choice(priorities),
+                    assigned_to_id=rng.choice(assignees),
+                    created_by_id=rng.choice(assignees),
+                )
+                for _ in range(min(batch_size, count - start))
+            ])
+    if count > 0:
+        counters.rebuild()
+        cache.invalidate_projects([])
@@ -0,0 +1,83 @@
+# projects/signals.py
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from . import auth, bulk, cache, counters, events
+from .models import Project
+
+
+# Covers the API views as well as saves made through the Django admin
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def invalidate_project_cache(sender, instance, using, **kwargs):
+    project_ids = [instance.pk]
+    cache.invalidate_projects(project_ids)
+    # Until the write commits, readers still see the old row and may cache it
+    # again; drop it once more when the new row is visible to them
+    if transaction.get_connection(using).in_atomic_block:
+        transaction.on_commit(lambda: cache.invalidate_projects(project_ids), using=using)
+
+
+@receiver(pre_save, sender=Project)
+def load_stored_buckets(sender, instance, **kwargs):
+    # The counters need the stored values, which the database only has until the write
+    counters.load_stored(instance)
+
+
+@receiver(pre_delete, sender=Project)
+def load_deleted_values(sender, instance, **kwargs):
+    # Once the row is gone, deferred fields can't be read for the counters and the event
+    deferred = instance.get_deferred_fields() & {'status', 'priority', 'assigned_to_id', 'revision'}
+    if deferred:
+        instance.refresh_from_db(fields=deferred)
+    counters.load_stored(instance)
+
+
+@receiver(pre_save, sender=Project)
+def remember_previous_assignee(sender, instance, **kwargs):
+    # Counting the save below replaces the loaded values, so keep the old assignee for its event
+    instance._previous_assigned_to = getattr(instance, '_loaded_values', {}).get('assigned_to_id')
+
+
+@receiver(post_save, sender=Project)
+def count_project_saved(sender, instance, created, **kwargs):
+    if created:
+        counters.track(created=[instance])
+    else:
+        counters.track(updated=[instance])
+
+
+@receiver(post_delete, sender=Project)
+def count_project_deleted(sender, instance, **kwargs):
+    counters.track(deleted=[instance])
+
+
+@receiver(post_save, sender=Project)
+def publish_project_saved(sender, instance, created, **kwargs):
+    event = events.project_event(
+        'created' if created else 'updated', instance, getattr(instance, '_previous_assigned_to', None),
+    )
+    # Only tell clients about changes they can actually read back
+    transaction.on_commit(lambda: events.publish(event))
+
+
+@receiver(post_delete, sender=Project)
+def publish_project_deleted(sender, instance, **kwargs):
+    event = events.project_event('deleted', instance)
+    transaction.on_commit(lambda: events.publish(event))
+
+
+# Role, active flag and password hash feed the cached session role
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_user_role(sender, instance, **kwargs):
+    auth.forget_role(instance.pk)
+
+
+@receiver(pre_delete, sender=User)
+def unassign_user_projects(sender, instance, **kwargs):
+    # SET_NULL would clear the assignee with an UPDATE that leaves the revision,
+    # cache and subscribers behind; unassign the projects the tracked way first
+    bulk.reassign(Project.objects.filter(assigned_to_id=instance.pk), None)
@@ -1,9 +1,30 @@
-from typing import List
-from ninja import NinjaAPI, ModelSchema, Field
-from django.shortcuts import get_object_or_404
+from datetime import datetime
+from typing import Any, Dict, List
+from ninja import NinjaAPI, File, UploadedFile
+from asgiref.sync import sync_to_async
+from django.shortcuts import aget_object_or_404
 from ninja.errors import HttpError
-from .models import Project
+from . import cache, counters, events, export, importer, jobs, metrics, search
+from .auth import JWTAuth, admin_only, authenticated, issue_token, revoke_token
+from .models import Job, Project, RevisionConflict
+from .bulk import (
+    MAX_BULK_ITEMS, BulkDeleteSchema, BulkItemsSchema, BulkResultSchema, ProjectPriority, ProjectStatus,
+    bulk_create_projects, bulk_delete_projects, bulk_update_projects,
+)
+from .etags import list_etag, not_modified, precondition_failed, project_etag
+from .renderers import ORJSONParser, ORJSONRenderer
+from .replicas import prefer_replica
+from .pagination import DEFAULT_PAGE_SIZE, InvalidCursor, paginate_keyset, paginate_offset
+from django.contrib.auth import aauthenticate
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.utils.crypto import constant_time_compare
+from django.core.files.storage import default_storage
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+import codecs
+import csv
+import functools
 import logging
 # Project schema for serialization
 from pydantic import BaseModel, Field
@@ -12,134 +33,474 @@ from typing import Optional
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# Create NinjaAPI instance
-api = NinjaAPI()
+# Create NinjaAPI instance; callers identify with a JWT bearer token or a session cookie
+api = NinjaAPI(auth=authenticated, renderer=ORJSONRenderer(), parser=ORJSONParser())
+
+
+class ProjectInSchema(BaseModel):
+    """Request body for creating or replacing a project; unknown fields are ignored."""
+    name: str = Field(..., max_length=Project._meta.get_field('name').max_length)
+    description: str
+    status: ProjectStatus
+    priority: ProjectPriority
+    assigned_to: int  # User ID
+
+
+class ProjectPatchSchema(BaseModel):
+    """Request body for a partial update: only the fields sent are changed, and none may be null."""
+    name: str = Field(None, max_length=Project._meta.get_field('name').max_length)
+    description: str = None
+    status: ProjectStatus = None
+    priority: ProjectPriority = None
+    assigned_to: int = None  # User ID
 
 
 class ProjectSchema(BaseModel):
-    id: Optional[int]  # Use Optional since it might not be present during creation
+    id: int
     name: str
     description: str
-    status: str
-    priority: str
-    assigned_to: int  # Use user ID
-    date_created: Optional[str]  # Optional, since it won't be set during creation
-    created_by: str = Field(..., exclude=True)  # Exclude `created_by` from input
-
-    class Config:
-        model = Project
-        model_fields = '__all__'
+    status: ProjectStatus
+    priority: ProjectPriority
+    assigned_to: Optional[int]  # Use user ID; None once the assignee is deleted
+    date_created: datetime  # Rendered as ISO 8601
+    revision: Optional[int] = Field(None, exclude=True)  # Sent as the ETag header instead
 
     @classmethod
-    def from_model(cls, project: Project) -> 'ProjectSchema':
-        """Convert a Project instance to ProjectSchema, handling created_by correctly."""
+    def from_model(cls, project: Project, fields=None) -> 'ProjectSchema':
+        """Convert a Project instance to ProjectSchema, with only `fields` set if given."""
+        if fields is not None:
+            # Only the requested attributes are read, so deferred columns stay unloaded
+            values = {field: getattr(project, MODEL_ATTRIBUTES.get(field, field)) for field in fields}
+            return cls.model_construct(_fields_set=set(fields), revision=project.revision, **values)
         return cls(
             id=project.id,
             name=project.name,
             description=project.description,
             status=project.status,
             priority=project.priority,
-            date_created=project.date_created.isoformat(),  # Format as ISO 8601 string
-            assigned_to=project.assigned_to.id,  # Use ID for assigned_to in response
-            created_by=str(project.created_by)  # Convert User to string (e.g., username)
+            date_created=project.date_created,
+            assigned_to=project.assigned_to_id,  # Read the FK column, no User fetch needed
+            revision=project.revision,
         )
 
-# Permission check decorator for authenticated users
-def is_authenticated(request):
-    if not request.user.is_authenticated:
-        logger.warning("Unauthorized access attempt.")
-        return {"error": "Unauthorized"}, 401
+    @classmethod
+    def from_queryset(cls, projects, fields=None) -> List['ProjectSchema']:
+        """Serialize a page or queryset of projects; a queryset is read with a single query."""
+        return [cls.from_model(project, fields) for project in projects]
+
+    def project(self, fields) -> 'ProjectSchema':
+        """Copy with only `fields` set; routes with exclude_unset leave the rest out."""
+        if fields is None:
+            return self
+        values = {field: getattr(self, field) for field in fields}
+        return type(self).model_construct(_fields_set=set(fields), revision=self.revision, **values)
+
+
+# Schema field -> Project attribute, where they differ
+MODEL_ATTRIBUTES = {'assigned_to': 'assigned_to_id'}
+PROJECT_FIELDS = tuple(field for field in ProjectSchema.model_fields if field != 'revision')
+
+
+class ProjectListSchema(BaseModel):
+    items: List[ProjectSchema]
+    next_cursor: Optional[str] = None
+
+class AssigneeCountSchema(BaseModel):
+    assigned_to: Optional[int]  # None counts unassigned projects
+    count: int
+
+class ProjectStatsSchema(BaseModel):
+    total: int
+    by_status: Dict[str, int]
+    by_priority: Dict[str, int]
+    by_assignee: List[AssigneeCountSchema]
+
+class CacheStatsSchema(BaseModel):
+    hits: int
+    misses: int
+    invalidations: int
+    hit_ratio: float
+
+class TokenRequestSchema(BaseModel):
+    username: str
+    password: str
+
+class TokenSchema(BaseModel):
+    access: str
+    token_type: str = "Bearer"
+    expires_in: int
+
+class JobInSchema(BaseModel):
+    kind: str  # e.g. reassign_projects or export_projects
+    payload: Dict[str, Any] = {}
+
+class JobSchema(BaseModel):
+    id: int
+    kind: str
+    status: str  # queued, running, done or failed
+    payload: Dict[str, Any]
+    result: Optional[Dict[str, Any]]
+    error: str
+    attempts: int
+    date_created: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+    @classmethod
+    def from_model(cls, job: Job) -> 'JobSchema':
+        return cls.model_validate(job, from_attributes=True)
+
+# Attempts at a conditional update before a hot project is reported as a conflict
+MAX_SAVE_ATTEMPTS = 3
+
+def check_bulk_size(count):
+    if count > MAX_BULK_ITEMS:
+        raise HttpError(400, f"Too many items: {count} (max {MAX_BULK_ITEMS})")
+
+# Projects the user may read: everything for admins, otherwise only their assigned projects.
+# Filtering in SQL means rows the user can't see are never loaded.
+def visible_projects(user):
+    if user.is_staff:
+        return Project.objects.all()
+    return Project.objects.filter(assigned_to_id=user.id)
+
+# Same rule for an already cached project; hidden projects look like missing ones
+def check_project_visible(user, assigned_to_id):
+    if not user.is_staff and assigned_to_id != user.id:
+        raise HttpError(404, "Not Found")
+
+# Parse a `?fields=a,b` projection into schema field names; id is always included
+def parse_fields(fields):
+    if fields is None:
+        return None
+    requested = {field.strip() for field in fields.split(',') if field.strip()}
+    unknown = requested - set(PROJECT_FIELDS)
+    if unknown:
+        raise HttpError(400, f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(field for field in PROJECT_FIELDS if field in requested or field == 'id')
+
+# Load only the columns a projection needs, plus those used for cursors and ETags
+def only_fields(projects, fields):
+    if fields is None:
+        return projects
+    return projects.only('id', 'date_created', 'revision', *fields)
 
-# Permission check decorator for admin users
-def is_admin(request):
-    if not request.user.is_staff:
-        logger.warning("Forbidden access attempt by non-admin user.")
-        return {"error": "Forbidden"}, 403
+# Optional filters shared by the list and export endpoints
+def filter_projects(projects, status=None, priority=None, assigned_to=None):
+    if status is not None:
+        projects = projects.filter(status=status)
+    if priority is not None:
+        projects = projects.filter(priority=priority)
+    if assigned_to is not None:
+        projects = projects.filter(assigned_to_id=assigned_to)
+    return projects
+
+# Async streaming views only stream under ASGI; under WSGI Django collects the
+# iterator into a list first, and never finishes an endless one
+def asgi_only(view):
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if not isinstance(request, ASGIRequest):
+            raise HttpError(501, "This endpoint streams and needs an ASGI server")
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+# Exchange credentials for a signed access token (no authentication required)
+@api.post('/token/', response=TokenSchema, auth=None)
+async def obtain_token(request, payload: TokenRequestSchema):
+    user = await aauthenticate(request, username=payload.username, password=payload.password)
+    if user is None:
+        raise HttpError(401, "Invalid credentials")
+    token = issue_token(user)
+    return TokenSchema(access=str(token), expires_in=int(token.lifetime.total_seconds()))
+
+# Revoke the bearer token used for this request (token-authenticated users)
+@api.post('/token/revoke/', auth=JWTAuth())
+async def revoke(request):
+    await revoke_token(request.token_claims)
+    return {"success": True}
 
 # Create a new project (admin-only access)
-@api.post('/projects/', response=ProjectSchema)
-def create_project(request, payload: ProjectSchema):
-    is_admin(request)  # Check admin permissions
-    valid_statuses = ['in_progress', 'done', 'abandoned', 'canceled']
-    valid_priorities = ['low', 'mid', 'high']
-
-    if payload.status not in valid_statuses:
-        raise HttpError(400, f"Invalid status: {payload.status}")
-    
-    if payload.priority not in valid_priorities:
-        raise HttpError(400, f"Invalid priority: {payload.priority}")
+@api.post('/projects/', response=ProjectSchema, auth=admin_only)
+async def create_project(request, payload: ProjectInSchema):
+    user = request.auth
 
     # Use the provided assigned_to user ID
-    assigned_to_user = get_object_or_404(User, id=payload.assigned_to)
-    
+    assigned_to_user = await aget_object_or_404(User, id=payload.assigned_to)
+
     # Prepare project data, using the user ID for created_by
-    project_data = payload.dict(exclude={"created_by"})
-    project = Project.objects.create(**project_data, created_by=request.user, assigned_to=assigned_to_user)
+    project_data = payload.model_dump(exclude={"assigned_to"})
+    project = await Project.objects.acreate(**project_data, created_by_id=user.id, assigned_to=assigned_to_user)
 
-    logger.info(f"Project created: {project}")
+    logger.info("Project created: %s", project)
     return ProjectSchema.from_model(project)
 
-# Update an existing project (admin-only access)
-@api.put('/projects/{project_id}/', response=ProjectSchema)
-def update_project(request, project_id: int, payload: ProjectSchema):
-    is_admin(request)  # Check admin permissions
-    project = get_object_or_404(Project, id=project_id)
-
-    valid_statuses = ['in_progress', 'done', 'abandoned', 'canceled']
-    valid_priorities = ['low', 'mid', 'high']
+# Apply `changes` (schema field -> value) with optimistic locking: the UPDATE only matches the
+# revision that was read, so concurrent writers can't silently overwrite each other. With
+# If-Match the client's revision must still be current (412 otherwise); without it, a write
+# that lost a race is re-applied to the fresh row.
+async def save_project(request, project_id, changes, partial=False):
+    for _ in range(MAX_SAVE_ATTEMPTS):
+        project = await aget_object_or_404(Project, id=project_id)
+        if precondition_failed(request, project_etag(project.id, project.revision)):
+            raise HttpError(412, "Precondition Failed")
+        if not changes:
+            return project
+        for attr, value in changes.items():
+            setattr(project, MODEL_ATTRIBUTES.get(attr, attr), value)
+        try:
+            await project.asave(update_fields=list(changes) if partial else None)
+            return project
+        except RevisionConflict:
+            continue
+    raise HttpError(409, "Conflict")
 
-    if payload.status not in valid_statuses:
-        raise HttpError(400, f"Invalid status: {payload.status}")
+# Update an existing project (admin-only access)
+@api.put('/projects/{int:project_id}/', response=ProjectSchema, auth=admin_only)
+async def update_project(request, project_id: int, payload: ProjectInSchema, response: HttpResponse):
+    if not await User.objects.filter(id=payload.assigned_to).aexists():
+        raise HttpError(404, "Not Found")
 
-    if payload.priority not in valid_priorities:
-        raise HttpError(400, f"Invalid priority: {payload.priority}")
+    project = await save_project(request, project_id, payload.model_dump())
+    logger.info("Project updated: %s", project)
+    response['ETag'] = project_etag(project.id, project.revision)
+    return ProjectSchema.from_model(project)
 
-    for attr, value in payload.dict().items():
-        if attr == "assigned_to":
-            assigned_to_user = get_object_or_404(User, id=value)
-            setattr(project, attr, assigned_to_user)
-        else:
-            setattr(project, attr, value)
+# Change only the fields sent (admin-only access); other columns are not rewritten
+@api.patch('/projects/{int:project_id}/', response=ProjectSchema, auth=admin_only)
+async def patch_project(request, project_id: int, payload: ProjectPatchSchema, response: HttpResponse):
+    changes = payload.model_dump(exclude_unset=True)
+    if 'assigned_to' in changes and not await User.objects.filter(id=changes['assigned_to']).aexists():
+        raise HttpError(404, "Not Found")
 
-    project.save()
-    logger.info(f"Project updated: {project}")
+    project = await save_project(request, project_id, changes, partial=True)
+    if changes:
+        logger.info("Project patched: %s", project)
+    response['ETag'] = project_etag(project.id, project.revision)
     return ProjectSchema.from_model(project)
 
 # Retrieve a specific project (authenticated users)
-@api.get('/projects/{project_id}/', response=ProjectSchema)
-def get_project(request, project_id: int):
-    auth_response = is_authenticated(request)
-    if auth_response:
-        return auth_response
+@api.get('/projects/{int:project_id}/', response=ProjectSchema, exclude_unset=True)
+@prefer_replica
+async def get_project(request, project_id: int, response: HttpResponse, fields: Optional[str] = None):
+    user = request.auth
+    fields = parse_fields(fields)
 
-    project = get_object_or_404(Project, id=project_id)
+    project = await cache.get_project(project_id)
+    if project is None and 'If-None-Match' in request.headers:
+        # Revalidation only needs the revision, not the full row
+        row = await visible_projects(user).filter(id=project_id).values('id', 'revision').afirst()
+        if row is None:
+            raise HttpError(404, "Not Found")
+        unchanged = not_modified(request, project_etag(row['id'], row['revision'], fields))
+        if unchanged:
+            return unchanged
 
-    if not request.user.is_staff and project.assigned_to != request.user:
-        return {"error": "Forbidden"}, 403
+    if project is None:
+        project = ProjectSchema.from_model(
+            await aget_object_or_404(visible_projects(user), id=project_id)
+        )
+        await cache.set_project(project_id, project)
+    else:
+        # Cached entries are shared between users, so visibility is checked on every hit
+        check_project_visible(user, project.assigned_to)
 
-    return ProjectSchema.from_model(project)
+    etag = project_etag(project.id, project.revision, fields)
+    unchanged = not_modified(request, etag)
+    if unchanged:
+        return unchanged
+    response['ETag'] = etag
+    return project.project(fields)
 
 # Delete a project (admin-only access)
-@api.delete('/projects/{project_id}/')
-def delete_project(request, project_id: int):
-    is_admin(request)  # Check admin permissions
-    project = get_object_or_404(Project, id=project_id)
-    project.delete()
-    logger.info(f"Project deleted: {project_id}")
+@api.delete('/projects/{int:project_id}/', auth=admin_only)
+async def delete_project(request, project_id: int):
+    project = await aget_object_or_404(Project, id=project_id)
+    await project.adelete()
+    logger.info("Project deleted: %s", project_id)
     return {"success": True}
 
-# Retrieve all projects assigned to a user (authenticated users)
-@api.get('/projects/{project_id}/', response=ProjectSchema)
-def get_project(request, project_id: int):
-    auth_response = is_authenticated(request)
-    if auth_response:
-        return auth_response
+# List projects visible to the user (authenticated users), newest first
+@api.get('/projects/', response=ProjectListSchema, exclude_unset=True)
+@prefer_replica
+async def list_projects(
+    request,
+    response: HttpResponse,
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    assigned_to: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    fields: Optional[str] = None,
+):
+    user = request.auth
+    fields = parse_fields(fields)
 
-    project = get_object_or_404(Project, id=project_id)
+    cache_key = await cache.list_key(
+        user, status=status, priority=priority, assigned_to=assigned_to,
+        cursor=cursor, limit=limit, fields=fields and ','.join(fields),
+    )
+    result = await cache.get_list(cache_key)
+    if result is not None:
+        etag = list_etag(result.items, result.next_cursor, fields)
+        response['ETag'] = etag
+        return not_modified(request, etag) or result
 
-    # Allow project access if user is admin or assigned to the project
-    if not request.user.is_staff and project.assigned_to != request.user:
-        return {"error": "Forbidden"}, 403
+    projects = filter_projects(visible_projects(user), status, priority, assigned_to)
 
-    # Use the from_model method to convert the project instance to the schema
-    return ProjectSchema.from_model(project)
+    try:
+        if 'If-None-Match' in request.headers:
+            # Revalidate from the index columns before loading full rows
+            keys, next_cursor = await paginate_keyset(projects.only('id', 'date_created', 'revision'), cursor, limit)
+            unchanged = not_modified(request, list_etag(keys, next_cursor, fields))
+            if unchanged:
+                return unchanged
+        page, next_cursor = await paginate_keyset(only_fields(projects, fields), cursor, limit)
+    except InvalidCursor:
+        raise HttpError(400, "Invalid cursor")
+
+    result = ProjectListSchema(
+        items=ProjectSchema.from_queryset(page, fields),
+        next_cursor=next_cursor,
+    )
+    await cache.set_list(cache_key, result)
+    response['ETag'] = list_etag(result.items, result.next_cursor, fields)
+    return result
+
+# Stream every matching project as CSV or NDJSON (admin-only access)
+# Rows go from the database cursor to the client in chunks, so memory use doesn't grow with the export
+@api.get('/projects/export/', auth=admin_only)
+async def export_projects(
+    request,
+    format: str = 'csv',
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    assigned_to: Optional[int] = None,
+):
+    if format not in export.EXPORTERS:
+        raise HttpError(400, f"Invalid format: {format}")
+    projects = filter_projects(Project.objects.all(), status, priority, assigned_to)
+    # WSGI servers (runserver) stream only plain iterators; they'd collect an async one first
+    exporters = export.EXPORTERS if isinstance(request, ASGIRequest) else export.SYNC_EXPORTERS
+    response = StreamingHttpResponse(exporters[format](projects), content_type=export.CONTENT_TYPES[format])
+    response['Content-Disposition'] = f'attachment; filename="projects.{format}"'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+# Import projects from an uploaded CSV or NDJSON file (admin-only access)
+@api.post('/projects/import/', response=importer.ImportResultSchema, auth=admin_only)
+async def import_projects(request, file: UploadedFile = File(...), format: Optional[str] = None):
+    user = request.auth
+    format = importer.detect_format(file.name, format)
+    if format is None:
+        raise HttpError(400, "Unknown format; use csv or ndjson")
+    # Decoded line by line as the import consumes it
+    rows = importer.PARSERS[format](codecs.iterdecode(file, 'utf-8-sig'))
+    try:
+        result = await sync_to_async(importer.import_projects)(rows, created_by_id=user.id)
+    except (UnicodeDecodeError, csv.Error) as exc:
+        raise HttpError(400, f"Unreadable file: {exc}")
+    logger.info("Imported %d projects (%d rejected)", result.created, result.rejected)
+    return result
+
+# Full-text search over name and description of visible projects, best matches first
+@api.get('/projects/search/', response=ProjectListSchema, exclude_unset=True)
+@prefer_replica
+async def search_projects(
+    request,
+    q: str,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    fields: Optional[str] = None,
+):
+    fields = parse_fields(fields)
+    projects = search.search(only_fields(visible_projects(request.auth), fields), q)
+    try:
+        page, next_cursor = await paginate_offset(projects, cursor, limit)
+    except InvalidCursor:
+        raise HttpError(400, "Invalid cursor")
+    return ProjectListSchema(
+        items=ProjectSchema.from_queryset(page, fields),
+        next_cursor=next_cursor,
+    )
+
+# Project counts per status, priority and assignee (admin-only access)
+# Read from counters maintained on every write, so the cost doesn't grow with the table
+@api.get('/projects/stats/', response=ProjectStatsSchema, auth=admin_only)
+@prefer_replica
+async def project_stats(request):
+    return await counters.snapshot()
+
+# Stream create/update/delete events for visible projects (authenticated users)
+@api.get('/projects/events/')
+@asgi_only
+async def project_events(request):
+    user = request.auth
+    subscription = events.get_broker().subscribe(user)
+    response = StreamingHttpResponse(events.event_stream(subscription), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Stop nginx from buffering the stream
+    return response
+
+# Create many projects in one transaction (admin-only access)
+@api.post('/projects/bulk/', response=BulkResultSchema, auth=admin_only)
+async def bulk_create(request, payload: BulkItemsSchema):
+    user = request.auth
+    check_bulk_size(len(payload.items))
+    # transaction.atomic has no async form, so the batch runs in a worker thread
+    result = await sync_to_async(bulk_create_projects)(payload.items, created_by_id=user.id)
+    logger.info("Bulk created %d projects (%d rejected)", len(result.ids), len(result.errors))
+    return result
+
+# Partially update many projects in one transaction (admin-only access)
+@api.patch('/projects/bulk/', response=BulkResultSchema, auth=admin_only)
+async def bulk_update(request, payload: BulkItemsSchema):
+    check_bulk_size(len(payload.items))
+    result = await sync_to_async(bulk_update_projects)(payload.items)
+    logger.info("Bulk updated %d projects (%d rejected)", len(result.ids), len(result.errors))
+    return result
+
+# Delete many projects in one transaction (admin-only access)
+@api.delete('/projects/bulk/', response=BulkResultSchema, auth=admin_only)
+async def bulk_delete(request, payload: BulkDeleteSchema):
+    check_bulk_size(len(payload.ids))
+    result = await sync_to_async(bulk_delete_projects)(payload.ids)
+    logger.info("Bulk deleted %d projects (%d not found)", len(result.ids), len(result.errors))
+    return result
+
+# Queue a background job (admin-only access); poll it for the outcome
+@api.post('/jobs/', response={202: JobSchema}, auth=admin_only)
+async def enqueue_job(request, payload: JobInSchema):
+    try:
+        job = await jobs.aenqueue(payload.kind, payload.payload, created_by_id=request.auth.id)
+    except jobs.InvalidJob as exc:
+        raise HttpError(400, str(exc))
+    logger.info("Job queued: %s", job)
+    return 202, JobSchema.from_model(job)
+
+# Status and result of a background job (admin-only access)
+@api.get('/jobs/{int:job_id}/', response=JobSchema, auth=admin_only)
+async def get_job(request, job_id: int):
+    return JobSchema.from_model(await aget_object_or_404(Job, id=job_id))
+
+# Download the file a finished job wrote, e.g. an export (admin-only access)
+@api.get('/jobs/{int:job_id}/file/', auth=admin_only)
+async def get_job_file(request, job_id: int):
+    job = await aget_object_or_404(Job, id=job_id, status='done')
+    name = (job.result or {}).get('file')
+    if not name or not default_storage.exists(name):
+        raise HttpError(404, "Not Found")
+    return FileResponse(default_storage.open(name), as_attachment=True, filename=name.rsplit('/', 1)[-1])
+
+# Hit/miss counters of the project response cache (admin-only access)
+@api.get('/cache/stats/', response=CacheStatsSchema, auth=admin_only)
+async def cache_stats(request):
+    return cache.stats.snapshot()
+
+# Prometheus scrape endpoint, outside the API: plain text, and no session or JWT needed.
+# When PROJECTS_METRICS_TOKEN is set, scrapers must send it as a bearer token
+def prometheus_metrics(request):
+    token = settings.PROJECTS_METRICS_TOKEN
+    if token and not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponse(status=401)
+    return HttpResponse(metrics.registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')